@@ -17,6 +17,7 @@ setup(
     ],
     extras_require={
         "dev": ["pylint==4.0.0", "nose2==0.15.1"],
+        "async": ["httpx==0.28.1"],
     },
     entry_points={
         "console_scripts": [
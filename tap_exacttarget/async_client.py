@@ -0,0 +1,203 @@
+"""Asynchronous SOAP and REST requests, on a single event loop shared by every stream.
+
+Requires the optional `async` extra (`httpx`), so this module is only imported when
+`async_concurrency` is configured. `AsyncClient` exposes `retrieve_request`,
+`describe_request` and `get_rest` as coroutines on top of zeep's `AsyncTransport`, every
+request holding one slot of a semaphore of `async_concurrency` slots. `AsyncEngine` runs the
+client on an event loop of its own thread, and lets the synchronous stream code drive many
+independent paging chains on it, in the same way `concurrency.run_ordered` drives threads.
+"""
+
+import asyncio
+import threading
+from collections import deque
+
+import backoff
+import httpx
+from singer import get_logger
+from zeep import AsyncClient as ZeepAsyncClient
+from zeep.exceptions import Fault, TransportError
+from zeep.transports import AsyncTransport
+
+from tap_exacttarget.concurrency import _Done, _Failure
+from tap_exacttarget.exceptions import MarketingCloudError, MarketingCloudSoapApiException
+
+LOGGER = get_logger()
+
+
+class AsyncClient:
+    """Coroutine counterpart of the SOAP and REST requests of `client.Client`.
+
+    Requests are built with the synchronous client `client`, which also provides the access
+    token, and sent through an `httpx.AsyncClient` keeping at most `concurrency` connections.
+    Tokens are refreshed in the background by the `TokenManager` of `client`, only a missing
+    or expired token is requested, on a thread of the default executor so the event loop
+    keeps running.
+    """
+
+    def __init__(self, client, concurrency: int) -> None:
+        self.client = client
+        self.semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(
+            max_connections=concurrency, max_keepalive_connections=concurrency
+        )
+        self.http = httpx.AsyncClient(limits=limits, timeout=client.timeout)
+        self.transport = AsyncTransport(
+            client=self.http, wsdl_client=httpx.Client(timeout=client.timeout)
+        )
+        self.soap_client = ZeepAsyncClient(wsdl=client.soap_client.wsdl, transport=self.transport)
+        self.soap_header_token = None
+
+    async def get_access_token(self):
+        """Returns the access token of `client`, requesting it off the event loop if needed."""
+        token_manager = self.client.token_manager
+        access_token = token_manager.cached_token()
+        if access_token is None:
+            loop = asyncio.get_running_loop()
+            access_token = await loop.run_in_executor(None, lambda: token_manager.token)
+        return access_token
+
+    async def refresh_soap_header(self):
+        """Sets the oauth SOAP header, rebuilding it only after the token rotated."""
+        access_token = await self.get_access_token()
+        if access_token != self.soap_header_token:
+            self.soap_client.set_default_soapheaders([self.client.oauth_header(access_token)])
+            self.soap_header_token = access_token
+
+    @backoff.on_exception(backoff.expo, httpx.TransportError, max_tries=5, max_time=300)
+    async def retrieve_request(self, object_type, properties, request_id=None, search_filter=None):
+        retrieve_request_obj = self.client.build_retrieve_request(
+            object_type, properties, request_id=request_id, search_filter=search_filter
+        )
+        await self.refresh_soap_header()
+
+        try:
+            async with self.semaphore:
+                response = await self.soap_client.service.Retrieve(
+                    RetrieveRequest=retrieve_request_obj
+                )
+            self.client.raise_for_error(response)
+            return response
+        except (MarketingCloudError, TransportError, Fault) as err:
+            if self.client.log_search_filter:
+                LOGGER.info("Filter: %s", search_filter)
+            if isinstance(err, (Fault, TransportError)):
+                raise MarketingCloudSoapApiException(
+                    f"SOAP Fault or Transport Error: {err}"
+                ) from err
+            raise err
+
+    @backoff.on_exception(backoff.expo, httpx.TransportError, max_tries=5, max_time=300)
+    async def describe_request(self, object_type):
+        """Queries schema definition for ET Objects."""
+        obj_defn_reqs = self.client.get_type("ns0:ObjectDefinitionRequest")
+        arr_obj_defn_reqs = self.client.get_type("ns0:ArrayOfObjectDefinitionRequest")
+        obj_def_array = arr_obj_defn_reqs(
+            ObjectDefinitionRequest=[obj_defn_reqs(ObjectType=object_type)]
+        )
+        await self.refresh_soap_header()
+
+        async with self.semaphore:
+            return await self.soap_client.service.Describe(obj_def_array)
+
+    @backoff.on_exception(
+        backoff.expo, (httpx.TransportError, httpx.HTTPStatusError), max_tries=5, max_time=300
+    )
+    async def get_rest(self, endpoint, params):
+        headers = {"Authorization": f"Bearer {await self.get_access_token()}"}
+        async with self.semaphore:
+            response = await self.http.get(
+                f"{self.client.rest_url}{endpoint}", headers=headers, params=params
+            )
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self):
+        await self.transport.aclose()
+        self.transport.wsdl_client.close()
+
+
+async def _produce(chain, items: asyncio.Queue):
+    try:
+        async for item in chain():
+            await items.put(item)
+        await items.put(_Done)
+    except Exception as err:  # pylint: disable=broad-except
+        await items.put(_Failure(err))
+
+
+class AsyncEngine:
+    """Event loop thread running an `AsyncClient`, shared by every stream of a sync.
+
+    Streams are synced on regular threads; they hand paging chains, async generator
+    functions of `AsyncClient` requests, to `iter_ordered` and read the items back in order.
+    Chains of every stream run on the same loop, and `concurrency` bounds both the chains
+    started by one `iter_ordered` call and the requests in flight across all of them.
+    """
+
+    def __init__(self, client, concurrency: int) -> None:
+        self.concurrency = concurrency
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="async-requests", daemon=True
+        )
+        self.thread.start()
+        self.client = self.call(self._create_client(client))
+
+    async def _create_client(self, client):
+        return AsyncClient(client, self.concurrency)
+
+    def call(self, coroutine):
+        """Runs `coroutine` on the event loop and returns its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def _consume(self, items: asyncio.Queue):
+        while True:
+            item = self.call(items.get())
+            if item is _Done:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+    def iter_ordered(self, chains, buffer_size: int):
+        """Runs `chains` on the event loop and yields their items in chain order.
+
+        Every chain is a callable returning an async iterator. Up to `concurrency` chains run
+        at once, each buffering at most `buffer_size` items ahead of the consumer. For every
+        chain a generator over its items is yielded, to exhaust before requesting the next;
+        an exception raised by a chain is re-raised when its generator reaches that point.
+        Chains still running when the caller stops are cancelled.
+        """
+        chains = iter(chains)
+        pending = deque()
+
+        def start_next():
+            chain = next(chains, None)
+            if chain is not None:
+                items = asyncio.Queue(maxsize=buffer_size)
+                pending.append((items, asyncio.run_coroutine_threadsafe(
+                    _produce(chain, items), self.loop
+                )))
+
+        current = None
+        try:
+            for _ in range(self.concurrency):
+                start_next()
+            while pending:
+                items, current = pending.popleft()
+                yield self._consume(items)
+                start_next()
+        finally:
+            for future in [current] + [future for _, future in pending]:
+                if future is not None:
+                    future.cancel()
+
+    def close(self) -> None:
+        """Closes the client connections and stops the event loop."""
+        try:
+            self.call(self.client.aclose())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
@@ -0,0 +1,107 @@
+"""OAuth access token shared by every request and thread of a client.
+
+`TokenManager` hands out the current token without taking a lock. Once a token enters its
+refresh window, `refresh_ahead` seconds before it expires, the next caller starts a refresh
+on a background thread and keeps using the current token, so paging chains are not held up
+by the token request. Only a missing or expired token is requested on the calling thread.
+A single refresh runs at a time, threads needing a token while one is running wait for its
+result instead of requesting their own.
+"""
+
+import threading
+import time
+from typing import NamedTuple
+
+from singer import get_logger
+
+LOGGER = get_logger()
+
+# seconds before expiry a token is refreshed in the background
+DEFAULT_REFRESH_AHEAD = 300
+
+
+class Token(NamedTuple):
+    value: str
+    # `clock` times after which the token is refreshed, and no longer used
+    refresh_at: float
+    expires_at: float
+
+
+class TokenManager:
+    """Keeps the token returned by `fetch_token` current.
+
+    `fetch_token` returns `(token, expires_in)`, `expires_in` the seconds the token may be
+    used for. `clock` is a monotonic clock in seconds.
+    """
+
+    def __init__(self, fetch_token, refresh_ahead=DEFAULT_REFRESH_AHEAD, clock=time.monotonic):
+        self.fetch_token = fetch_token
+        self.refresh_ahead = refresh_ahead
+        self.clock = clock
+        # replaced as a whole, so readers always see a consistent token and expiry
+        self.current = None
+        self.refresh_lock = threading.Lock()
+        self.refresh_thread = None
+
+    @property
+    def token(self):
+        """Returns a valid token, refreshing it when missing or about to expire."""
+        current = self.current
+        now = self.clock()
+        if current is None or now >= current.expires_at:
+            current = self.refresh(current)
+        elif now >= current.refresh_at:
+            self.refresh_in_background(current)
+        return current.value
+
+    def cached_token(self):
+        """Returns the current token without blocking, or None when it is missing or expired.
+        A token due for refresh is still returned, and refreshed in the background."""
+        current = self.current
+        now = self.clock()
+        if current is None or now >= current.expires_at:
+            return None
+        if now >= current.refresh_at:
+            self.refresh_in_background(current)
+        return current.value
+
+    def refresh(self, stale):
+        """Replaces the token `stale` and returns the new token, waiting for a refresh already
+        running instead of starting another one."""
+        with self.refresh_lock:
+            if self.current is not stale:
+                return self.current
+            return self.request_token()
+
+    def refresh_in_background(self, stale):
+        """Replaces the token `stale` on a background thread, unless a refresh is running."""
+        if not self.refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if self.current is not stale:
+                self.refresh_lock.release()
+                return
+            self.refresh_thread = threading.Thread(
+                target=self.run_refresh, name="token-refresh", daemon=True
+            )
+            self.refresh_thread.start()
+        except BaseException:
+            self.refresh_lock.release()
+            raise
+
+    def run_refresh(self):
+        try:
+            self.request_token()
+        except Exception as err:  # pylint: disable=broad-except
+            # the current token stays in use, it is requested again on the next call
+            LOGGER.warning("Unable to refresh the access token in the background: %s", err)
+        finally:
+            self.refresh_lock.release()
+
+    def request_token(self):
+        """Requests a new token, called with `refresh_lock` held."""
+        now = self.clock()
+        value, expires_in = self.fetch_token()
+        expires_at = now + expires_in
+        self.current = Token(value, max(now, expires_at - self.refresh_ahead), expires_at)
+        return self.current
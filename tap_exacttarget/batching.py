@@ -0,0 +1,120 @@
+"""Automatic tuning of the Retrieve BatchSize of an object type.
+
+With `auto_batch_size` every full Retrieve page is measured, its response size and the time
+it took to request and read, through `MeteredTransport`. `BatchSizeTuner` derives the cost of
+one row from these and resizes the next pages so they stay under `target_page_seconds` and
+`max_page_bytes`, within the bounds the API accepts.
+"""
+
+import math
+import threading
+import time
+
+from singer import get_logger
+from zeep.transports import Transport
+
+LOGGER = get_logger()
+
+# BatchSize bounds, Retrieve returns at most 2500 rows per page
+MIN_BATCH_SIZE = 50
+MAX_BATCH_SIZE = 2500
+# sizes are rounded down to a multiple of this step
+BATCH_SIZE_STEP = 50
+DEFAULT_TARGET_PAGE_SECONDS = 30
+DEFAULT_MAX_PAGE_BYTES = 16 * 1024 * 1024
+# bounds of the factor the size may be changed by after a single page
+MAX_SHRINK_FACTOR = 0.5
+MAX_GROW_FACTOR = 2.0
+# pages must fit this many times in the targets before the size grows, avoids oscillating
+GROW_MARGIN = 1.25
+
+
+class MeteredTransport(Transport):
+    """zeep transport keeping the size and duration of the last response of every thread."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = threading.local()
+
+    def post(self, address, message, headers):
+        start = time.perf_counter()
+        response = super().post(address, message, headers)
+        self.metrics.last_response = (len(response.content), time.perf_counter() - start)
+        return response
+
+    @property
+    def last_response(self):
+        """`(bytes, seconds)` of the last response received on the calling thread."""
+        return getattr(self.metrics, "last_response", (0, 0.0))
+
+
+class BatchSizeTuner:
+    """Adjusts the BatchSize of the Retrieve calls of one stream from the pages it receives.
+
+    Only full pages, continued by another page, are observed, so the fixed cost of a request
+    is spread over a known number of rows. Pages slower than `target_seconds` or larger than
+    `max_bytes` shrink the size in proportion, pages fitting `GROW_MARGIN` times in both grow
+    it, never by more than `MAX_SHRINK_FACTOR` / `MAX_GROW_FACTOR` at once.
+    """
+
+    def __init__(self, stream_id, batch_size, target_seconds=DEFAULT_TARGET_PAGE_SECONDS,
+                 max_bytes=DEFAULT_MAX_PAGE_BYTES, min_size=MIN_BATCH_SIZE,
+                 max_size=MAX_BATCH_SIZE):
+        self.stream_id = stream_id
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self.min_size = min_size
+        self.max_size = max(min_size, max_size)
+        self.batch_size = self.clamp(batch_size)
+        self.lock = threading.Lock()
+
+    def clamp(self, batch_size):
+        if batch_size >= self.max_size:
+            return self.max_size
+        batch_size = int(batch_size) // BATCH_SIZE_STEP * BATCH_SIZE_STEP
+        return max(self.min_size, batch_size)
+
+    def fitting_size(self, rows, response_bytes, seconds):
+        """Returns the number of rows a page may hold to stay within both targets."""
+        sizes = [math.inf]
+        if seconds > 0:
+            sizes.append(self.target_seconds * rows / seconds)
+        if response_bytes > 0:
+            sizes.append(self.max_bytes * rows / response_bytes)
+        return min(sizes)
+
+    def observe(self, rows, response_bytes, seconds):
+        """Resizes the next pages after a full page of `rows` rows."""
+        with self.lock:
+            fitting = self.fitting_size(rows, response_bytes, seconds)
+            if fitting < rows:
+                factor = max(MAX_SHRINK_FACTOR, fitting / rows)
+            elif fitting >= rows * GROW_MARGIN:
+                factor = min(MAX_GROW_FACTOR, fitting / GROW_MARGIN / rows)
+            else:
+                return
+            self.resize(
+                self.clamp(rows * factor),
+                f"page of {rows} rows took {seconds:.1f}s and {response_bytes} bytes",
+            )
+
+    def timed_out(self, batch_size):
+        """Halves the size after a page of `batch_size` rows timed out."""
+        with self.lock:
+            self.resize(
+                self.clamp(min(self.batch_size, batch_size * MAX_SHRINK_FACTOR)),
+                f"page of {batch_size} rows timed out",
+            )
+
+    def resize(self, batch_size, reason):
+        if batch_size == self.batch_size:
+            return
+        LOGGER.info(
+            "Stream %s: %s, %s batch size %d -> %d",
+            self.stream_id,
+            reason,
+            "shrinking" if batch_size < self.batch_size else "growing",
+            self.batch_size,
+            batch_size,
+        )
+        self.batch_size = batch_size
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+from singer import get_logger
+from zeep.cache import Base
+
+LOGGER = get_logger()
+
+DEFAULT_WSDL_CACHE_TTL = 86400
+DEFAULT_DESCRIBE_CACHE_TTL = 86400
+DEFAULT_DAO_CACHE_TTL = 86400
+
+# names of the files a cache writes, its entries and the temp files entries are written to
+ENTRY_NAME = re.compile(r"[0-9a-f]{64}")
+TEMP_PREFIX = ".tmp-"
+
+
+class FileCache:
+    """On-disk cache of byte strings keyed by a string, one file per entry.
+
+    Every entry is stored in its own file named after the sha256 of its key, in the `subdir`
+    subdirectory of `path`, so several caches may share a directory. The file starts with a
+    one-line json header (cache version, key, creation time and sha256 of the content)
+    followed by the raw content. Entries that are stale, written by another cache version or
+    whose content does not match the recorded hash are treated as a miss.
+    """
+
+    version = 2
+    # names the cache in log messages
+    label = "file"
+    # subdirectory of `path` holding the entries
+    subdir = "file"
+
+    def __init__(self, path: str, ttl: float = None) -> None:
+        self.path = path
+        self.entries_dir = os.path.join(path, self.subdir)
+        self.ttl = ttl
+        os.makedirs(self.entries_dir, exist_ok=True)
+
+    def entry_path(self, key: str) -> str:
+        """Returns the cache file location for a key."""
+        return os.path.join(self.entries_dir, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def add(self, key, content):
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        header = {
+            "version": self.version,
+            "key": key,
+            "created": time.time(),
+            "sha256": hashlib.sha256(content).hexdigest(),
+        }
+        # write to a temp file first so a killed run never leaves a half written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.entries_dir, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(json.dumps(header).encode("utf-8") + b"\n")
+                tmp_file.write(content)
+            os.replace(tmp_path, self.entry_path(key))
+        except OSError as err:
+            LOGGER.warning("Unable to write %s cache entry for %s: %s", self.label, key, err)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get(self, key):
+        try:
+            with open(self.entry_path(key), "rb") as cache_file:
+                header = json.loads(cache_file.readline())
+                content = cache_file.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            LOGGER.info("Discarding unreadable %s cache entry for %s: %s", self.label, key, err)
+            return None
+
+        if header.get("version") != self.version or header.get("key") != key:
+            LOGGER.info("Discarding %s cache entry for %s: version mismatch", self.label, key)
+            return None
+        if self.ttl is not None and time.time() - header.get("created", 0) > self.ttl:
+            LOGGER.info("Discarding %s cache entry for %s: entry expired", self.label, key)
+            return None
+        if hashlib.sha256(content).hexdigest() != header.get("sha256"):
+            LOGGER.info(
+                "Discarding %s cache entry for %s: integrity check failed", self.label, key
+            )
+            return None
+
+        return content
+
+    def clear(self):
+        """Removes every cached entry and the temp files of interrupted writes, leaving any
+        other file of the directory in place."""
+        for name in os.listdir(self.entries_dir):
+            if not (ENTRY_NAME.fullmatch(name) or name.startswith(TEMP_PREFIX)):
+                continue
+            file_path = os.path.join(self.entries_dir, name)
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+
+
+class WsdlCache(FileCache, Base):
+    """On-disk cache for the WSDL / XSD documents zeep loads at startup.
+
+    Documents are keyed by their url. A missed or discarded entry makes zeep fetch the
+    document again and overwrite the entry.
+    """
+
+    label = "wsdl"
+    subdir = "wsdl"
+
+    def __init__(self, path: str, ttl: float = DEFAULT_WSDL_CACHE_TTL) -> None:
+        super().__init__(path, ttl)
+
+
+class DescribeCache(FileCache):
+    """On-disk cache for the retrievable fields returned by Describe, per object type."""
+
+    label = "describe"
+    subdir = "describe"
+
+    def __init__(self, path: str, ttl: float = DEFAULT_DESCRIBE_CACHE_TTL) -> None:
+        super().__init__(path, ttl)
+
+    def get_fields(self, key: str):
+        """Returns the cached field names for `key`, `None` on a miss."""
+        content = self.get(key)
+        if content is None:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError:
+            return None
+
+    def add_fields(self, key: str, fields) -> None:
+        self.add(key, json.dumps(list(fields)))
+
+
+class DataExtensionCache(FileCache):
+    """On-disk cache for the DataExtension definitions built by discovery."""
+
+    label = "data extension"
+    subdir = "dataextension"
+
+    def __init__(self, path: str, ttl: float = DEFAULT_DAO_CACHE_TTL) -> None:
+        super().__init__(path, ttl)
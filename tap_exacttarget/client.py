@@ -1,14 +1,36 @@
-from datetime import datetime, timedelta
+import copy
+import json
+import threading
+import time
+from collections import Counter
+from functools import partial
 
 import backoff
-import requests
+from lxml import etree
 from requests import Session
-from requests.exceptions import ConnectionError, RequestException, HTTPError, Timeout
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, RequestException, HTTPError, ReadTimeout, Timeout
 from singer import get_logger
 from zeep import client, xsd
-from zeep.transports import Transport
-from zeep.exceptions import TransportError, Fault
-
+from zeep.exceptions import Error as ZeepError, Fault, TransportError
+
+from tap_exacttarget.auth import TokenManager
+from tap_exacttarget.batching import (
+    DEFAULT_MAX_PAGE_BYTES,
+    DEFAULT_TARGET_PAGE_SECONDS,
+    BatchSizeTuner,
+    MeteredTransport,
+)
+from tap_exacttarget.cache import (
+    DEFAULT_DAO_CACHE_TTL,
+    DEFAULT_DESCRIBE_CACHE_TTL,
+    DEFAULT_WSDL_CACHE_TTL,
+    DataExtensionCache,
+    DescribeCache,
+    WsdlCache,
+)
+from tap_exacttarget.raw_retrieve import RowConverter, parse_retrieve_response, raise_for_status
+from tap_exacttarget.windowing import DEFAULT_MAX_DATE_WINDOW, DEFAULT_MIN_DATE_WINDOW
 from tap_exacttarget.exceptions import (
     IncompatibleFieldSelectionError,
     MarketingCloudError,
@@ -21,6 +43,60 @@ DEFAULT_DATE_WINDOW = 30
 DEFAULT_BATCH_SIZE = 2500
 DEFAULT_TIMEOUT = 300
 TOKEN_EXPIRY_BUFFER = 500
+DEFAULT_WINDOW_CONCURRENCY = 1
+# pages adaptive date windows aim for, 0 keeps every window at `date_window` days
+DEFAULT_TARGET_WINDOW_PAGES = 0
+DEFAULT_SUBSCRIBER_CONCURRENCY = 1
+DEFAULT_MAX_PARALLEL_STREAMS = 1
+# worker processes extracting date windows, 1 extracts every window in the tap process
+DEFAULT_PROCESS_WORKERS = 1
+# requests in flight on the async event loop, 0 sends every request synchronously
+DEFAULT_ASYNC_CONCURRENCY = 0
+# Retrieve pages fetched ahead of the page being written, 0 fetches every page on demand
+DEFAULT_PREFETCH_PAGES = 0
+# connections kept per host, raised to the number of threads the tap may run at once
+DEFAULT_HTTP_POOL_SIZE = 10
+
+
+def get_config_value(config, key, cast, default):
+    """Reads an optional numeric config value, falls back to `default` if it is invalid."""
+    try:
+        return cast(config.get(key) or default)
+    except (TypeError, ValueError):
+        LOGGER.info("invalid value received for %s, fallback to default %s", key, default)
+        return default
+
+
+def get_config_mapping(config, key, cast):
+    """Reads an optional mapping config value, given as a dict or a JSON string, with its
+    values converted by `cast`. Invalid values are left out."""
+    value = config.get(key) or {}
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = None
+    if not isinstance(value, dict):
+        LOGGER.info("invalid value received for %s, ignored", key)
+        return {}
+
+    mapping = {}
+    for name, item in value.items():
+        try:
+            mapping[name] = cast(item)
+        except (TypeError, ValueError):
+            LOGGER.info("invalid value received for %s of %s, ignored", name, key)
+    return mapping
+
+
+def get_config_flag(config, key, default):
+    """Reads an optional boolean config value, given as a bool or a string."""
+    value = config.get(key)
+    if value is None or value == "":
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() not in ("false", "0", "no", "off")
+    return bool(value)
 
 
 class Client:
@@ -42,35 +118,102 @@ class Client:
         client_secret = config["client_secret"]
         self.timeout = int(config.get("request_timeout") or DEFAULT_TIMEOUT)
 
-        try:
-            self.date_window = float(config.get("date_window") or DEFAULT_DATE_WINDOW)
-        except ValueError:
-            self.date_window = DEFAULT_DATE_WINDOW
-            LOGGER.info(
-                "invalid value received for date_window, fallback to default %s", DEFAULT_DATE_WINDOW
+        self.date_window = get_config_value(config, "date_window", float, DEFAULT_DATE_WINDOW)
+        self.batch_size = get_config_value(config, "batch_size", int, DEFAULT_BATCH_SIZE)
+        self.stream_batch_sizes = get_config_mapping(config, "stream_batch_sizes", int)
+        self.auto_batch_size = get_config_flag(config, "auto_batch_size", False)
+        self.target_page_seconds = get_config_value(
+            config, "target_page_seconds", float, DEFAULT_TARGET_PAGE_SECONDS
+        )
+        self.max_page_bytes = get_config_value(
+            config, "max_page_bytes", int, DEFAULT_MAX_PAGE_BYTES
+        )
+        # BatchSize of object types synced with a size of their own, and their tuners with
+        # `auto_batch_size`, shared with spawned clients
+        self.batch_sizes = {}
+        self.batch_tuners = {}
+        self.window_concurrency = get_config_value(
+            config, "window_concurrency", int, DEFAULT_WINDOW_CONCURRENCY
+        )
+        self.subscriber_concurrency = get_config_value(
+            config, "subscriber_concurrency", int, DEFAULT_SUBSCRIBER_CONCURRENCY
+        )
+        self.target_window_pages = get_config_value(
+            config, "target_window_pages", int, DEFAULT_TARGET_WINDOW_PAGES
+        )
+        self.max_parallel_streams = get_config_value(
+            config, "max_parallel_streams", int, DEFAULT_MAX_PARALLEL_STREAMS
+        )
+        self.process_workers = get_config_value(
+            config, "process_workers", int, DEFAULT_PROCESS_WORKERS
+        )
+        self.async_concurrency = get_config_value(
+            config, "async_concurrency", int, DEFAULT_ASYNC_CONCURRENCY
+        )
+        self.prefetch_pages = get_config_value(
+            config, "prefetch_pages", int, DEFAULT_PREFETCH_PAGES
+        )
+        # `tap_exacttarget.extraction.ExtractionPool` set up by sync, shared with spawned clients
+        self.extraction_pool = None
+        # `tap_exacttarget.async_client.AsyncEngine` set up by sync, shared with spawned clients
+        self.async_engine = None
+        self.min_date_window = get_config_value(
+            config, "min_date_window", float, DEFAULT_MIN_DATE_WINDOW
+        )
+        self.max_date_window = get_config_value(
+            config, "max_date_window", float, DEFAULT_MAX_DATE_WINDOW
+        )
+
+        self.http_pool_size = max(
+            get_config_value(config, "http_pool_size", int, DEFAULT_HTTP_POOL_SIZE),
+            self.required_connections(),
+        )
+        self.http_keep_alive = get_config_flag(config, "http_keep_alive", True)
+        # stream Retrieve pages through `raw_retrieve` instead of zeep
+        self.raw_retrieve = get_config_flag(config, "raw_retrieve", False)
+        self.row_converter = None
+        self.session = self.create_session()
+
+        self.wsdl_cache = None
+        if config.get("wsdl_cache_dir"):
+            wsdl_cache_ttl = get_config_value(
+                config, "wsdl_cache_ttl", float, DEFAULT_WSDL_CACHE_TTL
             )
+            self.wsdl_cache = WsdlCache(config["wsdl_cache_dir"], ttl=wsdl_cache_ttl)
 
-        try:
-            self.batch_size = int(config.get("batch_size") or DEFAULT_BATCH_SIZE)
-        except ValueError:
-            self.batch_size = DEFAULT_BATCH_SIZE
-            LOGGER.info(
-                "invalid value received for batch_size, fallback to default %s", DEFAULT_BATCH_SIZE
+        self.describe_cache = None
+        if config.get("describe_cache_dir"):
+            describe_cache_ttl = get_config_value(
+                config, "describe_cache_ttl", float, DEFAULT_DESCRIBE_CACHE_TTL
             )
+            self.describe_cache = DescribeCache(
+                config["describe_cache_dir"], ttl=describe_cache_ttl
+            )
+        self.dao_cache = None
+        if config.get("dao_cache_dir"):
+            dao_cache_ttl = get_config_value(config, "dao_cache_ttl", float, DEFAULT_DAO_CACHE_TTL)
+            self.dao_cache = DataExtensionCache(config["dao_cache_dir"], ttl=dao_cache_ttl)
+
+        # shared with spawned clients, so every object type is described once per run
+        self.retrievable_fields = {}
+        self.describe_stats = Counter()
+        self.describe_lock = threading.RLock()
 
         self.wsdl_uri = f"https://{subdomain}.soap.marketingcloudapis.com/etframework.wsdl"
         self.auth_url = f"https://{subdomain}.auth.marketingcloudapis.com/v2/token"
         self.rest_url = f"https://{subdomain}.rest.marketingcloudapis.com/"
 
-        self.__access_token = None
-        self.token_expiry_time = None
+        # shared with spawned clients, so every thread uses the same token
+        self.token_manager = TokenManager(self.request_token)
 
         self.client_id = client_id
         self.client_secret = client_secret
         self.soap_client = self.initialize_soap_client()
+        self.soap_types = {}
+        self.retrieve_options = {}
+        self.soap_header_token = None
 
-        oauth_value = self.oauth_header(self.access_token)
-        self.soap_client.set_default_soapheaders([oauth_value])
+        self.refresh_soap_header()
         LOGGER.info("WebService Client initialization Complete.")
 
     @backoff.on_exception(
@@ -79,54 +222,110 @@ class Client:
     def initialize_soap_client(self):
         """Performs WebService Client init & handles Retry."""
 
+        transport = self.create_transport()
+        try:
+            return client.Client(wsdl=self.wsdl_uri, transport=transport)
+        except (etree.XMLSyntaxError, ZeepError):
+            if not self.wsdl_cache:
+                raise
+            # a cached document that passed the integrity check but cannot be parsed
+            LOGGER.info("Unable to load WSDL from cache, purging cache and fetching again.")
+            self.wsdl_cache.clear()
+            return client.Client(wsdl=self.wsdl_uri, transport=transport)
+
+    def required_connections(self):
+        """Most requests the tap may have in flight at once, with its configured concurrency.
+
+        List subscribers fetch profiles on `subscriber_concurrency` threads next to the
+        windows fetched on the stream thread, other streams fetch `window_concurrency` windows,
+        and up to `max_parallel_streams` streams are synced at once. With `prefetch_pages`
+        every one of these threads may have a prefetch thread requesting pages next to it.
+        """
+        per_stream = max(self.window_concurrency, self.subscriber_concurrency + 1, 2)
+        if self.prefetch_pages > 0:
+            per_stream *= 2
+        return per_stream * max(self.max_parallel_streams, 1)
+
+    def create_session(self):
+        """Creates the http session shared by the token, REST and SOAP requests of the client
+        and of every spawned client, so connections are kept alive and reused."""
         session = Session()
-        transport = Transport(session=session, timeout=300, operation_timeout=300)
-        soap_client = client.Client(wsdl=self.wsdl_uri, transport=transport)
-        return soap_client
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.http_pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.http_keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def create_transport(self):
+        """Creates a zeep transport on the shared http session, measuring every response."""
+        return MeteredTransport(
+            session=self.session, cache=self.wsdl_cache, timeout=300, operation_timeout=300
+        )
 
-    def is_token_expired(self):
-        """Checks for token expiry."""
-        if self.__access_token is None:
-            return True
+    def spawn(self):
+        """Returns a copy of the client with its own SOAP client, for use in another thread.
 
-        if self.token_expiry_time and (
-            datetime.now() + timedelta(minutes=5) < self.token_expiry_time
-        ):
-            return False
+        The copy shares the configuration, current access token, the http session and the
+        parsed WSDL, so no document is fetched or parsed again.
+        """
+        spawned = copy.copy(self)
+        spawned.soap_client = client.Client(
+            wsdl=self.soap_client.wsdl, transport=self.create_transport()
+        )
+        spawned.soap_types = {}
+        spawned.retrieve_options = {}
+        spawned.soap_header_token = None
+        spawned.refresh_soap_header()
+        return spawned
 
-        return True
+    def worker_factory(self):
+        """Returns a picklable callable building a client like this one in a worker process."""
+        return partial(type(self), self.config)
 
     def __enter__(self):
         return self
 
     @property
+    def access_token(self):
+        """Provides the current token, refreshed in the background ahead of its expiry."""
+        return self.token_manager.token
+
     @backoff.on_exception(
         backoff.expo,
         (ConnectionError, Timeout, HTTPError, RequestException),
         max_tries=5,
         max_time=300,
     )
-    def access_token(self):
-        """Provides existing token if valid, if expired will refresh it."""
-        if self.is_token_expired():
-            LOGGER.info("Access token expired or not set, requesting new token.")
-            payload = {"client_id": self.client_id}
-            payload["client_secret"] = self.client_secret
-            payload["grant_type"] = "client_credentials"
-
-            response = requests.post(self.auth_url, json=payload, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
-            self.__access_token = data["access_token"]
-            self.token_expiry_time = datetime.now() + timedelta(
-                seconds=(data["expires_in"] - TOKEN_EXPIRY_BUFFER)
-            )
-
-        return self.__access_token
+    def request_token(self):
+        """Requests a new access token, returns it with the seconds it may be used for."""
+        LOGGER.info("Requesting new access token.")
+        payload = {"client_id": self.client_id}
+        payload["client_secret"] = self.client_secret
+        payload["grant_type"] = "client_credentials"
+
+        response = self.session.post(self.auth_url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        return data["access_token"], data["expires_in"] - TOKEN_EXPIRY_BUFFER
+
+    def get_type(self, name):
+        """Returns the zeep type for `name`, resolving it only once per client."""
+        soap_type = self.soap_types.get(name)
+        if soap_type is None:
+            soap_type = self.soap_types[name] = self.soap_client.get_type(name)
+        return soap_type
+
+    def refresh_soap_header(self):
+        """Sets the oauth SOAP header, rebuilding it only after the token rotated."""
+        access_token = self.access_token
+        if access_token != self.soap_header_token:
+            self.soap_client.set_default_soapheaders([self.oauth_header(access_token)])
+            self.soap_header_token = access_token
 
     def create_simple_filter(self, property_name, operator, value=None, date_value=None):
         """Creates a filter object, handles case for date_value."""
-        simple_part_filter = self.soap_client.get_type("ns0:SimpleFilterPart")
+        simple_part_filter = self.get_type("ns0:SimpleFilterPart")
         _filter = simple_part_filter(Property=property_name, SimpleOperator=operator)
         if not value and date_value:
             _filter.DateValue = date_value
@@ -157,7 +356,7 @@ class Client:
             filter3 = client.create_simple_filter('SubscriberKey', 'greaterThan', '1000')
             nested_complex = client.create_complex_filter(complex_filter, 'OR', filter3)
         """
-        complex_part_filter = self.soap_client.get_type("ns0:ComplexFilterPart")
+        complex_part_filter = self.get_type("ns0:ComplexFilterPart")
         return complex_part_filter(
             LeftOperand=left_operand, LogicalOperator=logical_operator, RightOperand=right_operand
         )
@@ -171,31 +370,26 @@ class Client:
     def retrieve_request(
         self, object_type, properties, request_id=None, search_filter=None
     ):
-        retrieve_req = self.soap_client.get_type("ns0:RetrieveRequest")
-        retrieve_opts = self.soap_client.get_type("ns0:RetrieveOptions")
-
-        retrieve_options = retrieve_opts(
-            BatchSize=self.batch_size,
-            # This ensures all the Inherited APIObject fields are available
-            IncludeObjects=True,
+        batch_size = self.get_batch_size(object_type)
+        retrieve_request_obj = self.build_retrieve_request(
+            object_type, properties, request_id=request_id, search_filter=search_filter
         )
-
-        retrieve_request_obj = retrieve_req(
-            ObjectType=object_type, Properties=properties, Options=retrieve_options
-        )
-
-        if search_filter:
-            retrieve_request_obj.Filter = search_filter
-
-        if request_id:
-            retrieve_request_obj.ContinueRequest = request_id
-
-        oauth_value = self.oauth_header(self.access_token)
-        self.soap_client.set_default_soapheaders([oauth_value])
+        self.refresh_soap_header()
 
         try:
-            response = self.soap_client.service.Retrieve(RetrieveRequest=retrieve_request_obj)
+            try:
+                response = self.soap_client.service.Retrieve(RetrieveRequest=retrieve_request_obj)
+            except ReadTimeout:
+                self.observe_timeout(object_type, batch_size)
+                raise
             self.raise_for_error(response)
+            if object_type in self.batch_tuners:
+                self.observe_page(
+                    object_type,
+                    response["OverallStatus"],
+                    len(response["Results"]),
+                    *self.soap_client.transport.last_response,
+                )
             return response
         except (MarketingCloudError, TransportError, Fault) as err:
             if self.log_search_filter:
@@ -206,6 +400,149 @@ class Client:
                 ) from err
             raise err
 
+    @backoff.on_exception(
+        backoff.expo, (ConnectionError, Timeout, RequestException), max_tries=5, max_time=300
+    )
+    def stream_retrieve_request(
+        self, object_type, properties, request_id=None, search_filter=None
+    ):
+        """Retrieve request parsed by `raw_retrieve` while the response is read.
+
+        Returns the same response as `retrieve_request`, with `Results` a generator of plain
+        dicts. Rows are read from the open connection as the generator is consumed, so a
+        connection lost midway through a page is raised while iterating the rows.
+        """
+        retrieve_request_obj = self.build_retrieve_request(
+            object_type, properties, request_id=request_id, search_filter=search_filter
+        )
+        envelope = self.soap_client.create_message(
+            self.soap_client.service,
+            "Retrieve",
+            RetrieveRequest=retrieve_request_obj,
+            _soapheaders=[self.oauth_header(self.access_token)],
+        )
+        if self.row_converter is None:
+            self.row_converter = RowConverter(self.soap_client.wsdl.types)
+
+        batch_size = self.get_batch_size(object_type)
+        start = time.perf_counter()
+        try:
+            response = self.session.post(
+                self.get_service_address(),
+                data=etree.tostring(envelope, encoding="utf-8", xml_declaration=True),
+                headers={"Content-Type": "text/xml; charset=utf-8", "SOAPAction": '"Retrieve"'},
+                timeout=300,
+                stream=True,
+            )
+        except ReadTimeout:
+            self.observe_timeout(object_type, batch_size)
+            raise
+
+        rows = 0
+
+        def count(results):
+            nonlocal rows
+            for row in results:
+                rows += 1
+                yield row
+
+        def close():
+            response.close()
+            # the page is measured once it was read
+            self.observe_page(
+                object_type,
+                parsed["OverallStatus"],
+                rows,
+                response.raw.tell(),
+                time.perf_counter() - start,
+            )
+
+        try:
+            raise_for_status(response)
+            # undo the gzip or deflate content encoding while parsing
+            response.raw.decode_content = True
+            parsed = parse_retrieve_response(response.raw, self.row_converter, close=close)
+            self.raise_for_error(parsed)
+            parsed["Results"] = count(parsed["Results"])
+        except Exception as err:
+            response.close()
+            if isinstance(err, MarketingCloudError) and self.log_search_filter:
+                LOGGER.info("Filter: %s", search_filter)
+            raise
+        return parsed
+
+    def configure_batch_size(self, object_type, stream_id, stored_size=None):
+        """Sets the BatchSize of the Retrieve calls of `object_type`, synced as `stream_id`.
+
+        `stream_batch_sizes` overrides `batch_size` for the stream. With `auto_batch_size` a
+        `BatchSizeTuner` adjusts the size from then on, starting from `stored_size`, the
+        size a previous run ended with, when there is one.
+        """
+        batch_size = self.stream_batch_sizes.get(stream_id, self.batch_size)
+        if self.auto_batch_size:
+            self.batch_tuners[object_type] = BatchSizeTuner(
+                stream_id,
+                stored_size or batch_size,
+                target_seconds=self.target_page_seconds,
+                max_bytes=self.max_page_bytes,
+            )
+        else:
+            self.batch_sizes[object_type] = batch_size
+
+    def get_batch_size(self, object_type):
+        """Returns the BatchSize of the next Retrieve call of `object_type`."""
+        tuner = self.batch_tuners.get(object_type)
+        if tuner is not None:
+            return tuner.batch_size
+        return self.batch_sizes.get(object_type, self.batch_size)
+
+    def observe_page(self, object_type, status, rows, response_bytes, seconds):
+        """Passes a full page of `object_type` to its tuner, if it has one."""
+        tuner = self.batch_tuners.get(object_type)
+        if tuner is not None and status == "MoreDataAvailable" and rows:
+            tuner.observe(rows, response_bytes, seconds)
+
+    def observe_timeout(self, object_type, batch_size):
+        """Shrinks the pages of `object_type` after a request timed out, with a tuner."""
+        tuner = self.batch_tuners.get(object_type)
+        if tuner is not None:
+            tuner.timed_out(batch_size)
+
+    def get_service_address(self):
+        """Returns the address of the SOAP service, as declared by the WSDL."""
+        service = next(iter(self.soap_client.wsdl.services.values()))
+        port = next(iter(service.ports.values()))
+        return port.binding_options["address"]
+
+    def build_retrieve_request(
+        self, object_type, properties, request_id=None, search_filter=None
+    ):
+        """Builds the RetrieveRequest object for one page."""
+        retrieve_req = self.get_type("ns0:RetrieveRequest")
+
+        # RetrieveOptions only depends on the batch size, so the object is shared by all pages
+        batch_size = self.get_batch_size(object_type)
+        retrieve_options = self.retrieve_options.get(batch_size)
+        if retrieve_options is None:
+            retrieve_opts = self.get_type("ns0:RetrieveOptions")
+            retrieve_options = self.retrieve_options[batch_size] = retrieve_opts(
+                BatchSize=batch_size,
+                # This ensures all the Inherited APIObject fields are available
+                IncludeObjects=True,
+            )
+
+        retrieve_request_obj = retrieve_req(
+            ObjectType=object_type, Properties=properties, Options=retrieve_options
+        )
+
+        if search_filter:
+            retrieve_request_obj.Filter = search_filter
+
+        if request_id:
+            retrieve_request_obj.ContinueRequest = request_id
+
+        return retrieve_request_obj
+
     def raise_for_error(self, response):
         """Handles basic request failure."""
         if "Error: The Request Property(s)" in response["OverallStatus"]:
@@ -227,20 +564,63 @@ class Client:
 
         headers = {"Authorization": f"Bearer {self.access_token}"}
         final_url = f"{self.rest_url}{endpoint}"
-        response = requests.get(final_url, headers=headers, params=params, timeout=self.timeout)
+        response = self.session.get(
+            final_url, headers=headers, params=params, timeout=self.timeout
+        )
         response.raise_for_status()
         return response.json()
 
     def describe_request(self, object_type):
         """Queries schema definition for ET Objects."""
 
-        obj_defn_reqs = self.soap_client.get_type("ns0:ObjectDefinitionRequest")
-        arr_obj_defn_reqs = self.soap_client.get_type("ns0:ArrayOfObjectDefinitionRequest")
+        obj_defn_reqs = self.get_type("ns0:ObjectDefinitionRequest")
+        arr_obj_defn_reqs = self.get_type("ns0:ArrayOfObjectDefinitionRequest")
 
         obj_def = obj_defn_reqs(ObjectType=object_type)
         obj_def_array = arr_obj_defn_reqs(ObjectDefinitionRequest=[obj_def])
 
-        oauth_value = self.oauth_header(self.access_token)
-        self.soap_client.set_default_soapheaders([oauth_value])
+        self.refresh_soap_header()
 
+        with self.describe_lock:
+            self.describe_stats["requests"] += 1
         return self.soap_client.service.Describe(obj_def_array)
+
+    def get_retrievable_fields(self, object_type):
+        """Returns the names of the retrievable properties of an ET Object.
+
+        Results are memoized per object type for the whole run, spawned clients included.
+        With `describe_cache_dir` configured they are also kept on disk for
+        `describe_cache_ttl` seconds, so later runs skip the Describe call altogether.
+        """
+        with self.describe_lock:
+            fields = self.retrievable_fields.get(object_type)
+            if fields is not None:
+                self.describe_stats["memoized"] += 1
+                return fields
+
+            cache_key = f"{self.wsdl_uri}#{object_type}"
+            if self.describe_cache:
+                fields = self.describe_cache.get_fields(cache_key)
+            if fields is not None:
+                self.describe_stats["disk_cache"] += 1
+            else:
+                obj_defs = self.describe_request(object_type)
+                fields = [
+                    prop["Name"]
+                    for prop in obj_defs["ObjectDefinition"][0]["Properties"]
+                    if prop["IsRetrievable"]
+                ]
+                if self.describe_cache:
+                    self.describe_cache.add_fields(cache_key, fields)
+
+            self.retrievable_fields[object_type] = fields
+            return fields
+
+    def log_describe_stats(self):
+        """Logs how many Describe calls were made and how many were avoided."""
+        LOGGER.info(
+            "Describe calls: %s requests, %s served from memory, %s from the disk cache",
+            self.describe_stats["requests"],
+            self.describe_stats["memoized"],
+            self.describe_stats["disk_cache"],
+        )
@@ -0,0 +1,140 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from singer import get_logger
+
+LOGGER = get_logger()
+
+# seconds a blocked producer waits before re-checking whether the consumer went away
+PUT_POLL_INTERVAL = 0.1
+
+
+class _Done:
+    """Marks the end of a producer's items."""
+
+
+class _Failure:
+    """Carries an exception raised by a producer to the consuming thread."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _put(items: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put that gives up once `stop` is set, returns False if it gave up."""
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=PUT_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(task, items: queue.Queue, stop: threading.Event):
+    try:
+        for item in task():
+            if not _put(items, item, stop):
+                return
+        _put(items, _Done, stop)
+    except BaseException as err:  # pylint: disable=broad-except
+        _put(items, _Failure(err), stop)
+
+
+def _consume(items: queue.Queue):
+    while True:
+        item = items.get()
+        if item is _Done:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
+
+
+def run_ordered(tasks, workers: int, buffer_size: int):
+    """Runs `tasks` on a bounded thread pool and yields their results in task order.
+
+    Every task is a callable returning an iterator. At most `workers` tasks run at once and
+    each one may buffer up to `buffer_size` items ahead of the consumer, so memory stays
+    bounded. For every task, in submission order, a generator over its items is yielded;
+    it must be exhausted before the next one is requested. An exception raised by a task is
+    re-raised in the consuming thread when its generator reaches that point.
+    """
+    tasks = iter(tasks)
+    stop = threading.Event()
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def submit_next():
+            task = next(tasks, None)
+            if task is None:
+                return
+            items = queue.Queue(maxsize=buffer_size)
+            executor.submit(_produce, task, items, stop)
+            pending.append(items)
+
+        try:
+            for _ in range(workers):
+                submit_next()
+            while pending:
+                yield _consume(pending.popleft())
+                submit_next()
+        finally:
+            # unblocks producers that are still waiting on a full queue
+            stop.set()
+
+
+def prefetch(task, buffer_size: int):
+    """Runs `task`, a callable returning an iterator, on a background thread and yields its
+    items, so producing the next items overlaps with the caller processing the current one.
+
+    The thread runs at most `buffer_size` items ahead of the caller. An exception raised by
+    `task` is re-raised here once the items produced before it were yielded, and the thread
+    stops when the caller stops early.
+    """
+    ordered = run_ordered([task], 1, buffer_size)
+    try:
+        for items in ordered:
+            yield from items
+    finally:
+        ordered.close()
+
+
+class BoundedPool:
+    """Thread pool handing results back to the submitting thread, in submission order.
+
+    At most `max_pending` calls are queued or running at once: `submit` waits for the oldest
+    one when the limit is reached, so a fast producer cannot grow memory without bound.
+    Results are passed to `handle_result` on the submitting thread only, which keeps every
+    write on a single thread.
+    """
+
+    def __init__(self, workers: int, handle_result, max_pending: int = None):
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.handle_result = handle_result
+        self.max_pending = max_pending or workers * 2
+        self.pending = deque()
+
+    def complete_oldest(self):
+        self.handle_result(self.pending.popleft().result())
+
+    def submit(self, func, *args):
+        """Schedules `func(*args)`, handling the results of calls that completed so far."""
+        while len(self.pending) >= self.max_pending:
+            self.complete_oldest()
+        self.pending.append(self.executor.submit(func, *args))
+        while self.pending and self.pending[0].done():
+            self.complete_oldest()
+
+    def drain(self):
+        """Waits for every pending call and handles its result."""
+        while self.pending:
+            self.complete_oldest()
+
+    def shutdown(self):
+        """Stops the workers, dropping calls that did not start yet."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.pending.clear()
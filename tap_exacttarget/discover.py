@@ -1,5 +1,7 @@
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 
 from singer import get_logger
@@ -8,7 +10,7 @@ from singer.catalog import Catalog
 from tap_exacttarget.client import Client
 from tap_exacttarget.streams import STREAMS
 
-from .discover_dataextensionobj import discover_dao_streams
+from .discover_dataextensionobj import discover_dao_streams, timed_phase
 
 LOGGER = get_logger()
 
@@ -18,15 +20,32 @@ def get_abs_path(path: str) -> str:
     return os.path.join(os.path.dirname(os.path.realpath(__file__)), path)
 
 
+def load_schemas():
+    """Returns the schemas of the static streams, keyed by stream name."""
+    schemas = {}
+    for stream_name in STREAMS:
+        schema_path = get_abs_path(f"schemas/{stream_name}.json")
+        with open(schema_path, encoding="utf-8") as schema_file:
+            schemas[stream_name] = json.load(schema_file)
+    return schemas
+
+
 def discover(client: Client = None):
-    """Performs Discovery for tap-exacttarget."""
+    """Performs Discovery for tap-exacttarget.
+
+    The DataExtension discovery runs in a separate thread while the static schemas are
+    loaded, and itself retrieves DataExtensionFields and DataExtensions concurrently.
+    """
     LOGGER.info("Starting Discovery")
-    doa_streams = discover_dao_streams(client=client)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="discovery") as executor:
+        doa_future = executor.submit(discover_dao_streams, client, True)
+        schemas = timed_phase("static schemas", load_schemas)
+        doa_streams = doa_future.result()
+
     streams = []
     for stream_name, stream in STREAMS.items():
-        schema_path = get_abs_path(f"schemas/{stream_name}.json")
-        with open(schema_path, encoding="utf-8") as schema_file:
-            schema = json.load(schema_file)
+        schema = schemas[stream_name]
         streams.append(
             {
                 "stream": stream_name,
@@ -44,5 +63,5 @@ def discover(client: Client = None):
                 "metadata": stream.get_metadata(stream.schema),
             }
         )
-    LOGGER.info("Discovery Completed")
+    LOGGER.info("Discovery Completed in %.2f seconds", time.monotonic() - start)
     return Catalog.from_dict({"streams": streams})
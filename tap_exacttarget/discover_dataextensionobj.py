@@ -1,11 +1,21 @@
-from singer import get_logger
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from singer import get_logger, metadata
 
 from tap_exacttarget.client import Client
 from tap_exacttarget.exceptions import MarketingCloudError
-from tap_exacttarget.streams import DataExtensionObjectFt, DataExtensionObjectInc
+from tap_exacttarget.streams import STREAMS, DataExtensionObjectFt, DataExtensionObjectInc
 
 LOGGER = get_logger()
 
+# bump whenever the structure of DataExtension definitions changes, invalidates the cache
+DEFINITIONS_VERSION = 1
+# CustomerKeys per IN filter of a selection scoped discovery
+DISCOVERY_KEY_CHUNK_SIZE = 100
+
 field_type_mapping = {
     "Boolean": "boolean",
     "Decimal": "number",
@@ -33,120 +43,312 @@ def detect_field_schema(field):
     return schema
 
 
-def discover_fields(client: Client):
-
+def key_filters(client: Client, property_name, customer_keys=None):
+    """Yields a filter per chunk of `customer_keys`, a single `None` for the whole account."""
+    if customer_keys is None:
+        yield None
+        return
+    customer_keys = sorted(set(customer_keys))
+    for idx in range(0, len(customer_keys), DISCOVERY_KEY_CHUNK_SIZE):
+        chunk = customer_keys[idx: idx + DISCOVERY_KEY_CHUNK_SIZE]
+        if len(chunk) == 1:
+            yield client.create_simple_filter(property_name, "equals", chunk[0])
+        else:
+            yield client.create_simple_filter(property_name, "IN", chunk)
+
+
+def retrieve_pages(client: Client, object_type, query_fields, search_filter=None):
+    """Yields every Retrieve response of `object_type`, following continuations."""
+    # account wide discovery keeps its original Retrieve calls, without a filter argument
+    kwargs = {} if search_filter is None else {"search_filter": search_filter}
     has_data, req_id = True, None
-    doa_fields, field_info = [], {}
-
-    query_fields = ["Name", "IsRequired", "IsPrimaryKey", "FieldType", "DataExtension.CustomerKey"]
-    LOGGER.info("Discovering fields from DataExtensionObjects")
     while has_data:
-        response = client.retrieve_request("DataExtensionField", query_fields, request_id=req_id)
+        response = client.retrieve_request(object_type, query_fields, request_id=req_id, **kwargs)
         req_id = response["RequestID"]
         if response["OverallStatus"] != "MoreDataAvailable":
             has_data = False
-        doa_fields.extend(response["Results"])
+        yield response
 
-    for field in doa_fields:
-        stream_id = field["DataExtension"]["CustomerKey"]
-        field_name = field["Name"].strip()
-        stream_field_data = field_info.setdefault(
-            stream_id, {"key_properties": [], "valid_replication_keys": [], "properties": {}}
-        )
 
-        if field["IsPrimaryKey"]:
-            stream_field_data["key_properties"].append(field_name)
+def add_field(field_info, field):
+    """Folds a DataExtensionField into the key properties, replication keys and schema of its
+    DataExtension in `field_info`."""
+    stream_id = field["DataExtension"]["CustomerKey"]
+    field_name = field["Name"].strip()
+    stream_field_data = field_info.setdefault(
+        stream_id, {"key_properties": [], "valid_replication_keys": [], "properties": {}}
+    )
 
-        if field_name in supported_repl_keys:
-            stream_field_data["valid_replication_keys"].append(field_name)
+    if field["IsPrimaryKey"]:
+        stream_field_data["key_properties"].append(field_name)
 
-        stream_field_data["properties"][field_name] = detect_field_schema(field)
+    if field_name in supported_repl_keys:
+        stream_field_data["valid_replication_keys"].append(field_name)
 
-    LOGGER.info("Finished processing DataExtensionFields count: %s", len(doa_fields))
-    return field_info
+    stream_field_data["properties"][field_name] = detect_field_schema(field)
 
 
-def discover_dao_streams(client: Client):
-    discovered_fields = discover_fields(client)
-    LOGGER.info("Fetching DataExtension objects...")
+def discover_fields(client: Client, customer_keys=None):
+    """Returns the fields of every DataExtension, or only of those in `customer_keys`.
 
-    obj_ref = "DataExtension"
-    fields = ["CustomerKey", "Name", "CategoryID"]
-    request_id = None
-    discovered_streams = {}
-    has_more_data = True
-
-    while has_more_data:
-        response = client.retrieve_request(obj_ref, fields, request_id=request_id)
-        request_id = response["RequestID"]
-        status = response["OverallStatus"]
-
-        if "Error" in status:
-            raise MarketingCloudError(
-                f"Request failed with status: {status}, Unable to discover Streams"
-            )
+    Each page is folded into the result as soon as it arrives, so only the schemas are kept
+    in memory and not every retrieved DataExtensionField.
+    """
 
-        results = response["Results"]
-        LOGGER.info("discovered %s DataExtensions", len(results))
+    field_info, field_count = {}, 0
 
-        for item in results:
-            customer_key = item["CustomerKey"]
-            category_id = item["CategoryID"]
+    query_fields = ["Name", "IsRequired", "IsPrimaryKey", "FieldType", "DataExtension.CustomerKey"]
+    LOGGER.info("Discovering fields from DataExtensionObjects")
+    for search_filter in key_filters(client, "DataExtension.CustomerKey", customer_keys):
+        for response in retrieve_pages(client, "DataExtensionField", query_fields, search_filter):
+            results = response["Results"]
+            for field in results:
+                add_field(field_info, field)
+            field_count += len(results)
+
+    LOGGER.info("Finished processing DataExtensionFields count: %s", field_count)
+    return field_info
 
-            stream_name = item["Name"]
-            stream_id = f"data_extension_{stream_name}".lower()
-            stream_fields = discovered_fields.get(customer_key, {})
 
-            key_props = ["_CustomObjectKey"] + stream_fields.get("key_properties", [])
-            repl_keys = stream_fields.get("valid_replication_keys", [])
-            props = stream_fields.get("properties", {})
+def build_stream_class(stream_name, customer_key, category_id, schema, key_properties,
+                       valid_replication_keys):
+    """Creates the stream class of a DataExtension."""
+    stream_id = f"data_extension_{stream_name}".lower()
+
+    # Modified Date is the preferred replication key
+    # Maintaining original sequence of the key picking order
+    replication_key = next(
+        (
+            key for key in supported_repl_keys if key in valid_replication_keys
+        ),
+        None,
+    )
+
+    #  Sanitize the stream name to create a valid Python class name by removing special characters.
+    name_suffix = stream_name.strip().lower()
+    name_suffix = "".join(c for c in name_suffix if c.isalnum())
+    class_name = f"DataExtensionObjStream{name_suffix}"
+
+    base_class = DataExtensionObjectFt if not valid_replication_keys else DataExtensionObjectInc
+    return type(
+        class_name,
+        (base_class,),
+        {
+            "stream": stream_id,
+            "tap_stream_id": stream_id,
+            "object_ref": f"DataExtensionObject[{stream_name}]",
+            "object_name": stream_name,
+            "key_properties": key_properties,
+            "replication_key": replication_key,
+            "valid_replication_keys": valid_replication_keys,
+            "schema": schema,
+            "customer_key": customer_key,
+            "category_id": category_id,
+        },
+    )
+
+
+def timed_phase(phase, func, *args):
+    """Calls `func` and logs how long this phase of discovery took."""
+    start = time.monotonic()
+    try:
+        return func(*args)
+    finally:
+        LOGGER.info("Discovery phase %s took %.2f seconds", phase, time.monotonic() - start)
+
+
+def discover_extensions(client: Client, customer_keys=None):
+    """Returns the CustomerKey, Name and CategoryID of every DataExtension, or only of those
+    in `customer_keys`."""
+    LOGGER.info("Fetching DataExtension objects...")
 
-            schema = {
+    obj_ref = "DataExtension"
+    fields = ["CustomerKey", "Name", "CategoryID"]
+    extensions = []
+    for search_filter in key_filters(client, "CustomerKey", customer_keys):
+        for response in retrieve_pages(client, obj_ref, fields, search_filter):
+            status = response["OverallStatus"]
+
+            if "Error" in status:
+                raise MarketingCloudError(
+                    f"Request failed with status: {status}, Unable to discover Streams"
+                )
+
+            results = response["Results"]
+            LOGGER.info("discovered %s DataExtensions", len(results))
+            extensions.extend(
+                (item["CustomerKey"], item["Name"], item["CategoryID"]) for item in results
+            )
+    return extensions
+
+
+def discover_dao_definitions(client: Client, customer_keys=None, concurrent=False):
+    """Returns the definition of every DataExtension, keyed by stream id.
+
+    With `customer_keys`, only those DataExtensions and their fields are retrieved, so the
+    cost scales with the selection instead of with the size of the account. With
+    `concurrent`, the DataExtensionField pages are retrieved on a spawned client in another
+    thread while the DataExtension pages are retrieved on this one. A definition holds the
+    keyword arguments of `build_stream_class` and only contains json serializable values, so
+    definitions can be cached.
+    """
+    if concurrent:
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="discovery") as executor:
+            fields_future = executor.submit(
+                timed_phase, "DataExtensionField", discover_fields, client.spawn(), customer_keys
+            )
+            extensions = timed_phase("DataExtension", discover_extensions, client, customer_keys)
+            discovered_fields = fields_future.result()
+    else:
+        discovered_fields = discover_fields(client, customer_keys)
+        extensions = discover_extensions(client, customer_keys)
+
+    definitions = {}
+    for customer_key, stream_name, category_id in extensions:
+        stream_id = f"data_extension_{stream_name}".lower()
+        stream_fields = discovered_fields.get(customer_key, {})
+
+        key_props = ["_CustomObjectKey"] + stream_fields.get("key_properties", [])
+        props = stream_fields.get("properties", {})
+
+        definitions[stream_id] = {
+            "stream_name": stream_name,
+            "customer_key": customer_key,
+            "category_id": category_id,
+            "schema": {
                 "type": "object",
                 "properties": {
                     "_CustomObjectKey": {"type": ["string"]},
                     "CategoryID": {"type": ["null", "integer"]},
                     **props,
                 },
-            }
-
-            # Modified Date is the preferred replication key
-            # Maintaining original sequence of the key picking order
-            replication_key = next(
-                (
-                    key for key in supported_repl_keys if key in repl_keys
-                ),
-                None,
-            )
-
-            #  Sanitize the stream name to create a valid Python class name by removing special characters.
-            name_suffix = stream_name.strip().lower()
-            name_suffix = "".join(c for c in name_suffix if c.isalnum())
-            class_name = f"DataExtensionObjStream{name_suffix}"
-
+            },
             # prevents unpredictable order of key properties
-            sorted_key_props = sorted(set(key_props))
-
-            base_class = DataExtensionObjectFt if not repl_keys else DataExtensionObjectInc
-            stream_class = type(
-                class_name,
-                (base_class,),
-                {
-                    "stream": stream_id,
-                    "tap_stream_id": stream_id,
-                    "object_ref": f"DataExtensionObject[{stream_name}]",
-                    "key_properties": sorted_key_props,
-                    "replication_key": replication_key,
-                    "valid_replication_keys": repl_keys,
-                    "schema": schema,
-                    "customer_key": customer_key,
-                    "category_id": category_id,
-                },
-            )
-
-            discovered_streams[stream_id] = stream_class
-
-        if status != "MoreDataAvailable":
-            has_more_data = False
-
-    return discovered_streams
+            "key_properties": sorted(set(key_props)),
+            "valid_replication_keys": stream_fields.get("valid_replication_keys", []),
+        }
+
+    return definitions
+
+
+def discover_dao_streams(client: Client, concurrent=False):
+    """Discovers every DataExtension of the account and returns their stream classes."""
+    definitions = discover_dao_definitions(client, concurrent=concurrent)
+    save_cached_definitions(client, definitions)
+    return {
+        stream_id: build_stream_class(**definition)
+        for stream_id, definition in definitions.items()
+    }
+
+
+def definition_from_catalog(catalog_entry):
+    """Returns the definition of a DataExtension stream from its catalog entry.
+
+    Uses the custom root metadata written by discovery, `None` if the catalog was produced
+    by an older discovery run without it.
+    """
+    root = metadata.to_map(catalog_entry.metadata).get((), {})
+    if "customer-key" not in root or "object-name" not in root:
+        return None
+    return {
+        "stream_name": root["object-name"],
+        "customer_key": root["customer-key"],
+        "category_id": root.get("category-id"),
+        "schema": catalog_entry.schema.to_dict(),
+        "key_properties": root.get("table-key-properties", []),
+        "valid_replication_keys": root.get("valid-replication-keys") or [],
+    }
+
+
+def definitions_fingerprint(client: Client) -> str:
+    """Cache key of the DataExtension definitions of a tenant.
+
+    Includes a hash of the rules turning DataExtensionFields into schemas, so definitions
+    cached by a different version of the tap are never reused.
+    """
+    discovery_rules = json.dumps(
+        [field_type_mapping, field_format, supported_repl_keys, DEFINITIONS_VERSION],
+        sort_keys=True,
+    )
+    return f"{client.wsdl_uri}#{hashlib.sha256(discovery_rules.encode('utf-8')).hexdigest()}"
+
+
+def load_cached_definitions(client: Client):
+    """Returns the cached DataExtension definitions, `None` on a miss."""
+    if client.dao_cache is None:
+        return None
+    content = client.dao_cache.get(definitions_fingerprint(client))
+    return json.loads(content) if content is not None else None
+
+
+def save_cached_definitions(client: Client, definitions) -> None:
+    """Caches the DataExtension definitions when `dao_cache_dir` is configured."""
+    if client.dao_cache is not None:
+        client.dao_cache.add(definitions_fingerprint(client), json.dumps(definitions))
+
+
+def find_customer_keys(client: Client, stream_ids):
+    """Returns the CustomerKeys of the DataExtensions behind `stream_ids`.
+
+    Lists the DataExtensions of the account, which is much cheaper than listing their fields.
+    """
+    stream_ids, customer_keys = set(stream_ids), []
+    for response in retrieve_pages(client, "DataExtension", ["CustomerKey", "Name"]):
+        for item in response["Results"]:
+            if f"data_extension_{item['Name']}".lower() in stream_ids:
+                customer_keys.append(item["CustomerKey"])
+    return customer_keys
+
+
+def discover_selected_definitions(client: Client, missing):
+    """Discovers the DataExtensions of `missing`, a list of `(stream_id, customer_key)` where
+    the CustomerKey is `None` when the catalog does not hold it."""
+    customer_keys = [customer_key for _, customer_key in missing if customer_key]
+    unknown = [stream_id for stream_id, customer_key in missing if not customer_key]
+    if unknown:
+        customer_keys += find_customer_keys(client, unknown)
+    LOGGER.info("Discovering %d selected DataExtensions", len(customer_keys))
+    return discover_dao_definitions(client, customer_keys)
+
+
+def load_dao_streams(client: Client, selected_streams):
+    """Returns the stream classes of the selected DataExtension streams.
+
+    Classes are rebuilt from the catalog entries. Selected DataExtensions the catalog does not
+    describe are taken from the on-disk cache of definitions when `dao_cache_dir` is
+    configured, and otherwise discovered, restricted to those DataExtensions.
+    """
+    streams, missing = {}, []
+    for catalog_entry in selected_streams:
+        stream_id = catalog_entry.tap_stream_id
+        if stream_id in STREAMS:
+            continue
+        definition = definition_from_catalog(catalog_entry)
+        if definition is None:
+            root = metadata.to_map(catalog_entry.metadata).get((), {})
+            missing.append((stream_id, root.get("customer-key")))
+        else:
+            streams[stream_id] = build_stream_class(**definition)
+
+    LOGGER.info("Rebuilt %d DataExtension streams from the catalog", len(streams))
+    if not missing:
+        return streams
+
+    definitions = load_cached_definitions(client) or {}
+    undiscovered = [item for item in missing if item[0] not in definitions]
+    if undiscovered:
+        LOGGER.info(
+            "DataExtension streams %s not described by the catalog, discovering",
+            [stream_id for stream_id, _ in undiscovered],
+        )
+        definitions.update(discover_selected_definitions(client, undiscovered))
+        save_cached_definitions(client, definitions)
+    else:
+        LOGGER.info("DataExtension streams loaded from the discovery cache")
+
+    for stream_id, _ in missing:
+        if stream_id in definitions:
+            streams[stream_id] = build_stream_class(**definitions[stream_id])
+        else:
+            LOGGER.warning("DataExtension stream %s no longer exists in the account", stream_id)
+    return streams
@@ -0,0 +1,116 @@
+"""Process pool extraction of the date windows of incremental streams.
+
+Once a page is parsed, turning zeep objects into dicts, applying `singer.Transformer` and
+encoding RECORD messages is CPU bound and holds the GIL, so threads alone keep a sync on a
+single core. With `process_workers` above 1 those steps run in worker processes, every one
+owning its own `Client`. A work unit is one date window of one stream, and a worker sends
+back the encoded RECORD lines of its window along with the highest replication value seen.
+The parent writes them in window order, so STATE messages follow the same order as a serial
+run.
+"""
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from singer import Transformer, get_logger
+
+from tap_exacttarget.sink import OutputSink
+from tap_exacttarget.streams import STREAMS
+
+LOGGER = get_logger()
+
+# windows each worker may have queued or in flight ahead of the writer
+WINDOWS_PER_WORKER = 2
+
+_worker = {}
+
+
+def init_worker(client_factory):
+    """Creates the client and the record encoder of a worker process."""
+    _worker["client"] = client_factory()
+    _worker["sink"] = OutputSink()
+
+
+def extract_window(tap_stream_id, stream_metadata, schema, query_fields, batch_size, start_dt,
+                   end_dt):
+    """Fetches and transforms one date window of a stream inside a worker process.
+
+    Pages hold `batch_size` records, the size the parent uses for the stream when the window
+    is submitted. Returns the encoded RECORD lines of the window, the highest replication
+    value of its records, `None` if it has none, and the number of records.
+    """
+    stream = STREAMS[tap_stream_id](stream_metadata, schema, _worker["client"])
+    _worker["client"].batch_sizes[stream.object_ref] = batch_size
+    encode_record = _worker["sink"].encode_record
+    lines, max_value = [], None
+
+    with Transformer() as transformer:
+        pages = stream.get_window_pages(_worker["client"], query_fields, start_dt, end_dt)
+        for page in pages:
+            for record_timestamp, record in stream.transform_page(
+                page, schema, stream_metadata, transformer
+            ):
+                lines.append(encode_record(tap_stream_id, record))
+                if max_value is None or record_timestamp > max_value:
+                    max_value = record_timestamp
+    return "".join(lines), max_value, len(lines)
+
+
+class ExtractionPool:
+    """Pool of worker processes extracting date windows, shared by every stream of a sync.
+
+    Workers are started with the `spawn` method, so they never inherit locks held by the
+    threads of the parent, and build their client with `client_factory`, a picklable
+    callable taking no argument.
+    """
+
+    def __init__(self, client_factory, workers: int) -> None:
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(client_factory,),
+        )
+
+    def extract_windows(self, stream, stream_metadata, schema, query_fields, windows):
+        """Yields `(start_dt, end_dt, result)` for every date window, in window order.
+
+        `result` is the tuple returned by `extract_window`. At most `WINDOWS_PER_WORKER`
+        windows per worker are pending at once, so memory stays bounded whatever the number
+        of windows, and windows not started yet are cancelled if the caller stops early.
+        """
+        windows = iter(windows)
+        pending = deque()
+        max_pending = self.workers * WINDOWS_PER_WORKER
+
+        def submit_next():
+            window = next(windows, None)
+            if window is not None:
+                future = self.executor.submit(
+                    extract_window,
+                    stream.tap_stream_id,
+                    stream_metadata,
+                    schema,
+                    query_fields,
+                    stream.client.get_batch_size(stream.object_ref),
+                    *window,
+                )
+                pending.append((window, future))
+
+        try:
+            for _ in range(max_pending):
+                submit_next()
+            while pending:
+                (start_dt, end_dt), future = pending.popleft()
+                result = future.result()
+                submit_next()
+                yield start_dt, end_dt, result
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Stops the worker processes, dropping windows that did not start yet."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,159 @@
+"""Streaming parser of SOAP Retrieve responses, enabled with the `raw_retrieve` setting.
+
+zeep reads a whole `RetrieveResponseMsg` into an lxml tree and converts it into an object
+graph before the first row is returned. Here the response body is read with
+`lxml.etree.iterparse` while it is downloaded, every `Results` element is converted into a
+plain `dict` as soon as it is complete and then dropped from the tree, so a page never holds
+more than one parsed row.
+
+Rows are converted with the types of the WSDL, giving the same values as zeep: elements
+missing from a row and empty complex elements are `None`, missing repeated elements are
+`[]`, and values are parsed by the zeep type of their element.
+"""
+
+from lxml import etree
+from zeep.xsd.types.complex import ComplexType
+
+from tap_exacttarget.exceptions import MarketingCloudSoapApiException
+
+PARTNER_NS = "http://exacttarget.com/wsdl/partnerAPI"
+SOAP_ENV_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+XSI_TYPE = "{http://www.w3.org/2001/XMLSchema-instance}type"
+XSI_NIL = "{http://www.w3.org/2001/XMLSchema-instance}nil"
+
+OVERALL_STATUS_TAG = f"{{{PARTNER_NS}}}OverallStatus"
+REQUEST_ID_TAG = f"{{{PARTNER_NS}}}RequestID"
+RESULTS_TAG = f"{{{PARTNER_NS}}}Results"
+
+
+class RowConverter:
+    """Converts `Results` elements into dicts, with a lookup table compiled once per type.
+
+    The `xsi:type` of a row selects the type, and so the table, it is converted with.
+    """
+
+    def __init__(self, schema) -> None:
+        self.schema = schema
+        self.tables = {}
+
+    def get_table(self, xsd_type):
+        """Returns `(names, repeated, fields)` of a complex type: its element names in order,
+        the names of repeated elements, and the name, repetition and zeep element of every
+        child element tag."""
+        table = self.tables.get(id(xsd_type))
+        if table is None:
+            names, repeated, fields = [], [], {}
+            for name, element in xsd_type.elements:
+                many = element.max_occurs == "unbounded" or element.max_occurs > 1
+                names.append(name)
+                if many:
+                    repeated.append(name)
+                fields[element.qname.text] = (name, many, element)
+            table = self.tables[id(xsd_type)] = (names, repeated, fields)
+        return table
+
+    def resolve_type(self, elem, xsd_type):
+        """Returns the type named by the `xsi:type` of `elem`, or `xsd_type`."""
+        type_name = elem.get(XSI_TYPE)
+        if type_name is None:
+            return xsd_type
+        prefix, _, local_name = type_name.rpartition(":")
+        namespace = elem.nsmap.get(prefix or None, PARTNER_NS)
+        return self.schema.get_type(f"{{{namespace}}}{local_name}")
+
+    def convert(self, elem, xsd_type):
+        """Converts a complex element into a dict ordered like the elements of its type."""
+        names, repeated, fields = self.get_table(self.resolve_type(elem, xsd_type))
+        row = dict.fromkeys(names)
+        for name in repeated:
+            row[name] = []
+        for child in elem:
+            field = fields.get(child.tag)
+            if field is None:
+                continue
+            name, many, element = field
+            if child.get(XSI_NIL) == "true":
+                value = None
+            elif isinstance(element.type, ComplexType):
+                # like zeep, an empty complex element is `None`
+                value = self.convert(child, element.type) if len(child) else None
+            else:
+                value = element.type.parse_xmlelement(child, self.schema)
+            if many:
+                row[name].append(value)
+            else:
+                row[name] = value
+        return row
+
+
+def iter_results(events, first, converter, api_object, close):
+    """Yields the rows of the `Results` elements of `events`, starting with `first`, then
+    calls `close`."""
+    try:
+        yield from _iter_rows(events, first, converter, api_object)
+    finally:
+        if close is not None:
+            close()
+
+
+def _iter_rows(events, first, converter, api_object):
+    elem = first
+    while elem is not None:
+        yield converter.convert(elem, api_object)
+        # drop the converted row and the rows before it, the tree keeps only open elements
+        elem.clear()
+        parent = elem.getparent()
+        while elem.getprevious() is not None:
+            del parent[0]
+
+        elem = None
+        for _, event_elem in events:
+            if event_elem.tag == RESULTS_TAG and event_elem.getparent().tag != RESULTS_TAG:
+                elem = event_elem
+                break
+
+
+def parse_retrieve_response(source, converter, close=None):
+    """Parses a Retrieve response envelope read from the file-like `source`.
+
+    Returns a dict like the `RetrieveResponseMsg` of zeep, with `Results` a generator of
+    dicts reading the rest of `source` as rows are requested. `OverallStatus` and
+    `RequestID` come before the first row in the response, so they are read right away.
+    Rows are converted by the `RowConverter` `converter`, and `close` is called once they
+    are exhausted or the generator is closed.
+    """
+    api_object = converter.schema.get_type(f"{{{PARTNER_NS}}}APIObject")
+    response = {"OverallStatus": None, "RequestID": None}
+    events = etree.iterparse(source, events=("end",), remove_blank_text=True, huge_tree=True)
+
+    first = None
+    for _, elem in events:
+        if elem.tag == OVERALL_STATUS_TAG:
+            response["OverallStatus"] = elem.text
+        elif elem.tag == REQUEST_ID_TAG:
+            response["RequestID"] = elem.text
+        elif elem.tag == RESULTS_TAG and elem.getparent().tag != RESULTS_TAG:
+            first = elem
+            break
+
+    response["Results"] = iter_results(events, first, converter, api_object, close)
+    return response
+
+
+def read_fault(body):
+    """Returns the `faultstring` of a SOAP Fault response body, or the body itself."""
+    try:
+        fault = etree.fromstring(body).find(f".//{{{SOAP_ENV_NS}}}Fault")
+    except etree.XMLSyntaxError:
+        fault = None
+    if fault is None:
+        return body.decode("utf-8", errors="replace")
+    return fault.findtext("faultstring") or "Unknown fault"
+
+
+def raise_for_status(response):
+    """Raises like the zeep path when a Retrieve response is not successful."""
+    if response.status_code != 200:
+        error = read_fault(response.content)
+        response.close()
+        raise MarketingCloudSoapApiException(f"SOAP Fault or Transport Error: {error}")
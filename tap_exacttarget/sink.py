@@ -0,0 +1,177 @@
+"""Buffered writer for the Singer messages emitted during sync.
+
+`singer.write_record` encodes every message with a fresh `simplejson.dumps` call and flushes
+stdout after each line. `OutputSink` encodes with a prebuilt encoder producing the same
+output and writes records in large blocks. Records are flushed whenever the buffer reaches
+`flush_bytes` or `flush_interval` seconds passed since the last flush, and always before a
+SCHEMA or STATE message, so the ordering Singer targets rely on is kept.
+"""
+
+import copy
+import sys
+import threading
+import time
+
+import simplejson
+from singer.messages import SchemaMessage
+
+DEFAULT_OUTPUT_BUFFER_SIZE = 1 << 20
+DEFAULT_OUTPUT_FLUSH_INTERVAL = 1.0
+
+
+class OutputSink:
+    """Buffers encoded Singer messages and writes them to `output` in blocks."""
+
+    def __init__(self, output=None, flush_bytes: int = DEFAULT_OUTPUT_BUFFER_SIZE,
+                 flush_interval: float = DEFAULT_OUTPUT_FLUSH_INTERVAL) -> None:
+        self.output = output
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        # same settings as `singer.messages.format_message`
+        self.encoder = simplejson.JSONEncoder(use_decimal=True, ensure_ascii=True)
+        self.lock = threading.Lock()
+        self.buffer = []
+        self.buffered_bytes = 0
+        self.last_flush = time.monotonic()
+
+    def _write(self, data: str) -> None:
+        output = self.output or sys.stdout
+        output.write(data)
+        output.flush()
+
+    def _flush(self) -> None:
+        if self.buffer:
+            data = "".join(self.buffer)
+            self.buffer = []
+            self.buffered_bytes = 0
+            self._write(data)
+        self.last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """Writes every buffered message."""
+        with self.lock:
+            self._flush()
+
+    def encode_record(self, stream_name: str, record: dict) -> str:
+        """Returns the RECORD message line `write_record` would write for `record`."""
+        return (
+            self.encoder.encode({"type": "RECORD", "stream": stream_name, "record": record})
+            + "\n"
+        )
+
+    def write_record(self, stream_name: str, record: dict) -> None:
+        self.write_encoded(self.encode_record(stream_name, record))
+
+    def write_encoded(self, data: str) -> None:
+        """Buffers RECORD messages already encoded by `encode_record`, one per line."""
+        with self.lock:
+            self.buffer.append(data)
+            self.buffered_bytes += len(data)
+            if (
+                self.buffered_bytes >= self.flush_bytes
+                or time.monotonic() - self.last_flush >= self.flush_interval
+            ):
+                self._flush()
+
+    def write_message(self, message: dict) -> None:
+        """Writes a non RECORD message right away, after the records buffered before it."""
+        line = self.encoder.encode(message)
+        with self.lock:
+            self.buffer.append(line + "\n")
+            self._flush()
+
+    def write_state(self, value: dict) -> None:
+        self.write_message({"type": "STATE", "value": value})
+
+    def write_schema(self, stream_name, schema, key_properties, bookmark_properties=None):
+        if isinstance(key_properties, (str, bytes)):
+            key_properties = [key_properties]
+        if bookmark_properties and isinstance(bookmark_properties, (str, bytes)):
+            bookmark_properties = [bookmark_properties]
+        message = SchemaMessage(
+            stream=stream_name,
+            schema=schema,
+            key_properties=key_properties,
+            bookmark_properties=bookmark_properties,
+        )
+        self.write_message(message.asdict())
+
+
+class StateMergingSink:
+    """Sink for streams synced in parallel, merging their STATE messages into one state.
+
+    Records and schemas go straight to the wrapped sink, the only writer of the tap. Every
+    stream syncs with its own copy of the state, and a STATE written from the thread of a
+    stream only contributes the bookmark of that stream, set by `bind_stream`. The merged
+    state is written after the records buffered before it, so each STATE message only covers
+    records already emitted.
+    """
+
+    def __init__(self, output: OutputSink, state: dict) -> None:
+        self.output = output
+        self.state = state
+        self.lock = threading.Lock()
+        self.streams = threading.local()
+
+    def bind_stream(self, tap_stream_id) -> None:
+        """Attributes the STATE written from the calling thread to `tap_stream_id`."""
+        self.streams.tap_stream_id = tap_stream_id
+
+    def snapshot(self) -> dict:
+        """Returns a copy of the merged state, to sync a stream with."""
+        with self.lock:
+            return copy.deepcopy(self.state)
+
+    def write_record(self, stream_name: str, record: dict) -> None:
+        self.output.write_record(stream_name, record)
+
+    def write_encoded(self, data: str) -> None:
+        self.output.write_encoded(data)
+
+    def write_schema(self, stream_name, schema, key_properties, bookmark_properties=None):
+        self.output.write_schema(stream_name, schema, key_properties, bookmark_properties)
+
+    def write_state(self, value: dict) -> None:
+        tap_stream_id = getattr(self.streams, "tap_stream_id", None)
+        with self.lock:
+            bookmark = value.get("bookmarks", {}).get(tap_stream_id)
+            if tap_stream_id is not None and bookmark is not None:
+                self.state.setdefault("bookmarks", {})[tap_stream_id] = copy.deepcopy(bookmark)
+            self.output.write_state(self.state)
+
+    def flush(self) -> None:
+        self.output.flush()
+
+
+_sink = OutputSink(flush_bytes=0)
+
+
+def get_sink() -> OutputSink:
+    return _sink
+
+
+def set_sink(sink) -> None:
+    """Routes every message written through this module to `sink`, flushing the previous one."""
+    global _sink  # pylint: disable=global-statement
+    _sink.flush()
+    _sink = sink
+
+
+def write_record(stream_name: str, record: dict) -> None:
+    _sink.write_record(stream_name, record)
+
+
+def write_encoded(data: str) -> None:
+    _sink.write_encoded(data)
+
+
+def write_state(value: dict) -> None:
+    _sink.write_state(value)
+
+
+def write_schema(stream_name, schema, key_properties, bookmark_properties=None) -> None:
+    _sink.write_schema(stream_name, schema, key_properties, bookmark_properties)
+
+
+def flush() -> None:
+    _sink.flush()
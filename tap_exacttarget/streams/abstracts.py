@@ -1,29 +1,65 @@
 import json
+import threading
 from abc import ABC, abstractmethod
 from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache, partial
 from typing import Any, Dict, List, Tuple
 
 import dateutil.parser
-from singer import Transformer, get_bookmark, get_logger, write_bookmark, write_record
+from singer import Transformer, get_bookmark, get_logger, write_bookmark
 from singer.metadata import get_standard_metadata, to_list, to_map, write
 from singer.utils import now
-from zeep.helpers import serialize_object
+from zeep.xsd.valueobjects import CompoundValue
+
+from tap_exacttarget.concurrency import prefetch, run_ordered
+from tap_exacttarget.exceptions import IncompatibleFieldSelectionError
+from tap_exacttarget.sink import write_encoded, write_record, write_state
+from tap_exacttarget.windowing import AdaptiveWindowPlanner
 
 LOGGER = get_logger()
 
+PLAIN_TYPES = frozenset((str, int, float, bool, type(None)))
+# pages each concurrently fetched date window may buffer ahead of the writer
+WINDOW_PAGE_BUFFER = 2
+# bookmark key of the date window size learned by `AdaptiveWindowPlanner`
+WINDOW_SIZE_KEY = "date_window"
+# bookmark key of the Retrieve BatchSize learned by `batching.BatchSizeTuner`
+BATCH_SIZE_KEY = "batch_size"
+# distinct datetime strings whose CST conversion is kept, events share timestamps in bulk
+DATETIME_CACHE_SIZE = 4096
+
 
 # https://help.salesforce.com/s/articleView?id=mktg.mc_server_timezone_changes.htm&type=5
 # Must use -6 to avoid DST impact
 fixed_cst = timezone(timedelta(hours=-6))
 
 
-def strptime_to_cst(dtimestr):
-    """Converts a datetime string to a datetime object in (CST)."""
-    d_object = dateutil.parser.parse(dtimestr)
+def datetime_to_cst(d_object):
+    """Converts a datetime object to (CST), naive values are taken as CST."""
     if d_object.tzinfo is None:
         return d_object.replace(tzinfo=fixed_cst)
-    else:
-        return d_object.astimezone(tz=fixed_cst)
+    return d_object.astimezone(tz=fixed_cst)
+
+
+@lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def strptime_to_cst(dtimestr):
+    """Converts a datetime string to a datetime object in (CST).
+
+    ISO 8601 strings are parsed with `datetime.fromisoformat`, other formats fall back to
+    `dateutil`.
+    """
+    try:
+        d_object = datetime.fromisoformat(dtimestr)
+    except ValueError:
+        d_object = dateutil.parser.parse(dtimestr)
+    return datetime_to_cst(d_object)
+
+
+def to_cst(value):
+    """Converts a replication key value, a native `datetime` or a string, to (CST)."""
+    if isinstance(value, datetime):
+        return datetime_to_cst(value)
+    return strptime_to_cst(value)
 
 
 class CustomDTParser(json.JSONEncoder):
@@ -37,10 +73,46 @@ class CustomDTParser(json.JSONEncoder):
         return super().default(o)
 
 
+def to_plain(value):
+    """Converts zeep objects, lists and date / time values to plain python types."""
+    value_type = type(value)
+    if value_type in PLAIN_TYPES:
+        return value
+    if isinstance(value, CompoundValue):
+        return {key: to_plain(val) for key, val in value.__values__.items()}
+    if isinstance(value, list):
+        return [to_plain(val) for val in value]
+    if isinstance(value, dict):
+        return {key: to_plain(val) for key, val in value.items()}
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def serialize_record(obj, fields=None):
+    """Converts a zeep object to a `dict`, restricted to `fields` when provided.
+
+    Keys keep the order of the object, whatever the order of `fields`.
+    """
+    values = obj.__values__ if isinstance(obj, CompoundValue) else obj
+    if fields is None:
+        return {key: to_plain(val) for key, val in values.items()}
+    fields = frozenset(fields)
+    return {key: to_plain(val) for key, val in values.items() if key in fields}
+
+
 class BaseStream(ABC):
     """Base stream class."""
 
     schema = None
+    # fields read by a subclass `transform_record` that are not part of the schema
+    source_fields = ()
+    _materialized_fields = False
+    # field projection of `get_query_fields`, `projected_fields` is None when nothing is removed
+    available_fields = ()
+    removed_fields = ()
+    projected_fields = None
+    projection_failed = False
 
     @property
     @abstractmethod
@@ -112,55 +184,218 @@ class BaseStream(ABC):
         self.metadata = metadata
         self.schema = schema
         self.stream_metadata = metadata.get(()) or {}
+        # client prefetching pages for every thread calling `paginate`, spawned once
+        self.prefetch_clients = threading.local()
+
+    def configure_batch_size(self, state: dict) -> None:
+        """Sets the BatchSize of the Retrieve calls of the stream, starting from the size
+        learned by a previous run if `state` has one, see `Client.configure_batch_size`."""
+        self.client.configure_batch_size(
+            self.object_ref,
+            self.tap_stream_id,
+            get_bookmark(state, self.tap_stream_id, BATCH_SIZE_KEY),
+        )
+
+    def write_batch_size(self, state: dict) -> Dict:
+        """Keeps the BatchSize learned with `auto_batch_size` for the next run."""
+        tuner = self.client.batch_tuners.get(self.object_ref)
+        if tuner is not None:
+            state = write_bookmark(state, self.tap_stream_id, BATCH_SIZE_KEY, tuner.batch_size)
+        return state
 
     def get_available_fields(self):
         """Provides selectable fields for each stream."""
-        is_retrievable = []
-        obj_defs = self.client.describe_request(self.object_ref)
-        schema = obj_defs["ObjectDefinition"][0]
-        for prop in schema["Properties"]:
-            if prop["IsRetrievable"]:
-                is_retrievable.append(prop["Name"])
-        return is_retrievable
-
-    def get_query_fields(self, *args, **kwargs):
-        """Filter Query fields."""
-        available_fields =  self.get_available_fields()
-        LOGGER.info("Objtype: %s fields: %s", self.object_ref, available_fields)
-        return available_fields
+        return list(self.client.get_retrievable_fields(self.object_ref))
 
-    def transform_record(self, obj):
+    def get_query_fields(self, stream_metadata=None, schema=None):
+        """Returns the retrievable fields the emitted records need.
+
+        Describe-retrievable properties are intersected with the fields `get_selected_fields`
+        keeps, a nested property such as `Client.ID` being requested when its top level
+        field is. The properties left out are kept in `removed_fields`, so `paginate` can
+        request every retrievable field if the projected ones are refused.
         """
-        Zeep service objects (e.g., instances of `<class 'zeep.objects.StreamName'>`,
-        `<class 'zeep.objects.DataFolder'>`, `<class 'zeep.objects.Event'>`, etc.) are
-        not native Python dictionaries or lists, even though they support key-based
-        access (e.g., `obj["key"]`). This causes compatibility issues when passing
-        them to singer.transformer, which expect standard serializable types
-        (e.g., `dict` or `list`).
-
-        To make these Zeep objects compatible, they can be converted using Zeep’s
-        `serialize_object()` utility:
-
-            sz = serialize_object(obj, dict)
-            jzd = json.dumps(serialize_object(obj), cls=CustomDTParser)
-            jzl = json.loads(jzd)
-
-            print(type(obj), type(sz), type(jzl))
-            # Output:
-            # <class 'zeep.objects.DataFolder'> <class 'dict'> <class 'dict'>
-
-        Although `serialize_object()` successfully converts the Zeep object into a
-        dictionary, nested `datetime` instances within the structure can still cause
-        serialization errors during transformation, such as:
-
-            TypeError: Parser must be a string or character stream, not datetime
-
-        To address this, a custom JSON encoder (e.g., `CustomDTParser`) is required
-        to recursively convert all `datetime` objects to their ISO 8601 string
-        representations via `datetime.isoformat()`. This ensures full compatibility
-        with transformers.
+        available_fields = self.get_available_fields()
+        selected_fields = self.get_selected_fields(
+            self.metadata if stream_metadata is None else stream_metadata,
+            self.schema if schema is None else schema,
+        )
+        if selected_fields is None:
+            LOGGER.info("Objtype: %s fields: %s", self.object_ref, available_fields)
+            return available_fields
+
+        selected_fields = frozenset(selected_fields)
+        query_fields, removed_fields = [], []
+        for field in available_fields:
+            if field.split(".", 1)[0] in selected_fields:
+                query_fields.append(field)
+            else:
+                removed_fields.append(field)
+
+        self.available_fields, self.removed_fields = available_fields, removed_fields
+        self.projected_fields = query_fields if removed_fields else None
+        LOGGER.info(
+            "Objtype: %s fields: %s, %d unselected fields not requested",
+            self.object_ref,
+            query_fields,
+            len(removed_fields),
+        )
+        return query_fields
+
+    def fall_back_to_available_fields(self, query_fields, err):
+        """Returns every retrievable field in place of a projected `query_fields` refused by
+        the API, raises `err` if the fields were not projected."""
+        if not self.projected_fields or list(query_fields) != self.projected_fields:
+            raise err
+        if not self.projection_failed:
+            LOGGER.warning(
+                "Stream %s: Retrieve refused the selected fields (%s), requesting the %d "
+                "unselected fields as well",
+                self.tap_stream_id,
+                err,
+                len(self.removed_fields),
+            )
+            self.projection_failed = True
+        return self.available_fields
+
+    def paginate(self, query_fields, search_filter=None, client=None):
+        """Pages through a Retrieve request, yields the transformed records of every page.
+
+        With `prefetch_pages` set, pages are requested on a background thread with a client
+        of its own, up to `prefetch_pages` pages ahead of the caller, so the next
+        `ContinueRequest` is in flight while the current page is written.
         """
-        return json.loads(json.dumps(serialize_object(obj), cls=CustomDTParser))
+        client = client or self.client
+        if client.prefetch_pages > 0:
+            yield from prefetch(
+                partial(
+                    self.fetch_pages, query_fields, search_filter, self.get_prefetch_client(client)
+                ),
+                client.prefetch_pages,
+            )
+        else:
+            yield from self.fetch_pages(query_fields, search_filter, client)
+
+    def get_prefetch_client(self, client):
+        """Returns the client prefetching the pages of the calling thread, spawned from
+        `client` on first use. A prefetch thread is stopped before `paginate` returns, so the
+        calls of one thread never use it at once."""
+        if not hasattr(self.prefetch_clients, "client"):
+            self.prefetch_clients.client = client.spawn()
+        return self.prefetch_clients.client
+
+    def fetch_pages(self, query_fields, search_filter, client):
+        """Yields the transformed records of every page of a Retrieve request."""
+        retrieve = client.retrieve_request
+        if client.raw_retrieve:
+            retrieve = client.stream_retrieve_request
+        next_page, request_id = True, None
+        if self.projection_failed and list(query_fields) == self.projected_fields:
+            query_fields = self.available_fields
+
+        while next_page:
+            try:
+                response = retrieve(
+                    self.object_ref,
+                    query_fields,
+                    request_id=request_id,
+                    search_filter=search_filter,
+                )
+            except IncompatibleFieldSelectionError as err:
+                if request_id is not None:
+                    raise
+                query_fields = self.fall_back_to_available_fields(query_fields, err)
+                continue
+            raw_records, request_id = response["Results"], response["RequestID"]
+            next_page = self.has_next_page(response, query_fields)
+
+            yield [self.transform_record(rec) for rec in raw_records]
+
+    async def paginate_async(self, client, query_fields, search_filter=None):
+        """Async counterpart of `paginate`, paging through a Retrieve request of an
+        `async_client.AsyncClient`."""
+        next_page, request_id = True, None
+        if self.projection_failed and list(query_fields) == self.projected_fields:
+            query_fields = self.available_fields
+
+        while next_page:
+            try:
+                response = await client.retrieve_request(
+                    self.object_ref,
+                    query_fields,
+                    request_id=request_id,
+                    search_filter=search_filter,
+                )
+            except IncompatibleFieldSelectionError as err:
+                if request_id is not None:
+                    raise
+                query_fields = self.fall_back_to_available_fields(query_fields, err)
+                continue
+            raw_records, request_id = response["Results"], response["RequestID"]
+            next_page = self.has_next_page(response, query_fields)
+
+            yield [self.transform_record(rec) for rec in raw_records]
+
+    def has_next_page(self, response, query_fields):
+        """Whether a Retrieve response is continued by another page, logs failed requests."""
+        if response["OverallStatus"] == "MoreDataAvailable":
+            return True
+        if "Error" in response["OverallStatus"]:
+            LOGGER.info(
+                "Req Failed: %s %s %s",
+                self.object_ref,
+                query_fields,
+                response["OverallStatus"],
+            )
+        return False
+
+    @property
+    def materialized_fields(self):
+        """Top level fields `transform_record` converts, `None` converts every field.
+
+        Mirrors `singer.Transformer`, which drops fields missing from the schema as well as
+        fields that are deselected or unsupported, so skipping them here does not change the
+        emitted records. `source_fields` are always kept for subclasses deriving values.
+        """
+        if self._materialized_fields is False:
+            fields = self.get_selected_fields(self.metadata, self.schema)
+            self._materialized_fields = None if fields is None else frozenset(fields)
+        return self._materialized_fields
+
+    def get_selected_fields(self, stream_metadata, schema):
+        """Top level fields kept by the emitted records, `None` if every field is kept.
+
+        Mirrors `singer.Transformer`, which drops fields missing from the schema as well as
+        fields that are deselected or unsupported. `source_fields` and the replication key
+        are always kept, the fields are ordered as `source_fields`, the replication key and
+        the schema properties.
+        """
+        properties = (schema or {}).get("properties")
+        if not properties or not stream_metadata:
+            return None
+        # a dict keeps the insertion order, skipping duplicates
+        fields = dict.fromkeys(self.source_fields)
+        if self.replication_key:
+            fields[self.replication_key] = None
+        for field in properties:
+            field_metadata = stream_metadata.get(("properties", field), {})
+            if field_metadata.get("inclusion") == "automatic" or (
+                field_metadata.get("selected") is not False
+                and field_metadata.get("inclusion") != "unsupported"
+            ):
+                fields[field] = None
+        return tuple(fields)
+
+    def transform_record(self, obj):
+        """Converts a zeep service object into a plain `dict`.
+
+        Zeep objects (e.g. `zeep.objects.SentEvent`) support key based access but are not
+        native dictionaries, and may hold nested zeep objects and `datetime` values that
+        `singer.Transformer` cannot handle. The object is walked once by `to_plain`, which
+        returns dicts and lists and converts every date / time value to its ISO 8601 string.
+        Only `materialized_fields` are converted, so unselected nested objects are skipped.
+        """
+        return serialize_record(obj, self.materialized_fields)
 
     @classmethod
     def get_metadata(cls, schema) -> Dict[str, str]:
@@ -195,11 +430,26 @@ class IncrementalStream(BaseStream):
     replication_method = "INCREMENTAL"
     forced_replication_method = "INCREMENTAL"
     parent_tap_stream_id = None
+    # whether date windows may be fetched on worker threads, see `iter_window_pages`
+    concurrent_windows = True
+    # whether date windows may be extracted by worker processes, which resolve the stream
+    # class from `STREAMS`, see `tap_exacttarget.extraction`
+    process_windows = True
 
     def __init__(self, metadata, schema, client):
         super().__init__(metadata, schema, client)
         self.replication_key = self.stream_metadata.get("replication-key") or self.replication_key
 
+    def transform_record(self, obj):
+        """Converts a zeep service object into a plain `dict`, keeping the replication key
+        as the native `datetime` of the object so `sync` compares it without parsing."""
+        record = super().transform_record(obj)
+        values = obj.__values__ if isinstance(obj, CompoundValue) else obj
+        replication_value = values.get(self.replication_key)
+        if isinstance(replication_value, datetime) and self.replication_key in record:
+            record[self.replication_key] = replication_value
+        return record
+
     def get_bookmark(self, state: dict, key: Any = None) -> int:
         """A wrapper for singer.get_bookmark."""
         return get_bookmark(
@@ -239,71 +489,236 @@ class IncrementalStream(BaseStream):
                 break
         return export_batches
 
+    def get_window_filter(self, client, start_dt, end_dt):
+        """Returns the search filter of the records within one date window."""
+        start_date = client.create_simple_filter(
+            self.replication_key, "greaterThanOrEqual", date_value=start_dt
+        )
+        end_date = client.create_simple_filter(
+            self.replication_key, "lessThanOrEqual", date_value=end_dt
+        )
+        return client.create_complex_filter(start_date, "AND", end_date)
+
+    def get_window_pages(self, client, query_fields, start_dt, end_dt):
+        """Yields the transformed records of every page within one date window."""
+        date_range = self.get_window_filter(client, start_dt, end_dt)
+        yield from self.paginate(query_fields, search_filter=date_range, client=client)
+
+    def get_date_windows(self, start_date, end_date=None, state=None):
+        """Splits the range from `start_date` up to `end_date` (now) into date windows.
+
+        With `target_window_pages` configured an `AdaptiveWindowPlanner` is returned instead
+        of a list, starting from the window size learned by a previous run if `state` has one.
+        """
+        end_date = end_date or now().astimezone(tz=fixed_cst)
+        if self.client.target_window_pages <= 0:
+            return self.create_date_windows(start_date, end_date, self.client.date_window)
+
+        window_days = get_bookmark(state or {}, self.tap_stream_id, WINDOW_SIZE_KEY)
+        if self.client.window_concurrency > 1:
+            LOGGER.info(
+                "Stream %s: adaptive date windows are fetched serially", self.tap_stream_id
+            )
+        return AdaptiveWindowPlanner(
+            self.tap_stream_id,
+            start_date,
+            end_date,
+            window_days or self.client.date_window,
+            self.client.target_window_pages,
+            self.client.get_batch_size(self.object_ref),
+            min_days=self.client.min_date_window,
+            max_days=self.client.max_date_window,
+        )
+
+    def iter_window_pages(self, windows, query_fields):
+        """Yields `(start_dt, end_dt, pages)` for every date window, in window order.
+
+        With an async engine, see `async_client.AsyncEngine`, the windows are fetched as
+        paging chains on its event loop. Otherwise with `window_concurrency` above 1 they are
+        fetched on a bounded thread pool, every worker thread using its own spawned client.
+        Pages are still handed out window by window, so callers observe the same order as a
+        serial run. Adaptive windows are planned from the pages of their predecessor, so they
+        are always fetched serially.
+        """
+        if isinstance(windows, AdaptiveWindowPlanner):
+            for start_dt, end_dt in windows:
+                pages = self.get_window_pages(self.client, query_fields, start_dt, end_dt)
+                yield start_dt, end_dt, windows.observe(start_dt, end_dt, pages)
+            return
+
+        async_engine = getattr(self.client, "async_engine", None)
+        if async_engine is not None and self.concurrent_windows and len(windows) > 1:
+            LOGGER.info(
+                "Stream %s: fetching %d date windows on the event loop",
+                self.tap_stream_id,
+                len(windows),
+            )
+            chains = [
+                partial(
+                    self.paginate_async,
+                    async_engine.client,
+                    query_fields,
+                    self.get_window_filter(self.client, start_dt, end_dt),
+                )
+                for start_dt, end_dt in windows
+            ]
+            for (start_dt, end_dt), pages in zip(
+                windows, async_engine.iter_ordered(chains, WINDOW_PAGE_BUFFER)
+            ):
+                yield start_dt, end_dt, pages
+            return
+
+        workers = min(self.client.window_concurrency, len(windows))
+        if not self.concurrent_windows:
+            workers = 1
+
+        if workers <= 1:
+            for start_dt, end_dt in windows:
+                yield start_dt, end_dt, self.get_window_pages(
+                    self.client, query_fields, start_dt, end_dt
+                )
+            return
+
+        LOGGER.info(
+            "Stream %s: fetching %d date windows with %d workers",
+            self.tap_stream_id,
+            len(windows),
+            workers,
+        )
+        thread_clients = threading.local()
+
+        def fetch_window(start_dt, end_dt):
+            if not hasattr(thread_clients, "client"):
+                thread_clients.client = self.client.spawn()
+            return self.get_window_pages(thread_clients.client, query_fields, start_dt, end_dt)
+
+        tasks = [partial(fetch_window, start_dt, end_dt) for start_dt, end_dt in windows]
+        for (start_dt, end_dt), pages in zip(
+            windows, run_ordered(tasks, workers, WINDOW_PAGE_BUFFER)
+        ):
+            yield start_dt, end_dt, pages
+
     def get_records(self, start_date, stream_metadata, schema):
         """Performs Pagination and query building."""
 
         query_fields = self.get_query_fields(stream_metadata, schema)
-        for start_dt, end_dt in self.create_date_windows(
-            start_date, now().astimezone(tz=fixed_cst), self.client.date_window
-        ):
-            start_date = self.client.create_simple_filter(
-                self.replication_key, "greaterThanOrEqual", date_value=start_dt
-            )
-            end_date = self.client.create_simple_filter(
-                self.replication_key, "lessThanOrEqual", date_value=end_dt
+        windows = self.get_date_windows(start_date)
+        for _, _, pages in self.iter_window_pages(windows, query_fields):
+            for page in pages:
+                yield from page
+
+    def write_window_size(self, state: dict, windows) -> Dict:
+        """Keeps the window size learned by an `AdaptiveWindowPlanner` for the next run."""
+        if isinstance(windows, AdaptiveWindowPlanner):
+            state = self.write_bookmark(state, key=WINDOW_SIZE_KEY, value=windows.window_days)
+        return state
+
+    def transform_page(self, page, schema, stream_metadata, transformer):
+        """Yields `(replication value, transformed record)` for every record of `page` having
+        a replication value, the value converted to (CST)."""
+        for record in page:
+            if record[self.replication_key]:
+                record_timestamp = to_cst(record[self.replication_key])
+                record[self.replication_key] = record_timestamp.isoformat()
+                yield record_timestamp, transformer.transform(record, schema, stream_metadata)
+
+    def complete_window(self, state: dict, windows, end_dt, end_date, current_max):
+        """Writes STATE once every record of the window ending at `end_dt` is written.
+
+        Returns the state and the bookmark value, moved to the window end unless the window
+        reaches `end_date` (now), where records may still be added.
+        """
+        state = self.write_window_size(state, windows)
+        state = self.write_batch_size(state)
+        if end_dt < end_date:
+            # every record up to the window end is written, the next run may start there
+            current_max = max(current_max, end_dt)
+            state = self.write_bookmark(
+                state, value=current_max.isoformat(timespec="microseconds")
             )
-            date_range = self.client.create_complex_filter(start_date, "AND", end_date)
+            write_state(state)
+        return state, current_max
 
-            next_page = True
-            request_id = None
-            while next_page:
+    def get_extraction_pool(self, windows):
+        """Returns the process pool to extract `windows` with, `None` to extract them in
+        this process.
 
-                response = self.client.retrieve_request(
-                    self.object_ref, query_fields, request_id=request_id, search_filter=date_range
-                )
-                raw_records = response["Results"]
-                request_id = response["RequestID"]
-
-                if response["OverallStatus"] != "MoreDataAvailable":
-                    if "Error" in response["OverallStatus"]:
-                        LOGGER.info(
-                            "Req Failed: %s %s %s",
-                            self.object_ref,
-                            query_fields,
-                            response["OverallStatus"],
-                        )
-                    next_page = False
-
-                for rec in raw_records:
-                    yield self.transform_record(rec)
+        Adaptive windows are planned from the pages of their predecessor, which does not fit
+        work units of whole windows extracted ahead of the writer.
+        """
+        extraction_pool = getattr(self.client, "extraction_pool", None)
+        if extraction_pool is None or not self.process_windows:
+            return None
+        if isinstance(windows, AdaptiveWindowPlanner):
+            LOGGER.info(
+                "Stream %s: adaptive windows are not supported by process_workers, "
+                "extracting in process",
+                self.tap_stream_id,
+            )
+            return None
+        LOGGER.info(
+            "Stream %s: extracting %d date windows with %d processes",
+            self.tap_stream_id,
+            len(windows),
+            extraction_pool.workers,
+        )
+        return extraction_pool
 
     def sync(
         self, state: Dict, schema: Dict, stream_metadata: Dict, transformer: Transformer
     ) -> Dict:
-        """Sync implementation for incremental streams."""
+        """Sync implementation for incremental streams.
+
+        `STATE` is written after every completed date window, the bookmark moving to the end
+        of that window. Records within a window come back unordered, so the bookmark cannot
+        advance mid-window: an interrupted run redoes the window it was in, and only that
+        window. With an extraction pool, see `get_extraction_pool`, windows are fetched and
+        transformed by worker processes and only their encoded records are written here.
+        """
 
         current_max_bookmark_date = bookmark_date_utc = strptime_to_cst(self.get_bookmark(state))
         records_processed = 0
 
-        for record in self.get_records(bookmark_date_utc, stream_metadata, schema):
-            record_timestamp = None
-
-            if isinstance(record[self.replication_key], datetime):
-                record_timestamp = record[self.replication_key].replace(tzinfo=fixed_cst)
-
-            if record[self.replication_key]:
-                record_timestamp = strptime_to_cst(record[self.replication_key])
-                record[self.replication_key] = record_timestamp.isoformat()
-                transformed_record = transformer.transform(record, schema, stream_metadata)
-                write_record(self.tap_stream_id, transformed_record)
-                records_processed += 1
-
-            if record_timestamp:
-                current_max_bookmark_date = max(current_max_bookmark_date, record_timestamp)
+        query_fields = self.get_query_fields(stream_metadata, schema)
+        end_date = now().astimezone(tz=fixed_cst)
+        windows = self.get_date_windows(bookmark_date_utc, end_date, state)
+
+        extraction_pool = self.get_extraction_pool(windows)
+        if extraction_pool is not None:
+            for _, end_dt, result in extraction_pool.extract_windows(
+                self, stream_metadata, schema, query_fields, windows
+            ):
+                lines, max_value, record_count = result
+                write_encoded(lines)
+                records_processed += record_count
+                if max_value is not None and max_value > current_max_bookmark_date:
+                    current_max_bookmark_date = max_value
+                state, current_max_bookmark_date = self.complete_window(
+                    state, windows, end_dt, end_date, current_max_bookmark_date
+                )
+        else:
+            for _, end_dt, pages in self.iter_window_pages(windows, query_fields):
+                for page in pages:
+                    for record_timestamp, transformed_record in self.transform_page(
+                        page, schema, stream_metadata, transformer
+                    ):
+                        write_record(self.tap_stream_id, transformed_record)
+                        records_processed += 1
+
+                        if record_timestamp > current_max_bookmark_date:
+                            current_max_bookmark_date = record_timestamp
+
+                state, current_max_bookmark_date = self.complete_window(
+                    state, windows, end_dt, end_date, current_max_bookmark_date
+                )
 
-        LOGGER.info("Stream %s sync complete: %d records processed", self.tap_stream_id, records_processed)
+        LOGGER.info(
+            "Stream %s sync complete: %d records processed", self.tap_stream_id, records_processed
+        )
 
-        state = self.write_bookmark(state, value=current_max_bookmark_date.isoformat(timespec='microseconds'))
+        state = self.write_bookmark(
+            state, value=current_max_bookmark_date.isoformat(timespec="microseconds")
+        )
         return state
 
 
@@ -320,26 +735,8 @@ class FullTableStream(BaseStream):
         """Performs Pagination and querybuilding."""
 
         query_fields = self.get_query_fields(stream_metadata, schema)
-        next_page, request_id = True, None
-
-        while next_page:
-            response = self.client.retrieve_request(
-                self.object_ref, query_fields, request_id=request_id
-            )
-            raw_records, request_id = response["Results"], response["RequestID"]
-
-            if response["OverallStatus"] != "MoreDataAvailable":
-                if "Error" in response["OverallStatus"]:
-                    LOGGER.info(
-                        "Req Failed: %s %s %s",
-                        self.object_ref,
-                        query_fields,
-                        response["OverallStatus"],
-                    )
-                next_page = False
-
-            for rec in raw_records:
-                yield self.transform_record(rec)
+        for page in self.paginate(query_fields):
+            yield from page
 
     def sync(
         self, state: Dict, schema: Dict, stream_metadata: Dict, transformer: Transformer
@@ -1,8 +1,9 @@
 from typing import Dict
 
-from singer import Transformer, get_logger, write_record
+from singer import Transformer, get_logger
 from singer.transform import SchemaMismatch
 from tap_exacttarget.client import Client
+from tap_exacttarget.sink import write_record
 from tap_exacttarget.streams.abstracts import FullTableStream
 
 LOGGER = get_logger()
@@ -1,6 +1,7 @@
 from typing import Dict
 
 from singer import get_logger
+from singer.metadata import to_list, to_map, write
 
 from tap_exacttarget.client import Client
 from tap_exacttarget.streams.abstracts import FullTableStream, IncrementalStream
@@ -9,6 +10,34 @@ LOGGER = get_logger()
 
 TRUTHY_VALUES = {1, "1", "y", "yes", "true"}
 FALSY_VALUES = {0, "0", "n", "no", "false"}
+BOOLEAN_VALUES = {**dict.fromkeys(FALSY_VALUES, False), **dict.fromkeys(TRUTHY_VALUES, True)}
+
+
+def to_boolean(value):
+    """Converts the string form of a boolean, other values are returned unchanged."""
+    if not isinstance(value, str):
+        return value
+    result = BOOLEAN_VALUES.get(value.lower())
+    if result is None:
+        LOGGER.warning("Could not infer boolean value from %s", value)
+    return result
+
+
+def compile_converters(schema):
+    """Returns the converter of every schema property whose values are not kept as strings.
+
+    Fields missing from the returned mapping, such as text and dates, are passed through.
+    """
+    converters = {}
+    for field, field_schema in ((schema or {}).get("properties") or {}).items():
+        field_type = (field_schema or {}).get("type") or []
+        if "integer" in field_type:
+            converters[field] = int
+        elif "number" in field_type:
+            converters[field] = float
+        elif "boolean" in field_type:
+            converters[field] = to_boolean
+    return converters
 
 
 class DataExtensionObjectBase:
@@ -19,6 +48,18 @@ class DataExtensionObjectBase:
     customer_key = None
     category_id = None
     object_ref = None
+    object_name = None
+    _converters = None
+    _converters_schema = None
+
+    @classmethod
+    def write_identifiers(cls, stream_metadata):
+        """Returns the stream metadata, with the DataExtension identifiers at the root."""
+        stream_metadata = to_map(stream_metadata)
+        stream_metadata = write(stream_metadata, (), "customer-key", cls.customer_key)
+        stream_metadata = write(stream_metadata, (), "object-name", cls.object_name)
+        stream_metadata = write(stream_metadata, (), "category-id", cls.category_id)
+        return to_list(stream_metadata)
 
     def get_query_fields(self, stream_metadata: Dict, schema: Dict):
         """Filter fields to query from metadata."""
@@ -38,30 +79,23 @@ class DataExtensionObjectBase:
         LOGGER.info("Objtype: %s fields: %s", self.object_ref, query_fields)
         return query_fields
 
-    def transform_record(self, obj: Dict):
-
-        obj_schema = self.schema["properties"]
-        properties = obj["Properties"]["Property"]
+    @property
+    def converters(self):
+        """Field name to converter table of the schema, compiled once per schema."""
+        if self._converters_schema is not self.schema:
+            self._converters = compile_converters(self.schema)
+            self._converters_schema = self.schema
+        return self._converters
 
-        to_return = {p["Name"]: (None if p["Value"] is None else p["Value"]) for p in properties}
-
-        for k, v in to_return.items():
-            field_schema = obj_schema.get(k)
-            if not field_schema:
-                continue
-
-            if "integer" in field_schema.get("type"):
-                to_return[k] = int(v)
-            elif "number" in field_schema.get("type"):
-                to_return[k] = float(v)
-
-            if "boolean" in field_schema.get("type") and isinstance(to_return[k], str):
-                val = str(v).lower()
-                if val in TRUTHY_VALUES | FALSY_VALUES:
-                    to_return[k] = val in TRUTHY_VALUES
-                else:
-                    LOGGER.warning("Could not infer boolean value from %s", to_return[k])
-                    to_return[k] = None
+    def transform_record(self, obj: Dict):
+        """Converts the properties of a DataExtension row in a single pass, `None` values are
+        kept as is."""
+        converters = self.converters
+        to_return = {}
+        for prop in obj["Properties"]["Property"]:
+            name, value = prop["Name"], prop["Value"]
+            convert = converters.get(name)
+            to_return[name] = value if convert is None or value is None else convert(value)
 
         to_return["CategoryID"] = self.category_id
         return to_return
@@ -70,6 +104,17 @@ class DataExtensionObjectBase:
 class DataExtensionObjectInc(DataExtensionObjectBase, IncrementalStream):
     """Encapsulates DataExtension Incremental."""
 
+    # stream classes are built at discovery time, worker processes cannot resolve them
+    process_windows = False
+
+    @classmethod
+    def get_metadata(cls, schema):
+        return cls.write_identifiers(super().get_metadata(schema))
+
 
 class DataExtensionObjectFt(DataExtensionObjectBase, FullTableStream):
     """Encapsulates DataExtension FullTable."""
+
+    @classmethod
+    def get_metadata(cls, schema):
+        return cls.write_identifiers(super().get_metadata(schema))
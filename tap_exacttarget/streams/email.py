@@ -15,6 +15,7 @@ class Email(IncrementalStream):
     key_properties = ["ID"]
     replication_key = "ModifiedDate"
     valid_replication_keys = ["ModifiedDate"]
+    source_fields = ("ContentAreas", "Email")
 
     def transform_record(self, obj: Dict):
         obj = super().transform_record(obj)
@@ -12,6 +12,7 @@ class ListSend(FullTableStream):
     tap_stream_id = "list_send"
     object_ref = "ListSend"
     key_properties = ["SendID", "ListID"]
+    source_fields = ("List",)
 
     def transform_record(self, obj: Dict):
         obj = super().transform_record(obj)
@@ -1,16 +1,55 @@
-from typing import Dict
+import threading
+from collections import OrderedDict
 from itertools import islice
+from typing import Dict
 
-from singer import get_logger
-from singer.utils import now
+from singer import Transformer, get_logger
 
 from tap_exacttarget.client import Client
+from tap_exacttarget.concurrency import BoundedPool
 from tap_exacttarget.streams.abstracts import IncrementalStream
 
 from .subscriber import Subscribers
 
 LOGGER = get_logger()
 
+SUBSCRIBER_BATCH_SIZE = 100
+# SubscriberKeys remembered for deduplication, the oldest ones are forgotten beyond this
+MAX_SEEN_SUBSCRIBER_KEYS = 1000000
+
+
+class SubscriberKeyBatcher:
+    """Forwards SubscriberKeys not seen before to `flush_batch` in batches of `batch_size`.
+
+    Seen keys are kept in insertion order and only the latest `max_seen` are remembered, so
+    memory stays bounded; a key forgotten that way is fetched again at worst.
+    """
+
+    def __init__(self, flush_batch, batch_size=SUBSCRIBER_BATCH_SIZE,
+                 max_seen=MAX_SEEN_SUBSCRIBER_KEYS):
+        self.flush_batch = flush_batch
+        self.batch_size = batch_size
+        self.max_seen = max_seen
+        self.seen = OrderedDict()
+        self.pending = []
+
+    def add(self, key):
+        """Queues `key` unless it was seen before, flushing once a batch is full."""
+        if key in self.seen:
+            return
+        self.seen[key] = None
+        if len(self.seen) > self.max_seen:
+            self.seen.popitem(last=False)
+        self.pending.append(key)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Forwards the queued keys, if any."""
+        if self.pending:
+            batch, self.pending = self.pending, []
+            self.flush_batch(batch)
+
 
 class ListSubscribers(IncrementalStream):
     """Class for List Subscribers stream."""
@@ -25,17 +64,45 @@ class ListSubscribers(IncrementalStream):
     valid_replication_keys = ["ModifiedDate"]
     sync_subscribers = False
     subscribers_obj: Subscribers = None
+    list_id_filter = None
+    subscriber_batcher: SubscriberKeyBatcher = None
+    subscriber_pool: BoundedPool = None
+    thread_clients = None
+    # subscriber profiles are written while a window is read, so windows stay on the main thread
+    concurrent_windows = False
+    # worker processes rebuild the stream without `subscribers_obj`, profiles would be lost
+    process_windows = False
 
     def fetch_subscribers_batch(self, subs_ids):
         """Creates Batch of 100 to fetch subscriber profile."""
         subs_ids = iter(subs_ids)
         while True:
-            chunk = list(islice(subs_ids, 100))
+            chunk = list(islice(subs_ids, SUBSCRIBER_BATCH_SIZE))
             if not chunk:
                 break
             if self.subscribers_obj:
                 LOGGER.info("fetching batch with %s rec", len(chunk))
-                self.subscribers_obj.sync_ids(chunk)
+                if self.subscriber_pool:
+                    self.subscriber_pool.submit(self.fetch_subscribers, chunk)
+                else:
+                    self.subscribers_obj.sync_ids(chunk)
+
+    def fetch_subscribers(self, subs_ids):
+        """Fetches one batch of subscriber profiles on a pool thread, with its own client."""
+        if not hasattr(self.thread_clients, "client"):
+            self.thread_clients.client = self.client.spawn()
+        return self.subscribers_obj.fetch_ids(subs_ids, self.thread_clients.client)
+
+    def start_subscriber_pool(self):
+        """Starts the pool fetching subscriber batches when `subscriber_concurrency` > 1."""
+        workers = self.client.subscriber_concurrency
+        if workers <= 1 or not self.subscribers_obj:
+            return
+        LOGGER.info("Fetching subscriber profiles with %d workers", workers)
+        # described once here, pool threads must not share the main client
+        self.subscribers_obj.get_subscriber_fields()
+        self.thread_clients = threading.local()
+        self.subscriber_pool = BoundedPool(workers, self.subscribers_obj.write_records)
 
     def get_list_id(self):
         """Returns the ID of the "All Subscribers" List."""
@@ -47,50 +114,46 @@ class ListSubscribers(IncrementalStream):
             raise RuntimeError("Unexpected Number of All Subscribers list ")
         return response["Results"][0]["ID"]
 
-    def get_records(self, start_date, stream_metadata: Dict, schema: Dict):
-        """Performs get / retrieve for ListSubscribers."""
-
-        query_fields = self.get_query_fields(stream_metadata, schema)
-        list_id = self.get_list_id()
-        sub_id_filter = self.client.create_simple_filter("ListID", "equals", list_id)
-        subscriber_keys = []
+    def get_window_pages(self, client, query_fields, start_dt, end_dt):
+        """Yields the ListSubscriber pages of a window, fetching the profiles of new subscribers.
 
-        for start_dt, end_dt in self.create_date_windows(
-            start_date, now(), self.client.date_window
-        ):
-            subscriber_keys = []
-            s_filter = self.client.create_simple_filter(
-                self.replication_key, "greaterThanOrEqual", date_value=start_dt
+        SubscriberKeys are fetched in batches as they fill up. Subscribers still queued at the
+        end of the window are fetched before the window is complete, so a window checkpoint
+        never skips their profiles.
+        """
+        if self.list_id_filter is None:
+            self.list_id_filter = self.client.create_simple_filter(
+                "ListID", "equals", self.get_list_id()
             )
-            t_filter = self.client.create_simple_filter(
-                self.replication_key, "lessThanOrEqual", date_value=end_dt
-            )
-            c_filter = self.client.create_complex_filter(s_filter, "AND", t_filter)
-            final_filter = self.client.create_complex_filter(c_filter, "AND", sub_id_filter)
-
-            next_page = True
-            request_id = None
-            while next_page:
-
-                response = self.client.retrieve_request(
-                    self.object_ref, query_fields, request_id=request_id, search_filter=final_filter
-                )
-                raw_records = response["Results"]
-                request_id = response["RequestID"]
-
-                if response["OverallStatus"] != "MoreDataAvailable":
-                    if "Error" in response["OverallStatus"]:
-                        LOGGER.info(
-                            "Req Failed: %s %s %s",
-                            self.object_ref,
-                            query_fields,
-                            response["OverallStatus"],
-                        )
-                    next_page = False
-
-                for rec in raw_records:
-                    trx_rec = self.transform_record(rec)
-                    subscriber_keys.append(trx_rec["SubscriberKey"])
-                    yield trx_rec
-                if subscriber_keys:
-                    self.fetch_subscribers_batch(subscriber_keys)
+        if self.subscriber_batcher is None:
+            self.subscriber_batcher = SubscriberKeyBatcher(self.fetch_subscribers_batch)
+            self.start_subscriber_pool()
+
+        s_filter = client.create_simple_filter(
+            self.replication_key, "greaterThanOrEqual", date_value=start_dt
+        )
+        t_filter = client.create_simple_filter(
+            self.replication_key, "lessThanOrEqual", date_value=end_dt
+        )
+        c_filter = client.create_complex_filter(s_filter, "AND", t_filter)
+        final_filter = client.create_complex_filter(c_filter, "AND", self.list_id_filter)
+
+        for page in self.paginate(query_fields, search_filter=final_filter, client=client):
+            yield page
+            if self.subscribers_obj:
+                for trx_rec in page:
+                    self.subscriber_batcher.add(trx_rec["SubscriberKey"])
+        self.subscriber_batcher.flush()
+        if self.subscriber_pool:
+            self.subscriber_pool.drain()
+
+    def sync(
+        self, state: Dict, schema: Dict, stream_metadata: Dict, transformer: Transformer
+    ) -> Dict:
+        """Sync implementation for list subscribers, stops the subscriber pool once done."""
+        try:
+            return super().sync(state, schema, stream_metadata, transformer)
+        finally:
+            if self.subscriber_pool:
+                self.subscriber_pool.shutdown()
+                self.subscriber_pool = None
@@ -1,8 +1,9 @@
 from typing import Dict
 
-from singer import Transformer, get_logger, write_record
+from singer import Transformer, get_logger
 
 from tap_exacttarget.client import Client
+from tap_exacttarget.sink import write_record
 from tap_exacttarget.streams.abstracts import FullTableStream
 
 LOGGER = get_logger()
@@ -18,6 +19,8 @@ class Subscribers(FullTableStream):
     object_ref = "Subscriber"
     parent_tap_stream_id = "list_subscribers"
     key_properties = ["ID"]
+    source_fields = ("Lists",)
+    query_fields = None
 
     def transform_record(self, obj: Dict):
         obj = super().transform_record(obj)
@@ -26,48 +29,49 @@ class Subscribers(FullTableStream):
             obj["ListIDs"] = [_list.get("ObjectID") for _list in obj.get("Lists", [])]
         return obj
 
-    def filter_records(self, parent_id_list):
+    def get_subscriber_fields(self):
+        """Returns the retrievable Subscriber fields, described on first use only."""
+        if self.query_fields is None:
+            self.query_fields = self.get_query_fields(self.metadata, self.schema)
+        return self.query_fields
+
+    def filter_records(self, parent_id_list, client=None):
         """Queries for records."""
-        query_fields = self.get_query_fields(self.metadata, self.schema)
+        client = client or self.client
+        query_fields = self.get_subscriber_fields()
 
         if len(parent_id_list) == 1:
-            search_filter = self.client.create_simple_filter(
+            search_filter = client.create_simple_filter(
                 "SubscriberKey", "equals", parent_id_list[0]
             )
         else:
-            search_filter = self.client.create_simple_filter("SubscriberKey", "IN", parent_id_list)
+            search_filter = client.create_simple_filter("SubscriberKey", "IN", parent_id_list)
 
-        next_page = True
-        request_id = None
+        for page in self.paginate(query_fields, search_filter=search_filter, client=client):
+            yield from page
 
-        while next_page:
+    def fetch_ids(self, subs_key_list: list, client=None) -> list:
+        """Returns the transformed records of the given subscribers.
 
-            response = self.client.retrieve_request(
-                self.object_ref, query_fields, request_id=request_id, search_filter=search_filter
-            )
-            raw_records = response["Results"]
-            request_id = response["RequestID"]
-
-            if response["OverallStatus"] != "MoreDataAvailable":
-                if "Error" in response["OverallStatus"]:
-                    LOGGER.info(
-                        "Req Failed: %s %s %s",
-                        self.object_ref,
-                        query_fields,
-                        response["OverallStatus"],
-                    )
-                next_page = False
-
-            for rec in raw_records:
-                yield self.transform_record(rec)
+        Nothing is written, so this may run on a worker thread using its own `client`.
+        """
+        client = client or self.client
+        transformer = Transformer()
+        client.log_search_filter = False
+        try:
+            return [
+                transformer.transform(record, self.schema, self.metadata)
+                for record in self.filter_records(subs_key_list, client)
+            ]
+        finally:
+            client.log_search_filter = True
+
+    def write_records(self, records: list):
+        for record in records:
+            write_record(self.tap_stream_id, record)
 
     def sync_ids(self, subs_key_list: list):
-        transformer = Transformer()
-        self.client.log_search_filter = False
-        for record in self.filter_records(subs_key_list):
-            transformed_record = transformer.transform(record, self.schema, self.metadata)
-            write_record(self.tap_stream_id, transformed_record)
-        self.client.log_search_filter = True
+        self.write_records(self.fetch_ids(subs_key_list))
 
     def sync(self, state, schema, stream_metadata, transformer):
         return state
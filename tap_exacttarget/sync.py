@@ -1,37 +1,57 @@
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from typing import Dict
 
 import singer
 
-from tap_exacttarget.discover_dataextensionobj import discover_dao_streams
+from tap_exacttarget import sink
+from tap_exacttarget.client import get_config_value
+from tap_exacttarget.discover_dataextensionobj import load_dao_streams
 from tap_exacttarget.exceptions import (
     IncompatibleFieldSelectionError,
     MarketingCloudSoapApiException,
 )
+from tap_exacttarget.extraction import ExtractionPool
 from tap_exacttarget.streams import STREAMS
 
 LOGGER = singer.get_logger()
 
 
 def sync(client, catalog: singer.Catalog, state: Dict):
-    """Performs sync for selected streams."""
-    doa_streams = discover_dao_streams(client=client)
-    STREAMS.update(doa_streams)
+    """Performs sync for selected streams, writing messages through a buffered sink."""
+    sink.set_sink(
+        sink.OutputSink(
+            flush_bytes=get_config_value(
+                client.config, "output_buffer_size", int, sink.DEFAULT_OUTPUT_BUFFER_SIZE
+            ),
+            flush_interval=get_config_value(
+                client.config, "output_flush_interval", float, sink.DEFAULT_OUTPUT_FLUSH_INTERVAL
+            ),
+        )
+    )
+    try:
+        sync_streams(client, catalog, state)
+    finally:
+        sink.flush()
+
+
+def sync_streams(client, catalog: singer.Catalog, state: Dict):
+    """Syncs every selected stream."""
     failed_streams = []
     selected_streams = list(catalog.get_selected_streams(state))
+    STREAMS.update(load_dao_streams(client, selected_streams))
 
     selected_ids = [_s.tap_stream_id for _s in selected_streams]
-    sync_subscribers = False
     subscribers_obj = None
 
     if "subscribers" in selected_ids and "list_subscribers" in selected_ids:
-        sync_subscribers = True
         for item in selected_streams:
             if item.tap_stream_id == "subscribers":
                 tap_stream_id = item.tap_stream_id
                 stream_schema = item.schema.to_dict()
                 stream_metadata = singer.metadata.to_map(item.metadata)
                 subscribers_obj = STREAMS[tap_stream_id](stream_metadata, stream_schema, client)
-                singer.write_schema(
+                subscribers_obj.configure_batch_size(state)
+                sink.write_schema(
                     subscribers_obj.tap_stream_id,
                     stream_schema,
                     subscribers_obj.key_properties,
@@ -47,45 +67,119 @@ def sync(client, catalog: singer.Catalog, state: Dict):
                 "Stream Failed to sync subscribers, error: Select list_subscribers stream to enable sync for subscribers",
             )
         )
-    for stream in selected_streams:
-        tap_stream_id = stream.tap_stream_id
-        stream_schema = stream.schema.to_dict()
-
-        stream_metadata = singer.metadata.to_map(stream.metadata)
-
-        if tap_stream_id == "subscribers":
-            continue
-        stream_obj = STREAMS[tap_stream_id](stream_metadata, stream_schema, client)
-
-        if tap_stream_id == "list_subscribers":
-            stream_obj.sync_subscribers = sync_subscribers
-            stream_obj.subscribers_obj = subscribers_obj
-
-        LOGGER.info("Starting sync for stream: %s", tap_stream_id)
-        state = singer.set_currently_syncing(state, tap_stream_id)
-        singer.write_state(state)
-        singer.write_schema(
-            tap_stream_id, stream_schema, stream_obj.key_properties, stream.replication_key
-        )
-        try:
-            with singer.Transformer() as transformer:
-                state = stream_obj.sync(
-                    state=state,
-                    schema=stream_schema,
-                    stream_metadata=stream_metadata,
-                    transformer=transformer,
-                )
-
-        except (IncompatibleFieldSelectionError, MarketingCloudSoapApiException) as err:
-            LOGGER.info("Stream Failed to sync %s", tap_stream_id)
-            failed_streams.append((tap_stream_id, err))
+    streams = [stream for stream in selected_streams if stream.tap_stream_id != "subscribers"]
+    try:
+        if client.process_workers > 1:
+            LOGGER.info("Extracting date windows with %d processes", client.process_workers)
+            client.extraction_pool = ExtractionPool(
+                client.worker_factory(), client.process_workers
+            )
+        if client.async_concurrency > 0:
+            LOGGER.info("Sending up to %d async requests at once", client.async_concurrency)
+            client.async_engine = create_async_engine(client)
 
-        singer.write_state(state)
+        if client.max_parallel_streams > 1 and len(streams) > 1:
+            state = sync_parallel(client, streams, state, subscribers_obj, failed_streams)
+        else:
+            for stream in streams:
+                LOGGER.info("Starting sync for stream: %s", stream.tap_stream_id)
+                state = singer.set_currently_syncing(state, stream.tap_stream_id)
+                sink.write_state(state)
+                state = sync_stream(client, stream, state, subscribers_obj, failed_streams)
+                sink.write_state(state)
+    finally:
+        if client.extraction_pool is not None:
+            client.extraction_pool.shutdown()
+            client.extraction_pool = None
+        if client.async_engine is not None:
+            client.async_engine.close()
+            client.async_engine = None
 
     LOGGER.info("Sync Completed, stream(s) failed: %s", len(failed_streams))
+    client.log_describe_stats()
     if failed_streams:
         for stream, err_cause in failed_streams:
             LOGGER.fatal("Stream Failed %s, Reason: %s", stream, err_cause)
 
     state = singer.set_currently_syncing(state, None)
-    singer.write_state(state)
+    sink.write_state(state)
+
+
+def create_async_engine(client):
+    """Starts the event loop running the async requests of every stream, with a client of
+    its own. Requires the `async` extra, which is only imported here."""
+    try:
+        # pylint: disable=import-outside-toplevel
+        from tap_exacttarget.async_client import AsyncEngine
+    except ImportError as err:
+        raise ImportError(
+            "async_concurrency requires the async extra: pip install tap-exacttarget[async]"
+        ) from err
+    return AsyncEngine(client.spawn(), client.async_concurrency)
+
+
+def sync_stream(client, stream, state: Dict, subscribers_obj, failed_streams) -> Dict:
+    """Syncs one selected stream, the child `subscribers` stream along with `list_subscribers`."""
+    tap_stream_id = stream.tap_stream_id
+    stream_schema = stream.schema.to_dict()
+    stream_metadata = singer.metadata.to_map(stream.metadata)
+    stream_obj = STREAMS[tap_stream_id](stream_metadata, stream_schema, client)
+
+    if tap_stream_id == "list_subscribers":
+        stream_obj.sync_subscribers = subscribers_obj is not None
+        stream_obj.subscribers_obj = subscribers_obj
+        if subscribers_obj is not None:
+            subscribers_obj.client = client
+
+    sink.write_schema(
+        tap_stream_id, stream_schema, stream_obj.key_properties, stream.replication_key
+    )
+    stream_obj.configure_batch_size(state)
+    try:
+        with singer.Transformer() as transformer:
+            state = stream_obj.sync(
+                state=state,
+                schema=stream_schema,
+                stream_metadata=stream_metadata,
+                transformer=transformer,
+            )
+
+    except (IncompatibleFieldSelectionError, MarketingCloudSoapApiException) as err:
+        LOGGER.info("Stream Failed to sync %s", tap_stream_id)
+        failed_streams.append((tap_stream_id, err))
+    return stream_obj.write_batch_size(state)
+
+
+def sync_parallel(client, streams, state: Dict, subscribers_obj, failed_streams) -> Dict:
+    """Syncs up to `max_parallel_streams` streams at once, each with a spawned client.
+
+    Streams are independent of each other once `subscribers` is synced as the child of
+    `list_subscribers`. Every message is written through one `StateMergingSink`, so records
+    are emitted by a single writer and every STATE message holds the bookmarks of all streams.
+    `currently_syncing` is not set, as several streams are syncing at the same time.
+    """
+    workers = min(client.max_parallel_streams, len(streams))
+    LOGGER.info("Syncing %d streams with %d workers", len(streams), workers)
+    output = sink.get_sink()
+    merging_sink = sink.StateMergingSink(output, singer.set_currently_syncing(state, None))
+
+    def run(stream):
+        LOGGER.info("Starting sync for stream: %s", stream.tap_stream_id)
+        merging_sink.bind_stream(stream.tap_stream_id)
+        stream_state = sync_stream(
+            client.spawn(), stream, merging_sink.snapshot(), subscribers_obj, failed_streams
+        )
+        sink.write_state(stream_state)
+
+    sink.set_sink(merging_sink)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stream") as executor:
+            futures = [executor.submit(run, stream) for stream in streams]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                if future.exception() is not None:
+                    executor.shutdown(cancel_futures=True)
+                    raise future.exception()
+    finally:
+        sink.set_sink(output)
+    return merging_sink.state
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from singer import get_logger
+
+LOGGER = get_logger()
+
+DEFAULT_MIN_DATE_WINDOW = 1 / 24
+DEFAULT_MAX_DATE_WINDOW = 365
+# bounds of the factor a window may be resized by after a single observation
+MAX_SHRINK_FACTOR = 0.25
+MAX_GROW_FACTOR = 2.0
+
+
+class AdaptiveWindowPlanner:
+    """Plans the date windows of an incremental stream one at a time.
+
+    Every window is sized from the load of the previous one, the number of full Retrieve
+    pages of `page_size` records it returned: windows heavier than `target_pages` shrink in
+    proportion, empty windows and windows of at most half of `target_pages` grow, always
+    within `[min_days, max_days]`. Windows are produced lazily, so the pages of a window have
+    to be passed through `observe` and exhausted before the next window is requested.
+    """
+
+    def __init__(self, stream_id, start_date, end_date, window_days, target_pages, page_size,
+                 min_days=DEFAULT_MIN_DATE_WINDOW, max_days=DEFAULT_MAX_DATE_WINDOW):
+        self.stream_id = stream_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.target_pages = target_pages
+        self.page_size = page_size
+        self.min_days = min_days
+        self.max_days = max(min_days, max_days)
+        self.window_days = self.clamp(window_days)
+
+    def clamp(self, window_days):
+        return min(self.max_days, max(self.min_days, window_days))
+
+    def __iter__(self):
+        if self.start_date >= self.end_date:
+            yield self.end_date, self.start_date
+            return
+
+        current_start = self.start_date
+        while current_start < self.end_date:
+            current_end = min(current_start + timedelta(days=self.window_days), self.end_date)
+            yield current_start, current_end
+            current_start = current_end
+
+    def next_window_days(self, pages):
+        """Returns the size of the window following one that took `pages` pages."""
+        if pages == 0:
+            factor = MAX_GROW_FACTOR
+        elif pages > self.target_pages:
+            factor = max(MAX_SHRINK_FACTOR, self.target_pages / pages)
+        elif pages * 2 <= self.target_pages:
+            factor = min(MAX_GROW_FACTOR, self.target_pages / pages)
+        else:
+            factor = 1
+        return self.clamp(self.window_days * factor)
+
+    def resize(self, start_dt, end_dt, pages):
+        """Updates the window size from the load of the window `start_dt - end_dt`."""
+        if end_dt >= self.end_date and end_dt - start_dt < timedelta(days=self.window_days):
+            # the last window is cut short and says little about the volume of the stream
+            window_days = self.window_days
+        else:
+            window_days = self.next_window_days(pages)
+        if window_days < self.window_days:
+            decision = "shrinking"
+        elif window_days > self.window_days:
+            decision = "growing"
+        else:
+            decision = "keeping"
+        LOGGER.info(
+            "Stream %s: window %s - %s took %.1f pages (target %d), "
+            "%s date window %.4f -> %.4f days",
+            self.stream_id,
+            start_dt,
+            end_dt,
+            pages,
+            self.target_pages,
+            decision,
+            self.window_days,
+            window_days,
+        )
+        self.window_days = window_days
+
+    def observe(self, start_dt, end_dt, pages):
+        """Passes the `pages` of a window through, resizing the next window once exhausted."""
+        records = 0
+        for page in pages:
+            records += len(page)
+            yield page
+        self.resize(start_dt, end_dt, records / self.page_size)
@@ -0,0 +1,82 @@
+"""Date window paging benchmark: serial, `window_concurrency` threads and the async engine.
+
+A SentEvent range split into `--windows` date windows, each paged through `--pages`
+ContinueRequest calls, is fetched from a local stub SOAP server adding `--latency` seconds to
+every call. Threads and the async engine both keep `--concurrency` requests in flight.
+
+    python -m tests.benchmarks.bench_async_retrieve [--windows 24] [--pages 4]
+        [--latency 0.2] [--concurrency 8]
+"""
+
+import argparse
+import math
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from tap_exacttarget.auth import Token
+from tap_exacttarget.client import Client
+from tap_exacttarget.streams.abstracts import fixed_cst
+from tap_exacttarget.streams.event_sent import SentEvent
+from tap_exacttarget.sync import create_async_engine
+from tests.unittests.soap_fixtures import RetrieveRoute, sent_event_rows
+from tests.unittests.stub_server import StubServer
+from tests.unittests.test_async_client import PROPERTIES, make_client
+
+PAGE_SIZE = 50
+START = datetime(2024, 1, 1, 8, tzinfo=fixed_cst)
+
+
+def fetch(client, windows):
+    stream = SentEvent({}, {}, client)
+    start = time.perf_counter()
+    records = sum(
+        len(page)
+        for _, _, pages in stream.iter_window_pages(windows, PROPERTIES)
+        for page in pages
+    )
+    return records, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--windows", type=int, default=24)
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    # one row per minute, windows of an hour holding `pages` pages each
+    rows = sent_event_rows(args.windows * 60, start=START.replace(tzinfo=None))
+    page_size = -(-60 // args.pages)
+    route = RetrieveRoute("SentEvent", rows, page_size, delay=args.latency)
+    windows = [
+        (START + timedelta(hours=idx), START + timedelta(hours=idx, minutes=59, seconds=59))
+        for idx in range(args.windows)
+    ]
+
+    with StubServer() as server, patch.object(Client, "access_token", "bench-token"):
+        server.routes[("POST", "/Service.asmx")] = route
+        client = make_client(server.url, batch_size=str(page_size))
+        client.token_manager.current = Token("bench-token", math.inf, math.inf)
+        print(f"{args.windows} windows x {args.pages} pages, {args.latency}s per call")
+
+        records, elapsed = fetch(client, windows)
+        print(f"{'serial':<10} {records:8,d} records {elapsed:8.2f}s")
+
+        client.window_concurrency = args.concurrency
+        records, elapsed = fetch(client, windows)
+        print(f"{'threads':<10} {records:8,d} records {elapsed:8.2f}s")
+
+        client.window_concurrency = 1
+        client.async_concurrency = args.concurrency
+        client.async_engine = create_async_engine(client)
+        try:
+            records, elapsed = fetch(client, windows)
+        finally:
+            client.async_engine.close()
+        print(f"{'async':<10} {records:8,d} records {elapsed:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
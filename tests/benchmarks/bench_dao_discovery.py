@@ -0,0 +1,94 @@
+"""DataExtension discovery benchmark: account wide, serial and concurrent, vs scoped to the
+selected CustomerKeys.
+
+Runs against a synthetic in-memory account (10k DataExtensions with 50 fields each by
+default) served in pages of 2500 rows like the SOAP API. `--latency` adds a sleep to every
+Retrieve call to approximate the round trip of a real tenant.
+
+    python -m tests.benchmarks.bench_dao_discovery [--extensions 10000] [--fields 50]
+        [--selected 2] [--latency 0.0]
+"""
+
+import argparse
+import time
+
+from tap_exacttarget.discover_dataextensionobj import discover_dao_definitions
+from tests.unittests.stub_client import StubClient
+
+FIELD_TYPES = ("Text", "Number", "Date", "Decimal", "Boolean", "EmailAddress")
+
+
+class LatencyClient(StubClient):
+    """Stub account adding a fixed delay to every Retrieve call."""
+
+    def __init__(self, records, latency, **kwargs):
+        super().__init__(records, **kwargs)
+        self.latency = latency
+        self.rows = 0
+
+    def retrieve_request(self, object_type, properties, request_id=None, search_filter=None):
+        if self.latency:
+            time.sleep(self.latency)
+        response = super().retrieve_request(object_type, properties, request_id, search_filter)
+        self.rows += len(response["Results"])
+        return response
+
+
+def make_account(extensions, fields):
+    account = {"DataExtension": [], "DataExtensionField": []}
+    for idx in range(extensions):
+        customer_key = f"de-{idx:05d}"
+        account["DataExtension"].append(
+            {"CustomerKey": customer_key, "Name": f"Table {idx}", "CategoryID": idx % 50}
+        )
+        for field_idx in range(fields):
+            account["DataExtensionField"].append(
+                {
+                    "Name": "ModifiedDate" if field_idx == 0 else f"Column{field_idx}",
+                    "IsRequired": False,
+                    "IsPrimaryKey": field_idx == 1,
+                    "FieldType": FIELD_TYPES[field_idx % len(FIELD_TYPES)],
+                    "DataExtension": {"CustomerKey": customer_key},
+                }
+            )
+    return account
+
+
+def run(account, latency, customer_keys=None, concurrent=False):
+    client = LatencyClient(account, latency, page_size=2500)
+    start = time.perf_counter()
+    definitions = discover_dao_definitions(client, customer_keys, concurrent)
+    elapsed = time.perf_counter() - start
+    return len(definitions), len(client.retrieve_calls), client.rows, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--extensions", type=int, default=10000)
+    parser.add_argument("--fields", type=int, default=50)
+    parser.add_argument("--selected", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    account = make_account(args.extensions, args.fields)
+    step = max(args.extensions // max(args.selected, 1), 1)
+    selected = [de["CustomerKey"] for de in account["DataExtension"][::step][: args.selected]]
+
+    print(
+        f"{args.extensions:,} DataExtensions, "
+        f"{len(account['DataExtensionField']):,} fields, {len(selected)} selected"
+    )
+    for name, customer_keys, concurrent in (
+        ("account wide", None, False),
+        ("concurrent", None, True),
+        ("scoped", selected, False),
+    ):
+        streams, calls, rows, elapsed = run(account, args.latency, customer_keys, concurrent)
+        print(
+            f"{name:14s} {streams:8,d} streams {calls:6,d} calls {rows:10,d} rows "
+            f"{elapsed:8.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
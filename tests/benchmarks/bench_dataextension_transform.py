@@ -0,0 +1,102 @@
+"""Rows/sec of `DataExtensionObjectBase.transform_record` on a wide DataExtension.
+
+Compares the previous per row schema inspection with the compiled converter table, on rows
+of 200 columns mixing text, integer, decimal, boolean and date fields.
+
+    python -m tests.benchmarks.bench_dataextension_transform [--rows 100000] [--columns 200]
+"""
+
+import argparse
+
+from tap_exacttarget.streams.dataextensionobjects import (
+    FALSY_VALUES,
+    TRUTHY_VALUES,
+    DataExtensionObjectBase,
+)
+from tests.benchmarks.helpers import timed
+
+COLUMN_TYPES = (
+    ("Text", ["null", "string"], "some text"),
+    ("Number", ["null", "integer"], "12345"),
+    ("Decimal", ["null", "number"], "49.95"),
+    ("Boolean", ["null", "boolean"], "True"),
+    ("Date", ["null", "string"], "1/1/2024 8:00:00 AM"),
+)
+
+
+def legacy_transform(stream, obj):
+    obj_schema = stream.schema["properties"]
+    properties = obj["Properties"]["Property"]
+
+    to_return = {p["Name"]: (None if p["Value"] is None else p["Value"]) for p in properties}
+
+    for k, v in to_return.items():
+        field_schema = obj_schema.get(k)
+        if not field_schema:
+            continue
+
+        if "integer" in field_schema.get("type"):
+            to_return[k] = int(v)
+        elif "number" in field_schema.get("type"):
+            to_return[k] = float(v)
+
+        if "boolean" in field_schema.get("type") and isinstance(to_return[k], str):
+            val = str(v).lower()
+            if val in TRUTHY_VALUES | FALSY_VALUES:
+                to_return[k] = val in TRUTHY_VALUES
+            else:
+                to_return[k] = None
+
+    to_return["CategoryID"] = stream.category_id
+    return to_return
+
+
+def make_stream(columns):
+    stream = DataExtensionObjectBase()
+    stream.category_id = 1
+    stream.schema = {
+        "properties": {
+            f"{name}{idx}": {"type": field_type}
+            for idx in range(columns)
+            for name, field_type, _ in [COLUMN_TYPES[idx % len(COLUMN_TYPES)]]
+        }
+    }
+    row = {
+        "Properties": {
+            "Property": [
+                {"Name": f"{name}{idx}", "Value": value}
+                for idx in range(columns)
+                for name, _, value in [COLUMN_TYPES[idx % len(COLUMN_TYPES)]]
+            ]
+        }
+    }
+    return stream, row
+
+
+def legacy(stream, rows):
+    for row in rows:
+        legacy_transform(stream, row)
+
+
+def compiled(stream, rows):
+    for row in rows:
+        stream.transform_record(row)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--columns", type=int, default=200)
+    args = parser.parse_args()
+
+    stream, row = make_stream(args.columns)
+    rows = [row] * args.rows
+    assert legacy_transform(stream, row) == stream.transform_record(row)
+
+    for name, func in (("schema lookups", legacy), ("converter table", compiled)):
+        elapsed = timed(func, stream, rows, repeat=3)
+        print(f"{name:<20} {args.rows / elapsed:>12,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
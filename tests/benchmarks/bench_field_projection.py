@@ -0,0 +1,124 @@
+"""Payload bytes and parse time of a Send Retrieve page, every retrievable field vs the
+fields `get_query_fields` projects for a typical catalog selection.
+
+The page is a SOAP envelope built from the WSDL fixture holding only the requested
+properties, like the API returns, and is parsed by zeep then `transform_record`.
+
+    python -m tests.benchmarks.bench_field_projection [--rows 2500]
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+
+from lxml import etree
+
+from tap_exacttarget.streams.send import Sends
+from tests.benchmarks.helpers import timed
+from tests.unittests.soap_fixtures import (
+    fixture_soap_client,
+    parse_retrieve_response,
+    retrieve_response_envelope,
+)
+from tests.unittests.stub_client import StubClient
+from tests.unittests.test_field_projection import select_fields
+
+SCHEMA_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "tap_exacttarget", "schemas", "send.json"
+)
+SELECTED = {"ID", "EmailName", "Subject", "SendDate", "Status", "NumberSent", "UniqueOpens"}
+START = datetime(2024, 1, 1, 8)
+
+
+class DescribedClient(StubClient):
+    """Stub account describing every element of the fixture `Send` type."""
+
+    def get_retrievable_fields(self, object_type):
+        send_type = fixture_soap_client().get_type(f"ns0:{object_type}")
+        return [
+            f"{name}.ID" if name in ("Client", "Email") else name
+            for name, _ in send_type.elements
+        ]
+
+
+def make_row(idx):
+    """Returns a Send row with every element of the fixture type, in WSDL order."""
+    date = START + timedelta(minutes=idx)
+    return {
+        "Client": {"ID": 7001},
+        "PartnerKey": f"partner-{idx}",
+        "CreatedDate": date,
+        "ModifiedDate": date,
+        "ID": idx,
+        "ObjectID": f"3f0c6f0e-{idx:08d}",
+        "CustomerKey": f"send-{idx}",
+        "Email": {"ID": 5000 + idx},
+        "SendDate": date,
+        "FromAddress": "newsletter@example.com",
+        "FromName": "Example Newsletter",
+        "Duplicates": idx % 3,
+        "InvalidAddresses": idx % 5,
+        "ExistingUndeliverables": idx % 7,
+        "ExistingUnsubscribes": idx % 11,
+        "HardBounces": idx % 13,
+        "SoftBounces": idx % 17,
+        "OtherBounces": idx % 19,
+        "ForwardedEmails": idx % 23,
+        "UniqueClicks": idx % 29,
+        "UniqueOpens": idx % 31,
+        "NumberSent": 10000 + idx,
+        "NumberDelivered": 9900 + idx,
+        "Unsubscribes": idx % 37,
+        "MissingAddresses": idx % 41,
+        "Subject": f"Weekly news #{idx}",
+        "PreviewURL": f"https://view.example.com/?qs=4a3c7e1f{idx:08d}",
+        "SentDate": date,
+        "EmailName": f"Weekly news {idx}",
+        "Status": "Complete",
+        "IsMultipart": True,
+        "IsAlwaysOn": False,
+        "NumberTargeted": 10000 + idx,
+        "NumberErrored": idx % 43,
+        "NumberExcluded": idx % 47,
+    }
+
+
+def make_page(rows, query_fields):
+    requested = {field.split(".", 1)[0] for field in query_fields}
+    projected = [{key: val for key, val in row.items() if key in requested} for row in rows]
+    envelope = retrieve_response_envelope("Send", projected)
+    body = etree.tostring(etree.fromstring(envelope)[1][0])
+    return envelope, body
+
+
+def parse(stream, body):
+    for record in parse_retrieve_response(body)["Results"]:
+        stream.transform_record(record)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2500)
+    args = parser.parse_args()
+
+    with open(SCHEMA_PATH, encoding="utf-8") as schema_file:
+        schema = json.load(schema_file)
+    stream_metadata = select_fields(schema, Sends.key_properties, Sends.replication_key, SELECTED)
+    stream = Sends(stream_metadata, schema, DescribedClient({}))
+    all_fields = stream.get_available_fields()
+    projected_fields = stream.get_query_fields(stream_metadata, schema)
+    rows = [make_row(idx) for idx in range(args.rows)]
+
+    print(f"{args.rows:,} Send rows, {len(projected_fields)} of {len(all_fields)} fields")
+    for name, query_fields in (("all fields", all_fields), ("projected", projected_fields)):
+        envelope, body = make_page(rows, query_fields)
+        elapsed = timed(parse, stream, body, repeat=3)
+        print(
+            f"{name:<12} {len(envelope) / 1024:>10,.0f} KiB/page "
+            f"{elapsed * 1000:>8,.0f} ms/page parse + transform"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""ContinueRequest paging benchmark, pages fetched on demand vs `prefetch_pages` ahead.
+
+A SentEvent Retrieve of `--pages` pages is served by a local stub SOAP server adding
+`--latency` seconds to every call. Every record is run through `transform_page` and
+encoded as a RECORD message, the work `sync` does on a page while the next one is fetched.
+
+    python -m tests.benchmarks.bench_page_prefetch [--pages 20] [--page-size 500]
+        [--latency 0.2]
+"""
+
+import argparse
+import json
+import os
+import time
+from unittest.mock import patch
+
+from singer import Transformer, metadata
+
+from tap_exacttarget.client import Client
+from tap_exacttarget.sink import OutputSink
+from tap_exacttarget.streams.event_sent import SentEvent
+from tests.unittests.soap_fixtures import RetrieveRoute, sent_event_rows
+from tests.unittests.stub_server import StubServer
+from tests.unittests.test_async_client import PROPERTIES, make_client
+
+SCHEMA_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "tap_exacttarget", "schemas", "sentevent.json"
+)
+
+
+def sync(client, schema):
+    stream_metadata = metadata.get_standard_metadata(
+        schema=schema, key_properties=SentEvent.key_properties
+    )
+    mdata = metadata.to_map(stream_metadata)
+    stream = SentEvent(mdata, schema, client)
+    sink = OutputSink()
+    start = time.perf_counter()
+    records = 0
+    with Transformer() as transformer:
+        for page in stream.paginate(PROPERTIES):
+            for _, record in stream.transform_page(page, schema, mdata, transformer):
+                sink.encode_record(stream.tap_stream_id, record)
+                records += 1
+    return records, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with open(SCHEMA_PATH, encoding="utf-8") as schema_file:
+        schema = json.load(schema_file)
+    rows = sent_event_rows(args.pages * args.page_size)
+    with StubServer() as server, patch.object(Client, "access_token", "bench-token"):
+        print(f"{args.pages} pages x {args.page_size} rows, {args.latency}s per call")
+        for prefetch_pages in (0, 1, 2):
+            server.routes[("POST", "/Service.asmx")] = RetrieveRoute(
+                "SentEvent", rows, args.page_size, delay=args.latency
+            )
+            client = make_client(
+                server.url, batch_size=str(args.page_size), prefetch_pages=str(prefetch_pages)
+            )
+            records, elapsed = sync(client, schema)
+            print(f"prefetch_pages={prefetch_pages} {records:8,d} records {elapsed:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
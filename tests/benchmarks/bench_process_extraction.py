@@ -0,0 +1,86 @@
+"""Records/sec of an incremental SentEvent sync extracted in the tap process vs by worker
+processes.
+
+A synthetic account generates the rows of every date window on the fly, so the measure
+covers the CPU bound part of a sync: transforming rows, `singer.Transformer` and encoding
+RECORD messages. Output goes to a discarded in-memory buffer.
+
+    python -m tests.benchmarks.bench_process_extraction [--windows 32] [--rows 20000]
+        [--workers 4]
+"""
+
+import argparse
+import io
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from unittest.mock import patch
+
+from tap_exacttarget import sink
+from tap_exacttarget.discover import discover
+from tap_exacttarget.sink import OutputSink
+from tap_exacttarget.streams.abstracts import fixed_cst
+from tap_exacttarget.sync import sync_streams
+from tests.unittests.stub_client import StubClient
+from tests.unittests.test_parallel_sync import select
+
+START = datetime(2024, 1, 1, tzinfo=fixed_cst)
+
+
+class GeneratedEventsClient(StubClient):
+    """Stub account returning `rows` SentEvent rows for every date window in one page."""
+
+    def __init__(self, rows, page_size=2500, config=None, **settings):
+        super().__init__({}, page_size, config, **settings)
+        self.rows = rows
+
+    def worker_factory(self):
+        return partial(type(self), self.rows, self.page_size, self.config, **self.settings)
+
+    def retrieve_request(self, object_type, properties, request_id=None, search_filter=None):
+        start_dt, end_dt = search_filter[1][3], search_filter[3][3]
+        step = (end_dt - start_dt) / self.rows
+        return {
+            "OverallStatus": "OK",
+            "RequestID": "req",
+            "Results": [
+                {
+                    "SendID": 1000 + idx // 5000,
+                    "SubscriberKey": f"subscriber-{idx}@example.com",
+                    "EventDate": start_dt + step * idx,
+                    "EventType": "Sent",
+                    "BatchID": 42,
+                    "ListID": 987,
+                    "Client": {"ID": 12345},
+                }
+                for idx in range(self.rows)
+            ],
+        }
+
+
+def run(catalog, rows, windows, workers):
+    client = GeneratedEventsClient(rows, date_window=1, process_workers=workers)
+    sink.set_sink(OutputSink(io.StringIO()))
+    end = START + timedelta(days=windows)
+    start = time.perf_counter()
+    with patch("tap_exacttarget.streams.abstracts.now", return_value=end):
+        sync_streams(client, catalog, {})
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--windows", type=int, default=32)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    catalog = select(discover(StubClient({})), ["sentevent"])
+    total = args.windows * args.rows
+    for name, workers in (("in process", 1), (f"{args.workers} processes", args.workers)):
+        elapsed = run(catalog, args.rows, args.windows, workers)
+        print(f"{name:<14} {total:>10,d} records {elapsed:8.2f}s {total / elapsed:>10,.0f}/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Parse time and peak memory of a SentEvent Retrieve page, zeep vs `raw_retrieve`.
+
+The page is a SOAP envelope built from the WSDL fixture, parsed into rows then converted
+with `transform_record`, as `paginate` does for every page.
+
+    python -m tests.benchmarks.bench_raw_retrieve [--rows 2500]
+"""
+
+import argparse
+import io
+import tracemalloc
+
+from tap_exacttarget.raw_retrieve import RowConverter, parse_retrieve_response
+from tap_exacttarget.streams.event_sent import SentEvent
+from tests.benchmarks.helpers import timed
+from tests.unittests.soap_fixtures import (
+    fixture_soap_client,
+    parse_retrieve_response as zeep_parse_retrieve_response,
+    retrieve_response_body,
+    retrieve_response_envelope,
+    sent_event_rows,
+)
+
+
+def parse_zeep(stream, page):
+    body, _ = page
+    response = zeep_parse_retrieve_response(body)
+    return [stream.transform_record(rec) for rec in response["Results"]]
+
+
+def parse_raw(stream, page):
+    _, envelope = page
+    converter = RowConverter(fixture_soap_client().wsdl.types)
+    response = parse_retrieve_response(io.BytesIO(envelope), converter)
+    return [stream.transform_record(rec) for rec in response["Results"]]
+
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2500)
+    args = parser.parse_args()
+
+    rows = sent_event_rows(args.rows)
+    page = (
+        retrieve_response_body("SentEvent", rows).encode("utf-8"),
+        retrieve_response_envelope("SentEvent", rows),
+    )
+    stream = SentEvent({}, {}, None)
+    fixture_soap_client()
+
+    print(f"{args.rows:,} SentEvent rows, {len(page[1]) / 1024:,.0f} KiB/page")
+    for name, func in (("zeep", parse_zeep), ("raw", parse_raw)):
+        elapsed = timed(func, stream, page, repeat=3)
+        peak = peak_memory(func, stream, page)
+        print(
+            f"{name:<6} {elapsed * 1000:>8,.0f} ms/page {peak / 1024 / 1024:>8,.1f} MiB peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Rows/sec of the replication key handling of `IncrementalStream.sync` on event rows.
+
+Every row goes through `transform_record` and the per record bookmark step of `sync`. The
+previous pipeline turned the native `datetime` into an ISO string and parsed it back with
+`dateutil`, the current one converts the native value directly. String replication keys,
+as returned by DataExtensions, are measured through `strptime_to_cst` as well.
+
+    python -m tests.benchmarks.bench_replication_key [--rows 1000000]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import dateutil.parser
+
+from tap_exacttarget.streams.abstracts import fixed_cst, serialize_record, to_cst
+from tap_exacttarget.streams.event_sent import SentEvent
+
+START = datetime(2024, 1, 1, 8, tzinfo=fixed_cst)
+
+
+def make_rows(count):
+    """Yields SentEvent rows, a few events sharing every second like a bulk send."""
+    for idx in range(count):
+        yield {
+            "SendID": 1000 + idx // 5000,
+            "SubscriberKey": f"subscriber-{idx}@example.com",
+            "EventDate": START + timedelta(seconds=idx // 4),
+            "EventType": "Sent",
+            "BatchID": 42,
+        }
+
+
+def legacy_strptime_to_cst(dtimestr):
+    d_object = dateutil.parser.parse(dtimestr)
+    if d_object.tzinfo is None:
+        return d_object.replace(tzinfo=fixed_cst)
+    return d_object.astimezone(tz=fixed_cst)
+
+
+def legacy(rows):
+    current_max = START
+    for row in rows:
+        record = serialize_record(row)
+        record_timestamp = legacy_strptime_to_cst(record["EventDate"])
+        record["EventDate"] = record_timestamp.isoformat()
+        current_max = max(current_max, record_timestamp)
+
+
+def native(stream, rows):
+    current_max = START
+    for row in rows:
+        record = stream.transform_record(row)
+        record_timestamp = to_cst(record["EventDate"])
+        record["EventDate"] = record_timestamp.isoformat()
+        if record_timestamp > current_max:
+            current_max = record_timestamp
+
+
+def strings(stream, rows):
+    native(stream, ({**row, "EventDate": row["EventDate"].isoformat()} for row in rows))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    stream = SentEvent({}, {}, None)
+    for name, func, func_args in (
+        ("string + dateutil", legacy, ()),
+        ("native datetime", native, (stream,)),
+        ("cached fromisoformat", strings, (stream,)),
+    ):
+        start = time.perf_counter()
+        func(*func_args, make_rows(args.rows))
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {args.rows / elapsed:>12,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Microbenchmark of the per-page cost of building a RetrieveRequest.
+
+Compares the previous per-page `get_type` + `set_default_soapheaders` pattern with the
+cached types and token-aware header refresh in `Client`.
+
+    python -m tests.benchmarks.bench_request_builder [--pages 10000]
+"""
+
+import argparse
+from datetime import datetime
+
+from tests.benchmarks.helpers import fixture_client, timed
+
+PROPERTIES = ["SendID", "SubscriberKey", "EventDate", "EventType", "BatchID"]
+
+
+def legacy_pages(client, search_filter, pages):
+    for page in range(pages):
+        retrieve_req = client.soap_client.get_type("ns0:RetrieveRequest")
+        retrieve_opts = client.soap_client.get_type("ns0:RetrieveOptions")
+        retrieve_options = retrieve_opts(BatchSize=client.batch_size, IncludeObjects=True)
+        request = retrieve_req(
+            ObjectType="SentEvent", Properties=PROPERTIES, Options=retrieve_options
+        )
+        request.Filter = search_filter
+        request.ContinueRequest = f"req-{page}"
+        client.soap_client.set_default_soapheaders([client.oauth_header(client.access_token)])
+
+
+def cached_pages(client, search_filter, pages):
+    for page in range(pages):
+        client.build_retrieve_request(
+            "SentEvent", PROPERTIES, request_id=f"req-{page}", search_filter=search_filter
+        )
+        client.refresh_soap_header()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=10000)
+    args = parser.parse_args()
+
+    with fixture_client() as client:
+        start = client.create_simple_filter(
+            "EventDate", "greaterThanOrEqual", date_value=datetime(2024, 1, 1)
+        )
+        end = client.create_simple_filter(
+            "EventDate", "lessThanOrEqual", date_value=datetime(2024, 1, 31)
+        )
+        search_filter = client.create_complex_filter(start, "AND", end)
+
+        legacy = timed(legacy_pages, client, search_filter, args.pages)
+        cached = timed(cached_pages, client, search_filter, args.pages)
+
+    print(f"pages: {args.pages}")
+    print(f"per-call lookups: {legacy / args.pages * 1e6:.1f} us/page")
+    print(f"cached builder:   {cached / args.pages * 1e6:.1f} us/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Output benchmark: `singer.write_record` vs the buffered `OutputSink`.
+
+Both write RECORD messages of a SentEvent sized record into a pipe drained by a reader
+thread, like a Singer target consuming the tap's stdout.
+
+    python -m tests.benchmarks.bench_sink [--records 200000]
+"""
+
+import argparse
+import contextlib
+import os
+import threading
+
+import singer
+
+from tap_exacttarget.sink import OutputSink
+from tests.benchmarks.helpers import timed
+
+RECORD = {
+    "SendID": 123456,
+    "SubscriberKey": "subscriber-0001@example.com",
+    "EventDate": "2024-01-01T08:00:00.000000-06:00",
+    "EventType": "Sent",
+    "BatchID": 42,
+    "ListID": 987,
+    "TriggeredSendDefinitionObjectID": None,
+}
+
+
+def write_with_singer(output, count):
+    with contextlib.redirect_stdout(output):
+        for _ in range(count):
+            singer.write_record("sentevent", RECORD)
+
+
+def write_with_sink(output, count):
+    out = OutputSink(output)
+    for _ in range(count):
+        out.write_record("sentevent", RECORD)
+    out.flush()
+
+
+def drain(read_fd):
+    with os.fdopen(read_fd, "rb") as reader:
+        while reader.read(1 << 16):
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    read_fd, write_fd = os.pipe()
+    reader = threading.Thread(target=drain, args=(read_fd,))
+    reader.start()
+    with os.fdopen(write_fd, "w", encoding="utf-8") as pipe:
+        for name, func in (
+            ("singer.write_record", write_with_singer),
+            ("OutputSink", write_with_sink),
+        ):
+            elapsed = timed(func, pipe, args.records, repeat=3)
+            print(f"{name:20s} {args.records / elapsed:12,.0f} records/sec")
+    reader.join()
+
+
+if __name__ == "__main__":
+    main()
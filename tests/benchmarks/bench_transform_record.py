@@ -0,0 +1,61 @@
+"""Records/sec of `BaseStream.transform_record` over a captured page of 2,500 events.
+
+Compares the previous `serialize_object` + json round trip with the single pass converter,
+with every field materialized and with the catalog selection applied.
+
+    python -m tests.benchmarks.bench_transform_record [--rows 2500]
+"""
+
+import argparse
+import json
+import os
+
+from zeep.helpers import serialize_object
+
+from tap_exacttarget.streams.abstracts import CustomDTParser
+from tap_exacttarget.streams.event_sent import SentEvent
+from tests.benchmarks.helpers import timed
+from tests.unittests.soap_fixtures import (
+    parse_retrieve_response,
+    retrieve_response_body,
+    sent_event_rows,
+)
+
+SCHEMA_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "tap_exacttarget", "schemas", "sentevent.json"
+)
+
+
+def legacy(records):
+    for rec in records:
+        json.loads(json.dumps(serialize_object(rec), cls=CustomDTParser))
+
+
+def fast(stream, records):
+    for rec in records:
+        stream.transform_record(rec)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2500)
+    args = parser.parse_args()
+
+    with open(SCHEMA_PATH, encoding="utf-8") as schema_file:
+        schema = json.load(schema_file)
+    metadata = {("properties", key): {"selected": True} for key in schema["properties"]}
+    records = parse_retrieve_response(
+        retrieve_response_body("SentEvent", sent_event_rows(args.rows))
+    )["Results"]
+
+    results = {
+        "json round trip": timed(legacy, records),
+        "single pass, all fields": timed(fast, SentEvent({}, schema, None), records),
+        "single pass, selected fields": timed(fast, SentEvent(metadata, schema, None), records),
+    }
+    for name, elapsed in results.items():
+        print(f"{name:<30} {args.rows / elapsed:>12,.0f} records/sec")
+
+
+if __name__ == "__main__":
+    main()
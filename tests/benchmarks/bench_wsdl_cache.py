@@ -0,0 +1,57 @@
+"""Startup benchmark: cold vs warm SOAP client initialization with the on-disk WSDL cache.
+
+The WSDL fixture is served by a local HTTP stand-in with an injected latency that
+approximates the round trip to `{subdomain}.soap.marketingcloudapis.com`.
+
+    python -m tests.benchmarks.bench_wsdl_cache [--latency 0.5] [--runs 5]
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+from requests import Session
+
+from tap_exacttarget.cache import WsdlCache
+from tap_exacttarget.client import Client
+from tests.unittests.stub_server import WSDL_FIXTURE, StubServer
+
+
+def time_startup(wsdl_uri, cache):
+    stub_client = SimpleNamespace(wsdl_uri=wsdl_uri, wsdl_cache=cache, session=Session())
+    stub_client.create_transport = lambda: Client.create_transport(stub_client)
+    start = time.perf_counter()
+    Client.initialize_soap_client(stub_client)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency) as server:
+        server.add_file("/etframework.wsdl", WSDL_FIXTURE)
+        wsdl_uri = f"{server.url}/etframework.wsdl"
+
+        cold, warm = [], []
+        for _ in range(args.runs):
+            cache_dir = tempfile.mkdtemp()
+            try:
+                cache = WsdlCache(cache_dir)
+                cold.append(time_startup(wsdl_uri, cache))
+                warm.append(time_startup(wsdl_uri, cache))
+            finally:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"latency per request: {args.latency:.3f}s, runs: {args.runs}")
+    print(f"cold start: median {statistics.median(cold):.4f}s")
+    print(f"warm start: median {statistics.median(warm):.4f}s")
+
+
+if __name__ == "__main__":
+    main()
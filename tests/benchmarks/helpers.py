@@ -0,0 +1,41 @@
+"""Shared setup for benchmarks."""
+
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from zeep.client import Client as ZeepClient
+
+from tap_exacttarget.client import Client
+from tests.unittests.stub_server import WSDL_FIXTURE
+
+BENCH_CONFIG = {
+    "tenant_subdomain": "bench",
+    "client_id": "bench-client-id",
+    "client_secret": "bench-client-secret",
+    "start_date": "2024-01-01T00:00:00Z",
+}
+
+
+@contextmanager
+def fixture_client(**config):
+    """Yields a real `Client` built from the WSDL fixture with a static access token."""
+
+    def build_zeep_client(wsdl, transport):  # pylint: disable=unused-argument
+        return ZeepClient(WSDL_FIXTURE, transport=transport)
+
+    with patch.object(Client, "access_token", "bench-token"), patch(
+        "tap_exacttarget.client.client.Client", side_effect=build_zeep_client
+    ):
+        yield Client({**BENCH_CONFIG, **config})
+
+
+def timed(func, *args, repeat=5, **kwargs):
+    """Returns the best wall time in seconds of `repeat` calls to `func`."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
@@ -2,6 +2,7 @@
 
 import unittest
 from unittest.mock import Mock, MagicMock, patch
+from tap_exacttarget.auth import Token
 from tap_exacttarget.client import Client
 
 
@@ -33,16 +34,29 @@ class BaseClientTest(unittest.TestCase):
         self.mock_oauth_response.raise_for_status = Mock()
 
         self.patches = [
-            patch("tap_exacttarget.client.Transport"),
+            patch("tap_exacttarget.client.MeteredTransport"),
             patch("tap_exacttarget.client.Session"),
-            patch("tap_exacttarget.client.requests.post", return_value=self.mock_oauth_response),
             patch("tap_exacttarget.client.client.Client", return_value=self.mock_soap_client),
         ]
         for p in self.patches:
-            p.start()
+            mock = p.start()
+            if p.attribute == "Session":
+                mock.return_value.post.return_value = self.mock_oauth_response
 
         self.client_instance = Client(self.mock_config)
 
+    def session_mock(self, method):
+        """Returns the mocked http session method of the client, without the calls of setUp."""
+        mock_method = getattr(self.client_instance.session, method)
+        mock_method.reset_mock()
+        return mock_method
+
+    def use_token(self, token):
+        """Makes `token` the current access token of the client, valid for an hour."""
+        manager = self.client_instance.token_manager
+        now = manager.clock()
+        manager.current = Token(token, now + 3600 - manager.refresh_ahead, now + 3600)
+
     def tearDown(self):
         """Stop all active patches."""
         for p in self.patches:
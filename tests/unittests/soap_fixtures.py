@@ -0,0 +1,157 @@
+"""Builders for recorded-style SOAP responses parsed with the WSDL fixture."""
+
+import itertools
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from lxml import etree
+from zeep.client import Client as ZeepClient
+
+from .stub_server import WSDL_FIXTURE
+
+PARTNER_NS = "http://exacttarget.com/wsdl/partnerAPI"
+SOAP_ENV_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+
+
+@lru_cache(maxsize=1)
+def fixture_soap_client():
+    """Returns a zeep client built from the WSDL fixture."""
+    return ZeepClient(WSDL_FIXTURE)
+
+
+def to_xml(name, value):
+    """Serializes a (possibly nested) python value as partner API elements."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "".join(to_xml(name, item) for item in value)
+    if isinstance(value, dict):
+        inner = "".join(to_xml(key, val) for key, val in value.items())
+        return f"<{name}>{inner}</{name}>"
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    return f"<{name}>{escape(str(value))}</{name}>"
+
+
+def retrieve_response_body(object_type, rows, status="OK", request_id="req-1"):
+    """Returns the `RetrieveResponseMsg` element for `rows` of `object_type`."""
+    results = "".join(
+        f'<Results xsi:type="{object_type}">'
+        + "".join(to_xml(key, val) for key, val in row.items())
+        + "</Results>"
+        for row in rows
+    )
+    return (
+        f'<RetrieveResponseMsg xmlns="{PARTNER_NS}" xmlns:xsi="{XSI_NS}">'
+        f"<OverallStatus>{status}</OverallStatus><RequestID>{request_id}</RequestID>"
+        f"{results}</RetrieveResponseMsg>"
+    )
+
+
+def retrieve_response_envelope(object_type, rows, status="OK", request_id="req-1"):
+    """Returns a full SOAP envelope as sent back by the Retrieve operation."""
+    body = retrieve_response_body(object_type, rows, status=status, request_id=request_id)
+    return (
+        f'<?xml version="1.0" encoding="utf-8"?><soap:Envelope xmlns:soap="{SOAP_ENV_NS}">'
+        f"<soap:Header/><soap:Body>{body}</soap:Body></soap:Envelope>"
+    ).encode("utf-8")
+
+
+def parse_retrieve_response(body):
+    """Parses a `RetrieveResponseMsg` body the same way zeep parses a service reply."""
+    soap_client = fixture_soap_client()
+    element = soap_client.get_element("ns0:RetrieveResponseMsg")
+    return element.parse(etree.fromstring(body), soap_client.wsdl.types)
+
+
+def sent_event_rows(count, start=datetime(2024, 1, 1, 8, 0, 0)):
+    """Returns `count` SentEvent rows spread over consecutive minutes."""
+    return [
+        {
+            "Client": {"ID": 7001},
+            "CreatedDate": start + timedelta(minutes=idx),
+            "SendID": 1000 + idx % 50,
+            "SubscriberKey": f"subscriber-{idx}@example.com",
+            "EventDate": start + timedelta(minutes=idx),
+            "EventType": "Sent",
+            "TriggeredSendDefinitionObjectID": f"6c1c6bd4-{idx:04d}",
+            "BatchID": idx % 7,
+            "ListID": 42,
+        }
+        for idx in range(count)
+    ]
+
+
+class RetrieveRoute:
+    """`StubServer` route answering Retrieve calls from python rows.
+
+    Rows are filtered on the `DateValue` bounds of the request filter, compared with
+    `date_field`, and served in pages of `page_size` chained through `ContinueRequest` ids,
+    or of the requested `BatchSize` without `page_size`. Requested sizes are kept in
+    `batch_sizes`.
+    `delay` seconds are spent on every call, and the highest number of calls in flight at
+    once is kept in `max_in_flight`.
+    """
+
+    def __init__(self, object_type, rows, page_size, date_field="EventDate", delay=0.0):
+        self.object_type = object_type
+        self.rows = rows
+        self.page_size = page_size
+        self.date_field = date_field
+        self.delay = delay
+        self.continuations = {}
+        self.request_ids = itertools.count(1)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.batch_sizes = []
+        self.lock = threading.Lock()
+
+    def select_rows(self, body):
+        bounds = [
+            datetime.fromisoformat(value.decode())
+            for value in re.findall(rb"<(?:\w+:)?DateValue>([^<]+)<", body)
+        ]
+        if len(bounds) != 2:
+            return self.rows
+        start, end = sorted(bounds)
+        return [
+            row for row in self.rows
+            if start <= row[self.date_field].replace(tzinfo=start.tzinfo) <= end
+        ]
+
+    def __call__(self, path, body):  # pylint: disable=unused-argument
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            request_id = re.search(rb"<(?:\w+:)?ContinueRequest>([^<]+)<", body)
+            batch_size = int(re.search(rb"<(?:\w+:)?BatchSize>(\d+)<", body).group(1))
+            with self.lock:
+                self.batch_sizes.append(batch_size)
+                if request_id:
+                    rows, offset = self.continuations.pop(request_id.group(1).decode())
+                else:
+                    rows, offset = self.select_rows(body), 0
+                end = offset + (self.page_size or batch_size)
+                next_id = f"req-{next(self.request_ids)}"
+                if end < len(rows):
+                    self.continuations[next_id] = (rows, end)
+            payload = retrieve_response_envelope(
+                self.object_type,
+                rows[offset:end],
+                status="MoreDataAvailable" if end < len(rows) else "OK",
+                request_id=next_id,
+            )
+            return 200, "text/xml; charset=utf-8", payload
+        finally:
+            with self.lock:
+                self.in_flight -= 1
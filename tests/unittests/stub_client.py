@@ -0,0 +1,127 @@
+"""In-memory stand-in for `tap_exacttarget.client.Client` used by stream level tests."""
+
+import itertools
+import threading
+from functools import partial
+
+
+class StubClient:
+    """Serves Retrieve pages from python records and counts every SOAP call.
+
+    `records` maps an object type to a list of dicts. Simple and complex filters are
+    evaluated against those dicts, dotted property names reaching into nested dicts, and
+    result sets are split into pages of `page_size` rows chained through `ContinueRequest`
+    ids like the real API.
+    """
+
+    def __init__(self, records=None, page_size=2, config=None, **settings):
+        self.records = records or {}
+        self.page_size = page_size
+        self.settings = settings
+        self.config = {"start_date": "2024-01-01T00:00:00Z", **(config or {})}
+        self.date_window = settings.get("date_window", 30)
+        self.window_concurrency = settings.get("window_concurrency", 1)
+        self.subscriber_concurrency = settings.get("subscriber_concurrency", 1)
+        self.max_parallel_streams = settings.get("max_parallel_streams", 1)
+        self.process_workers = settings.get("process_workers", 1)
+        self.async_concurrency = settings.get("async_concurrency", 0)
+        self.prefetch_pages = settings.get("prefetch_pages", 0)
+        self.extraction_pool = None
+        self.async_engine = None
+        self.target_window_pages = settings.get("target_window_pages", 0)
+        self.min_date_window = settings.get("min_date_window", 1 / 24)
+        self.max_date_window = settings.get("max_date_window", 365)
+        self.batch_size = page_size
+        self.batch_sizes = {}
+        self.batch_tuners = {}
+        self.log_search_filter = True
+        self.raw_retrieve = False
+        self.dao_cache = None
+        self.retrieve_calls = []
+        self.describe_calls = []
+        self.spawned = 0
+        self.continuations = {}
+        self.request_ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def create_simple_filter(self, property_name, operator, value=None, date_value=None):
+        return ("simple", property_name, operator, value if value is not None else date_value)
+
+    def create_complex_filter(self, left_operand, logical_operator, right_operand):
+        return ("complex", left_operand, logical_operator, right_operand)
+
+    def matches(self, search_filter, record):
+        if search_filter is None:
+            return True
+        if search_filter[0] == "complex":
+            _, left, operator, right = search_filter
+            if operator == "AND":
+                return self.matches(left, record) and self.matches(right, record)
+            return self.matches(left, record) or self.matches(right, record)
+
+        _, property_name, operator, value = search_filter
+        actual = record
+        for part in property_name.split("."):
+            actual = actual.get(part) if isinstance(actual, dict) else None
+        if operator == "equals":
+            return actual == value
+        if operator == "IN":
+            return actual in value
+        if operator == "greaterThanOrEqual":
+            return actual is not None and actual >= value
+        if operator == "lessThanOrEqual":
+            return actual is not None and actual <= value
+        raise ValueError(f"unsupported operator {operator}")
+
+    def retrieve_request(self, object_type, properties, request_id=None, search_filter=None):
+        with self.lock:
+            self.retrieve_calls.append((object_type, request_id, search_filter))
+            if request_id:
+                rows, offset = self.continuations.pop(request_id)
+            else:
+                rows, offset = [
+                    rec for rec in self.records.get(object_type, [])
+                    if self.matches(search_filter, rec)
+                ], 0
+
+            end = offset + self.page_size
+            page, has_more = rows[offset:end], end < len(rows)
+            next_id = f"req-{next(self.request_ids)}"
+            if has_more:
+                self.continuations[next_id] = (rows, end)
+            return {
+                "OverallStatus": "MoreDataAvailable" if has_more else "OK",
+                "RequestID": next_id,
+                "Results": [dict(rec) for rec in page],
+            }
+
+    def describe_request(self, object_type):
+        with self.lock:
+            self.describe_calls.append(object_type)
+        names = {key for rec in self.records.get(object_type, []) for key in rec}
+        return {
+            "ObjectDefinition": [
+                {"Properties": [{"Name": name, "IsRetrievable": True} for name in sorted(names)]}
+            ]
+        }
+
+    def get_retrievable_fields(self, object_type):
+        obj_defs = self.describe_request(object_type)
+        return [prop["Name"] for prop in obj_defs["ObjectDefinition"][0]["Properties"]]
+
+    def log_describe_stats(self):
+        pass
+
+    def configure_batch_size(self, object_type, stream_id, stored_size=None):
+        pass
+
+    def get_batch_size(self, object_type):
+        return self.batch_sizes.get(object_type, self.batch_size)
+
+    def worker_factory(self):
+        return partial(type(self), self.records, self.page_size, self.config, **self.settings)
+
+    def spawn(self):
+        with self.lock:
+            self.spawned += 1
+        return self
@@ -0,0 +1,124 @@
+"""Local HTTP stand-ins for the Marketing Cloud endpoints used by tests and benchmarks."""
+
+import json
+import os
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "fixtures")
+WSDL_FIXTURE = os.path.join(FIXTURES_DIR, "etframework.wsdl")
+# self-signed certificate and key for 127.0.0.1, pass as `verify` to trust the HTTPS stub
+TLS_FIXTURE = os.path.join(FIXTURES_DIR, "localhost.pem")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves the routes registered on the owning `StubServer`."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.dispatch("GET")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.dispatch("POST")
+
+    def dispatch(self, method):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        stub.requests.append((method, self.path, body))
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        route = stub.routes.get((method, self.path.split("?")[0]))
+        if route is None:
+            status, content_type, payload = 404, "text/plain", b"not found"
+        else:
+            status, content_type, payload = route(self.path, body)
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class StubServer:
+    """Threaded HTTP server bound to a random local port.
+
+    Routes are registered as `(method, path) -> callable(path, body)` returning
+    `(status, content_type, payload)`. `latency` adds a fixed delay to every request to
+    stand in for network round trips. With `tls` the server speaks HTTPS using
+    `TLS_FIXTURE`, and `connections` counts the TLS handshakes clients made.
+    """
+
+    def __init__(self, latency: float = 0.0, tls: bool = False):
+        self.latency = latency
+        self.tls = tls
+        self.routes = {}
+        self.requests = []
+        self.connections = 0
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.httpd.stub = self
+        self.httpd.daemon_threads = True
+        self.thread = None
+        if tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(TLS_FIXTURE)
+            self.httpd.socket = context.wrap_socket(self.httpd.socket, server_side=True)
+
+        stub = self
+        original_process_request = self.httpd.process_request
+
+        def process_request(request, client_address):
+            stub.connections += 1
+            original_process_request(request, client_address)
+
+        self.httpd.process_request = process_request
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"{'https' if self.tls else 'http'}://{host}:{port}"
+
+    def add_file(self, path, file_path, content_type="text/xml"):
+        with open(file_path, "rb") as fixture:
+            payload = fixture.read()
+        self.routes[("GET", path)] = lambda *_: (200, content_type, payload)
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TokenRoute:
+    """`StubServer` route standing in for the OAuth token endpoint.
+
+    Every call issues a new token, `token-1`, `token-2`, ..., valid for `expires_in` seconds,
+    after `delay` seconds. The credentials of every call are kept in `payloads`.
+    """
+
+    def __init__(self, expires_in=1080, delay=0.0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.payloads = []
+        self.lock = threading.Lock()
+
+    def __call__(self, path, body):  # pylint: disable=unused-argument
+        if self.delay:
+            time.sleep(self.delay)
+        with self.lock:
+            self.payloads.append(json.loads(body))
+            token = f"token-{len(self.payloads)}"
+        payload = json.dumps({"access_token": token, "expires_in": self.expires_in})
+        return 200, "application/json", payload.encode("utf-8")
@@ -0,0 +1,144 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from singer import Transformer
+
+from tap_exacttarget.streams.abstracts import WINDOW_SIZE_KEY, fixed_cst
+from tap_exacttarget.streams.datafolder import DataFolder
+from tap_exacttarget.streams.event_sent import SentEvent
+from tap_exacttarget.windowing import AdaptiveWindowPlanner
+from .stub_client import StubClient
+from .test_incremental_windows import NOW, make_events
+
+START = datetime(2024, 1, 1, tzinfo=fixed_cst)
+
+
+def make_planner(window_days=10, target_pages=10, min_days=1, max_days=40):
+    return AdaptiveWindowPlanner(
+        "stream", START, NOW, window_days, target_pages, page_size=100,
+        min_days=min_days, max_days=max_days,
+    )
+
+
+class TestAdaptiveWindowPlanner(unittest.TestCase):
+    """Tests for the window sizing decisions of `AdaptiveWindowPlanner`."""
+
+    def test_heavy_windows_shrink_in_proportion(self):
+        self.assertEqual(make_planner().next_window_days(20), 5)
+        # a single observation shrinks by a factor of 4 at most
+        self.assertEqual(make_planner().next_window_days(1000), 2.5)
+
+    def test_empty_and_light_windows_grow(self):
+        self.assertEqual(make_planner().next_window_days(0), 20)
+        self.assertEqual(make_planner().next_window_days(4), 20)
+        self.assertEqual(make_planner().next_window_days(5), 20)
+
+    def test_windows_close_to_target_are_kept(self):
+        self.assertEqual(make_planner().next_window_days(6), 10)
+        self.assertEqual(make_planner().next_window_days(10), 10)
+
+    def test_sizes_are_clamped_to_bounds(self):
+        self.assertEqual(make_planner(window_days=30).next_window_days(0), 40)
+        self.assertEqual(make_planner(window_days=2).next_window_days(100), 1)
+        self.assertEqual(make_planner(window_days=100).window_days, 40)
+
+    def test_windows_follow_resized_length_and_cover_range(self):
+        planner = make_planner(window_days=10)
+        windows = []
+        for start_dt, end_dt in planner:
+            windows.append((start_dt, end_dt))
+            planner.resize(start_dt, end_dt, 20)
+
+        self.assertEqual(windows[0], (START, START + timedelta(days=10)))
+        self.assertEqual(windows[1][1] - windows[1][0], timedelta(days=5))
+        self.assertEqual(windows[-1][1], NOW)
+        for (_, end_dt), (next_start, _) in zip(windows, windows[1:]):
+            self.assertEqual(end_dt, next_start)
+
+    def test_decisions_are_logged(self):
+        planner = make_planner()
+
+        with self.assertLogs(level="INFO") as logs:
+            planner.resize(START, START + timedelta(days=10), 40)
+
+        self.assertIn("shrinking date window 10.0000 -> 2.5000 days", logs.output[0])
+
+    def test_observe_measures_load_in_full_pages(self):
+        planner = make_planner()
+        pages = [[{}] * 100, [{}] * 100, [{}] * 50]
+
+        self.assertEqual(list(planner.observe(START, START + timedelta(days=10), pages)), pages)
+        self.assertEqual(planner.window_days, 20)
+
+    def test_truncated_last_window_keeps_size(self):
+        planner = make_planner()
+        planner.resize(NOW - timedelta(days=2), NOW, 0)
+
+        self.assertEqual(planner.window_days, 10)
+
+
+@patch("tap_exacttarget.streams.abstracts.write_state")
+@patch("tap_exacttarget.streams.abstracts.write_record")
+@patch("tap_exacttarget.streams.abstracts.now", return_value=NOW)
+class TestAdaptiveIncrementalSync(unittest.TestCase):
+    """Tests for incremental streams running on adaptive date windows."""
+
+    def run_sync(self, stream_class, records, state=None, **settings):
+        client = StubClient({stream_class.object_ref: records}, page_size=10, **settings)
+        stream = stream_class({}, {}, client)
+        with Transformer() as transformer:
+            state = stream.sync(state or {}, {}, {}, transformer)
+        return client, state
+
+    @staticmethod
+    def window_page_counts(client):
+        """Pages fetched per window, from the Retrieve calls of a stub client."""
+        counts = []
+        for _, request_id, _ in client.retrieve_calls:
+            if request_id is None:
+                counts.append(0)
+            counts[-1] += 1
+        return counts
+
+    def test_high_volume_stream_converges_on_target(self, *_):
+        events = make_events(3500, step=timedelta(minutes=25))
+        fixed, _ = self.run_sync(SentEvent, events, date_window=30)
+        client, state = self.run_sync(
+            SentEvent, events, date_window=30, target_window_pages=5
+        )
+
+        fixed_counts = self.window_page_counts(fixed)
+        adaptive_counts = self.window_page_counts(client)
+        self.assertGreater(max(fixed_counts), 100)
+        self.assertEqual(adaptive_counts[0], fixed_counts[0])
+        self.assertTrue(all(count <= 5 for count in adaptive_counts[3:]))
+        self.assertLess(state["bookmarks"][SentEvent.tap_stream_id][WINDOW_SIZE_KEY], 1)
+
+    def test_sparse_stream_needs_fewer_windows(self, *_):
+        records = [
+            {"ID": idx, "ModifiedDate": START - timedelta(days=200 * idx)} for idx in range(4)
+        ]
+        config = {"start_date": "2019-01-01T00:00:00Z"}
+
+        fixed, _ = self.run_sync(DataFolder, records, config=config, date_window=30)
+        client, _ = self.run_sync(
+            DataFolder, records, config=config, date_window=30, target_window_pages=5
+        )
+
+        self.assertGreater(len(self.window_page_counts(fixed)), 60)
+        self.assertLess(len(self.window_page_counts(client)), 15)
+
+    def test_learned_window_size_is_reused(self, *_):
+        events = make_events(3500, step=timedelta(minutes=25))
+        _, state = self.run_sync(SentEvent, events, date_window=30, target_window_pages=5)
+        learned = state["bookmarks"][SentEvent.tap_stream_id][WINDOW_SIZE_KEY]
+        state["bookmarks"][SentEvent.tap_stream_id]["EventDate"] = START.isoformat()
+
+        client, _ = self.run_sync(
+            SentEvent, events, state=state, date_window=30, target_window_pages=5
+        )
+
+        first_window_pages = self.window_page_counts(client)[0]
+        self.assertLessEqual(first_window_pages, 10)
+        self.assertLess(learned, 30)
@@ -0,0 +1,151 @@
+import asyncio
+import importlib.util
+import os
+import math
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from zeep.client import Client as ZeepClient
+
+from tap_exacttarget.auth import Token
+from tap_exacttarget.client import Client
+from tap_exacttarget.exceptions import MarketingCloudSoapApiException
+from tap_exacttarget.streams.abstracts import fixed_cst
+from tap_exacttarget.streams.event_sent import SentEvent
+from tap_exacttarget.sync import create_async_engine
+from .soap_fixtures import RetrieveRoute, sent_event_rows
+from .stub_server import WSDL_FIXTURE, StubServer
+
+SERVICE_ADDRESS = "https://webservice.exacttarget.com/Service.asmx"
+PROPERTIES = ["SendID", "SubscriberKey", "EventDate", "EventType"]
+
+
+def make_client(server_url, **config):
+    """Builds a `Client` whose SOAP service is served by the stub server at `server_url`."""
+    with open(WSDL_FIXTURE, encoding="utf-8") as wsdl:
+        document = wsdl.read().replace(SERVICE_ADDRESS, f"{server_url}/Service.asmx")
+    wsdl_dir = tempfile.mkdtemp()
+    wsdl_path = os.path.join(wsdl_dir, "etframework.wsdl")
+    with open(wsdl_path, "w", encoding="utf-8") as wsdl:
+        wsdl.write(document)
+
+    def build_zeep_client(wsdl, transport):  # pylint: disable=unused-argument
+        return ZeepClient(wsdl_path, transport=transport)
+
+    with patch("tap_exacttarget.client.client.Client", side_effect=build_zeep_client):
+        return Client(
+            {
+                "tenant_subdomain": "test-subdomain",
+                "client_id": "test-client-id",
+                "client_secret": "test-client-secret",
+                "start_date": "2024-01-01T00:00:00Z",
+                **config,
+            }
+        )
+
+
+@unittest.skipUnless(importlib.util.find_spec("httpx"), "requires the async extra")
+class TestAsyncEngine(unittest.TestCase):
+    """Tests for the async requests run on the event loop of an `AsyncEngine`."""
+
+    def setUp(self):
+        patcher = patch.object(Client, "access_token", "token")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.rows = sent_event_rows(40)
+        self.route = RetrieveRoute("SentEvent", self.rows, page_size=3, delay=0.05)
+        self.server = StubServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.routes[("POST", "/Service.asmx")] = self.route
+
+        self.client = make_client(self.server.url, async_concurrency="4", batch_size="3")
+        self.client.token_manager.current = Token("token", math.inf, math.inf)
+        self.engine = create_async_engine(self.client)
+        self.addCleanup(self.engine.close)
+
+    def test_retrieve_request_pages_through_continue_requests(self):
+        stream = SentEvent({}, {}, self.client)
+
+        async def fetch():
+            return [page async for page in stream.paginate_async(self.engine.client, PROPERTIES)]
+
+        pages = self.engine.call(fetch())
+
+        self.assertEqual(len(pages), 14)
+        self.assertEqual(
+            [record["SubscriberKey"] for page in pages for record in page],
+            [row["SubscriberKey"] for row in self.rows],
+        )
+
+    def test_windows_match_synchronous_paging(self):
+        stream = SentEvent({}, {}, self.client)
+        start = datetime(2024, 1, 1, 8, tzinfo=fixed_cst)
+        windows = stream.create_date_windows(start, start + timedelta(hours=1), 1 / 144)
+
+        def fetch_windows():
+            return [
+                (start_dt, end_dt, list(pages))
+                for start_dt, end_dt, pages in stream.iter_window_pages(windows, PROPERTIES)
+            ]
+
+        serial_start = time.perf_counter()
+        serial = fetch_windows()
+        serial_elapsed = time.perf_counter() - serial_start
+
+        self.client.async_engine = self.engine
+        concurrent_start = time.perf_counter()
+        concurrent = fetch_windows()
+        concurrent_elapsed = time.perf_counter() - concurrent_start
+
+        self.assertEqual(concurrent, serial)
+        # the 3 records on a boundary between two windows are returned by both
+        self.assertEqual(sum(len(page) for _, _, pages in concurrent for page in pages), 43)
+        self.assertEqual(self.route.max_in_flight, 4)
+        self.assertLess(concurrent_elapsed, serial_elapsed)
+
+    def test_requests_are_bounded_by_the_concurrency(self):
+        stream = SentEvent({}, {}, self.client)
+
+        async def fetch():
+            return [page async for page in stream.paginate_async(self.engine.client, PROPERTIES)]
+
+        async def fetch_all():
+            return await asyncio.gather(*[fetch() for _ in range(6)])
+
+        results = self.engine.call(fetch_all())
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(self.route.max_in_flight, 4)
+
+    def test_expired_token_is_requested_off_the_event_loop(self):
+        token_threads = []
+
+        def fetch_token():
+            token_threads.append(threading.current_thread())
+            return "new-token", 3600
+
+        self.client.token_manager.fetch_token = fetch_token
+        self.client.token_manager.current = None
+        self.engine.call(self.engine.client.retrieve_request("SentEvent", PROPERTIES))
+
+        self.assertEqual(len(token_threads), 1)
+        self.assertIsNot(token_threads[0], self.engine.thread)
+        self.assertEqual(self.engine.client.soap_header_token, "new-token")
+
+    def test_chain_errors_are_raised_in_consumer(self):
+        self.server.routes[("POST", "/Service.asmx")] = lambda *_: (
+            500,
+            "text/plain",
+            b"server error",
+        )
+        stream = SentEvent({}, {}, self.client)
+        chains = [lambda: stream.paginate_async(self.engine.client, PROPERTIES)]
+
+        results = self.engine.iter_ordered(chains, buffer_size=1)
+        with self.assertRaises(MarketingCloudSoapApiException):
+            list(next(results))
@@ -1,46 +1,77 @@
-from datetime import datetime, timedelta
+import threading
+import unittest
 from unittest.mock import Mock, patch
+
 from requests.exceptions import HTTPError, RequestException
+
+from tap_exacttarget.auth import TokenManager
+from tap_exacttarget.client import Client
 from .base_test import BaseClientTest
+from .stub_server import StubServer, TokenRoute
+from .test_http_session import make_client
+
+
+class FakeClock:
+    """Clock advanced by hand."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeAuth:
+    """`fetch_token` issuing numbered tokens, blocked until `release` is set when `hold`."""
+
+    def __init__(self, expires_in=1000, hold=False):
+        self.expires_in = expires_in
+        self.calls = 0
+        self.error = None
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def __call__(self):
+        self.release.wait(5)
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return f"token-{self.calls}", self.expires_in
 
 
 class TestTokenManagement(BaseClientTest):
-    """Tests for OAuth token caching, expiry validation, and refresh logic."""
+    """Tests for the OAuth token requests of the client."""
 
-    @patch("tap_exacttarget.client.datetime")
-    @patch("tap_exacttarget.client.requests.post")
-    def test_access_token_retrieved_and_cached_successfully(self, mock_post, mock_datetime_module):
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeClock()
+        self.client_instance.token_manager = TokenManager(
+            self.client_instance.request_token, clock=self.clock
+        )
+
+    def test_access_token_retrieved_and_cached_successfully(self):
         """Test that access token is retrieved, cached, and expiry time set correctly."""
+        mock_post = self.session_mock("post")
         EXPECTED_TOKEN_EXPIRY_BUFFER = 500
 
-        fixed_time = datetime.now()
-        mock_datetime_module.now.return_value = fixed_time
-
         mock_response = Mock()
         mock_response.json.return_value = {"access_token": "new-token-123", "expires_in": 3600}
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
-        self.client_instance._Client__access_token = None
-        self.client_instance.token_expiry_time = None
-
-        token = self.client_instance.access_token
-
-        assert token == "new-token-123"
-        assert self.client_instance._Client__access_token == "new-token-123"
-
-        expected_expiry = fixed_time + timedelta(seconds=(3600 - EXPECTED_TOKEN_EXPIRY_BUFFER))
-        assert self.client_instance.token_expiry_time == expected_expiry
+        assert self.client_instance.access_token == "new-token-123"
+        assert self.client_instance.access_token == "new-token-123"
 
+        current = self.client_instance.token_manager.current
+        assert current.expires_at == self.clock.now + 3600 - EXPECTED_TOKEN_EXPIRY_BUFFER
+        assert current.refresh_at == current.expires_at - 300
         mock_post.assert_called_once()
 
-    @patch("tap_exacttarget.client.datetime")
-    @patch("tap_exacttarget.client.requests.post")
-    def test_access_token_refreshed_when_expired(self, mock_post, mock_datetime_module):
-        """Test that expired access token triggers refresh."""
-        fixed_time = datetime.now()
-        mock_datetime_module.now.return_value = fixed_time
-
+    def test_access_token_refreshed_when_expired(self):
+        """Test that expired access token is refreshed before it is returned."""
+        mock_post = self.session_mock("post")
+        self.use_token("old-expired-token")
         mock_response = Mock()
         mock_response.json.return_value = {
             "access_token": "refreshed-token-456",
@@ -49,93 +80,48 @@ class TestTokenManagement(BaseClientTest):
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
-        self.client_instance._Client__access_token = "old-expired-token"
-        self.client_instance.token_expiry_time = fixed_time - timedelta(minutes=10)
+        self.clock.now += 3600
 
-        token = self.client_instance.access_token
-
-        assert token == "refreshed-token-456"
-        assert self.client_instance._Client__access_token == "refreshed-token-456"
+        assert self.client_instance.access_token == "refreshed-token-456"
         mock_post.assert_called_once()
 
-    @patch("tap_exacttarget.client.requests.post")
-    def test_access_token_not_refreshed_when_valid(self, mock_post):
+    def test_access_token_not_refreshed_when_valid(self):
         """Test that valid token is reused without API call."""
-        self.client_instance._Client__access_token = "valid-token-789"
-        self.client_instance.token_expiry_time = datetime.now() + timedelta(hours=1)
-
-        token = self.client_instance.access_token
+        mock_post = self.session_mock("post")
+        self.use_token("valid-token-789")
 
-        assert token == "valid-token-789"
+        assert self.client_instance.access_token == "valid-token-789"
 
         mock_post.assert_not_called()
 
-    def test_is_token_expired_returns_true_when_no_token(self):
-        """Test that is_token_expired returns True when token is None."""
-        self.client_instance._Client__access_token = None
-        self.client_instance.token_expiry_time = None
-
-        assert self.client_instance.is_token_expired() is True
-
-    @patch("tap_exacttarget.client.datetime")
-    def test_is_token_expired_returns_false_when_still_valid(self, mock_datetime_module):
-        """Test that is_token_expired returns False for valid token beyond buffer."""
-        fixed_time = datetime.now()
-        mock_datetime_module.now.return_value = fixed_time
-
-        self.client_instance._Client__access_token = "valid-token"
-
-        self.client_instance.token_expiry_time = fixed_time + timedelta(hours=1)
-        assert self.client_instance.is_token_expired() is False
-
-    @patch("tap_exacttarget.client.datetime")
-    def test_token_expiry_buffer_5_minutes(self, mock_datetime_module):
-        """Test that token is considered expired within 5-minute buffer."""
-        fixed_time = datetime.now()
-        mock_datetime_module.now.return_value = fixed_time
-
-        self.client_instance._Client__access_token = "expiring-token"
-        self.client_instance.token_expiry_time = fixed_time + timedelta(minutes=3)
-
-        assert self.client_instance.is_token_expired() is True
-
-    @patch("tap_exacttarget.client.requests.post")
-    def test_access_token_request_handles_http_errors(self, mock_post):
+    def test_access_token_request_handles_http_errors(self):
         """Test that HTTP errors during token request are properly raised."""
+        mock_post = self.session_mock("post")
         mock_post.side_effect = HTTPError("401 Unauthorized")
 
-        self.client_instance._Client__access_token = None
-        self.client_instance.token_expiry_time = None
-
         with self.assertRaises(HTTPError) as exc_info:
             _ = self.client_instance.access_token
 
         assert "401 Unauthorized" in str(exc_info.exception)
 
-    @patch("tap_exacttarget.client.requests.post")
-    def test_access_token_request_raises_exception_on_failure(self, mock_post):
+    def test_access_token_request_raises_exception_on_failure(self):
         """Test that generic exceptions during token request are propagated."""
+        mock_post = self.session_mock("post")
         mock_post.side_effect = RequestException("Network error")
 
-        self.client_instance._Client__access_token = None
-        self.client_instance.token_expiry_time = None
-
         with self.assertRaises(RequestException) as exc_info:
             _ = self.client_instance.access_token
 
         assert "Network error" in str(exc_info.exception)
 
-    @patch("tap_exacttarget.client.requests.post")
-    def test_access_token_request_includes_correct_payload(self, mock_post):
+    def test_access_token_request_includes_correct_payload(self):
         """Test that token request includes correct client credentials."""
+        mock_post = self.session_mock("post")
         mock_response = Mock()
         mock_response.json.return_value = {"access_token": "test-token", "expires_in": 3600}
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
-        self.client_instance._Client__access_token = None
-        self.client_instance.token_expiry_time = None
-
         _ = self.client_instance.access_token
 
         call_kwargs = mock_post.call_args[1]
@@ -144,18 +130,176 @@ class TestTokenManagement(BaseClientTest):
         assert payload["client_secret"] == self.client_instance.client_secret
         assert payload["grant_type"] == "client_credentials"
 
-    @patch("tap_exacttarget.client.requests.post")
-    def test_access_token_request_uses_configured_timeout(self, mock_post):
+    def test_access_token_request_uses_configured_timeout(self):
         """Test that token request uses the configured timeout value."""
+        mock_post = self.session_mock("post")
         mock_response = Mock()
         mock_response.json.return_value = {"access_token": "test-token", "expires_in": 3600}
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
-        self.client_instance._Client__access_token = None
         self.client_instance.timeout = 75
 
         _ = self.client_instance.access_token
 
         call_kwargs = mock_post.call_args[1]
         assert call_kwargs["timeout"] == 75
+
+
+class TestTokenManager(unittest.TestCase):
+    """Tests for the background refresh of the token handed out by `TokenManager`."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def make_manager(self, auth):
+        manager = TokenManager(auth, refresh_ahead=300, clock=self.clock)
+        self.addCleanup(self.join_refresh, manager)
+        return manager
+
+    @staticmethod
+    def join_refresh(manager):
+        if manager.refresh_thread is not None:
+            manager.refresh_thread.join(5)
+
+    def test_valid_token_is_returned_without_the_lock(self):
+        auth = FakeAuth()
+        manager = self.make_manager(auth)
+        self.assertEqual(manager.token, "token-1")
+
+        with manager.refresh_lock:
+            self.assertEqual(manager.token, "token-1")
+        self.assertEqual(auth.calls, 1)
+
+    def test_token_is_refreshed_in_the_background_ahead_of_expiry(self):
+        auth = FakeAuth()
+        manager = self.make_manager(auth)
+        self.assertEqual(manager.token, "token-1")
+        auth.release.clear()
+
+        self.clock.now += 800
+        # the refresh is held up, the current token is still handed out meanwhile
+        self.assertEqual(manager.token, "token-1")
+        self.assertEqual(manager.token, "token-1")
+        auth.release.set()
+        manager.refresh_thread.join(5)
+
+        self.assertEqual(manager.token, "token-2")
+        self.assertEqual(auth.calls, 2)
+        self.assertEqual(manager.current.expires_at, self.clock.now + 1000)
+
+    def test_concurrent_callers_share_one_refresh(self):
+        auth = FakeAuth(hold=True)
+        manager = self.make_manager(auth)
+        tokens = []
+
+        threads = [threading.Thread(target=lambda: tokens.append(manager.token)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        auth.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(tokens, ["token-1"] * 8)
+        self.assertEqual(auth.calls, 1)
+
+    def test_expired_token_waits_for_the_running_refresh(self):
+        auth = FakeAuth()
+        manager = self.make_manager(auth)
+        _ = manager.token
+        auth.release.clear()
+        self.clock.now += 800
+        _ = manager.token
+
+        self.clock.now += 500
+        tokens = []
+        waiter = threading.Thread(target=lambda: tokens.append(manager.token))
+        waiter.start()
+        auth.release.set()
+        waiter.join(5)
+
+        self.assertEqual(tokens, ["token-2"])
+        self.assertEqual(auth.calls, 2)
+
+    def test_failed_background_refresh_keeps_the_token(self):
+        auth = FakeAuth()
+        manager = self.make_manager(auth)
+        _ = manager.token
+        auth.error = RequestException("Network error")
+
+        self.clock.now += 800
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertEqual(manager.token, "token-1")
+            manager.refresh_thread.join(5)
+        self.assertIn("Network error", logs.output[0])
+
+        auth.error = None
+        _ = manager.token
+        manager.refresh_thread.join(5)
+        self.assertEqual(manager.token, "token-3")
+
+    def test_cached_token_never_blocks(self):
+        auth = FakeAuth()
+        manager = self.make_manager(auth)
+        self.assertIsNone(manager.cached_token())
+        _ = manager.token
+
+        self.clock.now += 800
+        self.assertEqual(manager.cached_token(), "token-1")
+        manager.refresh_thread.join(5)
+        self.assertEqual(manager.cached_token(), "token-2")
+
+        self.clock.now += 1000
+        self.assertIsNone(manager.cached_token())
+        self.assertEqual(auth.calls, 2)
+
+    def test_failed_refresh_of_an_expired_token_is_raised(self):
+        auth = FakeAuth()
+        auth.error = RequestException("Network error")
+        manager = self.make_manager(auth)
+
+        with self.assertRaises(RequestException):
+            _ = manager.token
+        self.assertIsNone(manager.current)
+
+
+class TestTokenEndpoint(unittest.TestCase):
+    """Token refreshes of a client against a local stand-in of the token endpoint."""
+
+    def setUp(self):
+        self.route = TokenRoute(expires_in=1080, delay=0.05)
+        self.server = StubServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.routes[("POST", "/v2/token")] = self.route
+
+        self.clock = FakeClock()
+        self.client = make_client()
+        self.client.auth_url = f"{self.server.url}/v2/token"
+        self.client.token_manager.clock = self.clock
+
+    def test_spawned_clients_share_refreshed_tokens(self):
+        with patch("tap_exacttarget.client.client.Client"), patch.object(
+            Client, "refresh_soap_header"
+        ):
+            spawned = [self.client.spawn() for _ in range(4)]
+        tokens = []
+
+        def fetch(client):
+            tokens.append(client.access_token)
+
+        threads = [threading.Thread(target=fetch, args=(client,)) for client in spawned]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(tokens, ["token-1"] * 4)
+        self.assertEqual(len(self.route.payloads), 1)
+
+        # 1080 - 500 seconds of use, refreshed in the last 300
+        self.clock.now += 300
+        self.assertEqual(self.client.access_token, "token-1")
+        self.client.token_manager.refresh_thread.join(5)
+        self.assertEqual(self.client.access_token, "token-2")
+
+        self.assertEqual(len(self.route.payloads), 2)
+        self.assertEqual(self.route.payloads[0]["grant_type"], "client_credentials")
@@ -0,0 +1,160 @@
+import unittest
+from unittest.mock import patch
+
+from tap_exacttarget.batching import MAX_BATCH_SIZE, MIN_BATCH_SIZE, BatchSizeTuner
+from tap_exacttarget.client import Client
+from tap_exacttarget.streams.abstracts import BATCH_SIZE_KEY
+from tap_exacttarget.streams.event_sent import SentEvent
+from tap_exacttarget.streams.subscriber import Subscribers
+from .soap_fixtures import RetrieveRoute, sent_event_rows
+from .stub_server import StubServer
+from .test_async_client import PROPERTIES, make_client
+
+
+class TestBatchSizeTuner(unittest.TestCase):
+    """Tests for the BatchSize adjustments made from measured pages."""
+
+    def test_slow_pages_shrink_in_proportion(self):
+        tuner = BatchSizeTuner("sentevent", 2000, target_seconds=30)
+
+        with self.assertLogs(level="INFO") as logs:
+            tuner.observe(2000, 1000, 40.0)
+
+        self.assertEqual(tuner.batch_size, 1500)
+        self.assertIn("shrinking batch size 2000 -> 1500", logs.output[0])
+
+    def test_shrinking_is_bounded_per_page(self):
+        tuner = BatchSizeTuner("sentevent", 2000, target_seconds=30)
+
+        tuner.observe(2000, 1000, 600.0)
+
+        self.assertEqual(tuner.batch_size, 1000)
+
+    def test_large_pages_shrink_to_max_bytes(self):
+        tuner = BatchSizeTuner("subscribers", 1000, max_bytes=1_000_000)
+
+        tuner.observe(1000, 1_600_000, 1.0)
+
+        self.assertEqual(tuner.batch_size, 600)
+
+    def test_fast_pages_grow_within_api_limit(self):
+        tuner = BatchSizeTuner("sentevent", 500, target_seconds=30)
+
+        tuner.observe(500, 1000, 1.0)
+        self.assertEqual(tuner.batch_size, 1000)
+        tuner.observe(1000, 1000, 1.0)
+        tuner.observe(2000, 1000, 1.0)
+
+        self.assertEqual(tuner.batch_size, MAX_BATCH_SIZE)
+
+    def test_pages_close_to_the_target_keep_the_size(self):
+        tuner = BatchSizeTuner("sentevent", 1000, target_seconds=30)
+
+        tuner.observe(1000, 1000, 27.0)
+
+        self.assertEqual(tuner.batch_size, 1000)
+
+    def test_timeouts_halve_the_size_down_to_the_minimum(self):
+        tuner = BatchSizeTuner("subscribers", 200)
+
+        tuner.timed_out(200)
+        self.assertEqual(tuner.batch_size, 100)
+        tuner.timed_out(100)
+        tuner.timed_out(50)
+
+        self.assertEqual(tuner.batch_size, MIN_BATCH_SIZE)
+
+    def test_initial_size_is_clamped(self):
+        self.assertEqual(BatchSizeTuner("sentevent", 10000).batch_size, MAX_BATCH_SIZE)
+        self.assertEqual(BatchSizeTuner("sentevent", 1234).batch_size, 1200)
+
+
+@patch.object(Client, "access_token", "token")
+class TestStreamBatchSizes(unittest.TestCase):
+    """Tests for per stream BatchSize overrides and their tuning during a sync."""
+
+    def setUp(self):
+        self.rows = sent_event_rows(120)
+        self.route = RetrieveRoute("SentEvent", self.rows, None)
+        self.server = StubServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.routes[("POST", "/Service.asmx")] = self.route
+
+    def fetch(self, client, state=None):
+        stream = SentEvent({}, {}, client)
+        stream.configure_batch_size(state or {})
+        records = [rec for page in stream.paginate(PROPERTIES) for rec in page]
+        return records, stream.write_batch_size(state or {})
+
+    def test_stream_overrides_replace_the_global_batch_size(self):
+        for overrides in ({"sentevent": 40}, '{"sentevent": "40", "subscribers": "bad"}'):
+            client = make_client(self.server.url, batch_size="100", stream_batch_sizes=overrides)
+            SentEvent({}, {}, client).configure_batch_size({})
+            Subscribers({}, {}, client).configure_batch_size({})
+
+            self.assertEqual(client.get_batch_size("SentEvent"), 40)
+            self.assertEqual(client.get_batch_size("Subscriber"), 100)
+            request = client.build_retrieve_request("SentEvent", PROPERTIES)
+            self.assertEqual(request.Options.BatchSize, 40)
+
+    def test_invalid_overrides_are_ignored(self):
+        with self.assertLogs(level="INFO") as logs:
+            client = make_client(self.server.url, stream_batch_sizes="not json")
+
+        self.assertEqual(client.stream_batch_sizes, {})
+        self.assertIn("invalid value received for stream_batch_sizes", "\n".join(logs.output))
+
+    def test_pages_are_resized_and_the_size_is_kept_in_state(self):
+        for raw_retrieve in ("false", "true"):
+            self.route.batch_sizes.clear()
+            client = make_client(
+                self.server.url,
+                batch_size="100",
+                auto_batch_size="true",
+                max_page_bytes="20000",
+                raw_retrieve=raw_retrieve,
+            )
+
+            records, state = self.fetch(client)
+
+            self.assertEqual([rec["SubscriberKey"] for rec in records],
+                             [row["SubscriberKey"] for row in self.rows])
+            # rows take about 400 bytes each, the first full page was too large
+            self.assertEqual(self.route.batch_sizes[0], 100)
+            self.assertLess(self.route.batch_sizes[1], 100)
+            self.assertEqual(
+                state["bookmarks"]["sentevent"][BATCH_SIZE_KEY], client.get_batch_size("SentEvent")
+            )
+
+    def test_next_run_starts_from_the_stored_size(self):
+        client = make_client(self.server.url, batch_size="100", auto_batch_size="true")
+        state = {"bookmarks": {"sentevent": {BATCH_SIZE_KEY: 50}}}
+
+        self.fetch(client, state)
+
+        self.assertEqual(self.route.batch_sizes[0], 50)
+
+    def test_stored_size_is_ignored_without_tuning(self):
+        client = make_client(self.server.url, batch_size="100")
+        state = {"bookmarks": {"sentevent": {BATCH_SIZE_KEY: 50}}}
+
+        _, state = self.fetch(client, state)
+
+        self.assertEqual(self.route.batch_sizes, [100, 100])
+        self.assertEqual(state["bookmarks"]["sentevent"][BATCH_SIZE_KEY], 50)
+
+    def test_pages_are_measured_with_the_rows_received(self):
+        self.server.routes[("POST", "/Service.asmx")] = RetrieveRoute(
+            "SentEvent", self.rows, page_size=40
+        )
+        for raw_retrieve in ("false", "true"):
+            client = make_client(
+                self.server.url, batch_size="100", auto_batch_size="true", raw_retrieve=raw_retrieve
+            )
+            with patch.object(Client, "observe_page") as observe_page:
+                self.fetch(client)
+
+            self.assertEqual(
+                [(call.args[1], call.args[2]) for call in observe_page.call_args_list],
+                [("MoreDataAvailable", 40), ("MoreDataAvailable", 40), ("OK", 40)],
+            )
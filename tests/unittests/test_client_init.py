@@ -8,15 +8,14 @@ from .base_test import BaseClientTest
 class TestClientInitialization(BaseClientTest):
     """Tests for Client initialization and configuration parsing."""
 
-    @patch("tap_exacttarget.client.requests.post")
-    @patch("tap_exacttarget.client.Transport")
+    @patch("tap_exacttarget.client.MeteredTransport")
     @patch("tap_exacttarget.client.Session")
     @patch("tap_exacttarget.client.client.Client")
     def test_init_with_valid_config_creates_client_successfully(
-        self, mock_zeep_client, mock_session, mock_transport, mock_post
+        self, mock_zeep_client, mock_session, mock_transport
     ):
         """Test successful client initialization with valid config."""
-        mock_post.return_value = self.mock_oauth_response
+        mock_session.return_value.post.return_value = self.mock_oauth_response
         mock_soap = MagicMock()
         mock_zeep_client.return_value = mock_soap
 
@@ -29,16 +28,15 @@ class TestClientInitialization(BaseClientTest):
         assert client.client_secret == "test-client-secret"
         assert client.soap_client is not None
 
-    @patch("tap_exacttarget.client.requests.post")
-    @patch("tap_exacttarget.client.Transport")
+    @patch("tap_exacttarget.client.MeteredTransport")
     @patch("tap_exacttarget.client.Session")
     @patch("tap_exacttarget.client.client.Client")
     @patch("tap_exacttarget.client.LOGGER")
     def test_invalid_batch_size_defaults_to_default_value(
-        self, mock_logger, mock_zeep_client, mock_session, mock_transport, mock_post
+        self, mock_logger, mock_zeep_client, mock_session, mock_transport
     ):
         """Test client initialization with invalid batch_size falls back to default."""
-        mock_post.return_value = self.mock_oauth_response
+        mock_session.return_value.post.return_value = self.mock_oauth_response
         mock_zeep_client.return_value = MagicMock()
 
         self.mock_config["batch_size"] = "not-a-number"
@@ -48,19 +46,20 @@ class TestClientInitialization(BaseClientTest):
 
         assert client.batch_size == DEFAULT_BATCH_SIZE
         mock_logger.info.assert_any_call(
-            "invalid value received for batch_size, fallback to default %s", DEFAULT_BATCH_SIZE
+            "invalid value received for %s, fallback to default %s",
+            "batch_size",
+            DEFAULT_BATCH_SIZE,
         )
 
-    @patch("tap_exacttarget.client.requests.post")
-    @patch("tap_exacttarget.client.Transport")
+    @patch("tap_exacttarget.client.MeteredTransport")
     @patch("tap_exacttarget.client.Session")
     @patch("tap_exacttarget.client.client.Client")
     @patch("tap_exacttarget.client.LOGGER")
     def test_invalid_date_window_defaults_to_default_value(
-        self, mock_logger, mock_zeep_client, mock_session, mock_transport, mock_post
+        self, mock_logger, mock_zeep_client, mock_session, mock_transport
     ):
         """Test client initialization with invalid date_window falls back to default."""
-        mock_post.return_value = self.mock_oauth_response
+        mock_session.return_value.post.return_value = self.mock_oauth_response
         mock_zeep_client.return_value = MagicMock()
 
         self.mock_config["date_window"] = "not-a-number"
@@ -70,18 +69,19 @@ class TestClientInitialization(BaseClientTest):
         assert client.date_window == DEFAULT_DATE_WINDOW
 
         mock_logger.info.assert_any_call(
-            "invalid value received for date_window, fallback to default %s", DEFAULT_DATE_WINDOW
+            "invalid value received for %s, fallback to default %s",
+            "date_window",
+            DEFAULT_DATE_WINDOW,
         )
 
-    @patch("tap_exacttarget.client.requests.post")
-    @patch("tap_exacttarget.client.Transport")
+    @patch("tap_exacttarget.client.MeteredTransport")
     @patch("tap_exacttarget.client.Session")
     @patch("tap_exacttarget.client.client.Client")
     def test_missing_optional_config_uses_defaults(
-        self, mock_zeep_client, mock_session, mock_transport, mock_post
+        self, mock_zeep_client, mock_session, mock_transport
     ):
         """Test that missing optional config values use defaults."""
-        mock_post.return_value = self.mock_oauth_response
+        mock_session.return_value.post.return_value = self.mock_oauth_response
         mock_zeep_client.return_value = MagicMock()
 
         del self.mock_config["request_timeout"]
@@ -94,15 +94,14 @@ class TestClientInitialization(BaseClientTest):
         assert client.date_window == DEFAULT_DATE_WINDOW
         assert client.batch_size == DEFAULT_BATCH_SIZE
 
-    @patch("tap_exacttarget.client.requests.post")
-    @patch("tap_exacttarget.client.Transport")
+    @patch("tap_exacttarget.client.MeteredTransport")
     @patch("tap_exacttarget.client.Session")
     @patch("tap_exacttarget.client.client.Client")
     def test_wsdl_and_auth_urls_are_constructed_correctly(
-        self, mock_zeep_client, mock_session, mock_transport, mock_post
+        self, mock_zeep_client, mock_session, mock_transport
     ):
         """Test that WSDL and auth URLs are constructed correctly from subdomain."""
-        mock_post.return_value = self.mock_oauth_response
+        mock_session.return_value.post.return_value = self.mock_oauth_response
         mock_zeep_client.return_value = MagicMock()
 
         client = Client(self.mock_config)
@@ -113,15 +112,14 @@ class TestClientInitialization(BaseClientTest):
         assert client.auth_url == "https://test-subdomain.auth.marketingcloudapis.com/v2/token"
         assert client.rest_url == "https://test-subdomain.rest.marketingcloudapis.com/"
 
-    @patch("tap_exacttarget.client.requests.post")
-    @patch("tap_exacttarget.client.Transport")
+    @patch("tap_exacttarget.client.MeteredTransport")
     @patch("tap_exacttarget.client.Session")
     @patch("tap_exacttarget.client.client.Client")
     def test_initialize_soap_client_called_during_init(
-        self, mock_zeep_client, mock_session, mock_transport, mock_post
+        self, mock_zeep_client, mock_session, mock_transport
     ):
         """Test that SOAP client initialization is called with correct parameters."""
-        mock_post.return_value = self.mock_oauth_response
+        mock_session.return_value.post.return_value = self.mock_oauth_response
         mock_soap = MagicMock()
         mock_zeep_client.return_value = mock_soap
 
@@ -133,15 +131,14 @@ class TestClientInitialization(BaseClientTest):
         assert call_kwargs["wsdl"] == client.wsdl_uri
         assert "transport" in call_kwargs
 
-    @patch("tap_exacttarget.client.requests.post")
-    @patch("tap_exacttarget.client.Transport")
+    @patch("tap_exacttarget.client.MeteredTransport")
     @patch("tap_exacttarget.client.Session")
     @patch("tap_exacttarget.client.client.Client")
     def test_default_soap_headers_are_set_after_initialization(
-        self, mock_zeep_client, mock_session, mock_transport, mock_post
+        self, mock_zeep_client, mock_session, mock_transport
     ):
         """Test that default SOAP headers with OAuth token are set."""
-        mock_post.return_value = self.mock_oauth_response
+        mock_session.return_value.post.return_value = self.mock_oauth_response
         mock_soap = MagicMock()
         mock_zeep_client.return_value = mock_soap
 
@@ -151,15 +148,14 @@ class TestClientInitialization(BaseClientTest):
         call_args = mock_soap.set_default_soapheaders.call_args[0][0]
         assert len(call_args) == 1
 
-    @patch("tap_exacttarget.client.requests.post")
-    @patch("tap_exacttarget.client.Transport")
+    @patch("tap_exacttarget.client.MeteredTransport")
     @patch("tap_exacttarget.client.Session")
     @patch("tap_exacttarget.client.client.Client")
     def test_timeout_parsed_correctly_from_config(
-        self, mock_zeep_client, mock_session, mock_transport, mock_post
+        self, mock_zeep_client, mock_session, mock_transport
     ):
         """Test that timeout value is correctly parsed as integer from string config."""
-        mock_post.return_value = self.mock_oauth_response
+        mock_session.return_value.post.return_value = self.mock_oauth_response
         mock_zeep_client.return_value = MagicMock()
 
         self.mock_config["request_timeout"] = "120"
@@ -168,15 +164,14 @@ class TestClientInitialization(BaseClientTest):
         assert client.timeout == 120
         assert isinstance(client.timeout, int)
 
-    @patch("tap_exacttarget.client.requests.post")
-    @patch("tap_exacttarget.client.Transport")
+    @patch("tap_exacttarget.client.MeteredTransport")
     @patch("tap_exacttarget.client.Session")
     @patch("tap_exacttarget.client.client.Client")
     def test_transport_initialized_with_correct_timeouts(
-        self, mock_zeep_client, mock_session_class, mock_transport_class, mock_post
+        self, mock_zeep_client, mock_session_class, mock_transport_class
     ):
         """Test that Transport is initialized with correct timeout values."""
-        mock_post.return_value = self.mock_oauth_response
+        mock_session_class.return_value.post.return_value = self.mock_oauth_response
         mock_zeep_client.return_value = MagicMock()
 
         Client(self.mock_config)
@@ -190,3 +185,25 @@ class TestClientInitialization(BaseClientTest):
         """Test that __enter__ returns the client instance."""
         result = self.client_instance.__enter__()
         assert result is self.client_instance
+
+    @patch("tap_exacttarget.client.MeteredTransport")
+    @patch("tap_exacttarget.client.client.Client")
+    def test_spawn_reuses_parsed_wsdl_with_new_session(self, mock_zeep_client, mock_transport):
+        """Test that a spawned client shares the WSDL document but not the transport."""
+        spawned_soap = MagicMock()
+        mock_zeep_client.return_value = spawned_soap
+
+        spawned = self.client_instance.spawn()
+
+        mock_zeep_client.assert_called_once_with(
+            wsdl=self.mock_soap_client.wsdl, transport=mock_transport.return_value
+        )
+        assert spawned.soap_client is spawned_soap
+        assert self.client_instance.soap_client is self.mock_soap_client
+        assert spawned.config is self.client_instance.config
+        spawned_soap.set_default_soapheaders.assert_called_once()
+
+    def test_invalid_window_concurrency_defaults_to_serial(self):
+        """Test that an invalid window_concurrency falls back to serial windows."""
+        self.mock_config["window_concurrency"] = "many"
+        assert Client(self.mock_config).window_concurrency == 1
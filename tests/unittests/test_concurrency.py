@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+
+from tap_exacttarget.concurrency import BoundedPool, prefetch
+
+
+class TestBoundedPool(unittest.TestCase):
+    """Tests for the ordered, bounded thread pool used for child fetches."""
+
+    def test_results_are_handled_in_submission_order_on_caller_thread(self):
+        results, threads = [], set()
+
+        def handle(result):
+            threads.add(threading.get_ident())
+            results.append(result)
+
+        pool = BoundedPool(4, handle)
+        for idx in range(10):
+            # later calls finish first
+            pool.submit(lambda idx=idx: time.sleep(0.002 * (10 - idx)) or idx)
+        pool.drain()
+        pool.shutdown()
+
+        self.assertEqual(results, list(range(10)))
+        self.assertEqual(threads, {threading.get_ident()})
+
+    def test_submit_blocks_once_max_pending_is_reached(self):
+        release = threading.Event()
+        results = []
+        pool = BoundedPool(2, results.append, max_pending=2)
+
+        pool.submit(release.wait)
+        pool.submit(lambda: "second")
+        self.assertEqual(results, [])
+
+        threading.Timer(0.05, release.set).start()
+        pool.submit(lambda: "third")
+
+        # the oldest call had to complete before the third one was accepted
+        self.assertEqual(results[:2], [True, "second"])
+        self.assertLessEqual(len(pool.pending), 2)
+        pool.shutdown()
+
+    def test_errors_are_raised_on_caller_thread(self):
+        def failing():
+            raise RuntimeError("soap failure")
+
+        pool = BoundedPool(2, lambda result: None)
+
+        with self.assertRaises(RuntimeError):
+            pool.submit(failing)
+            pool.drain()
+        pool.shutdown()
+
+
+class TestPrefetch(unittest.TestCase):
+    """Tests for the background read-ahead used to prefetch Retrieve pages."""
+
+    def test_items_are_produced_on_another_thread_in_order(self):
+        threads = set()
+
+        def produce():
+            for idx in range(5):
+                threads.add(threading.get_ident())
+                yield idx
+
+        self.assertEqual(list(prefetch(produce, 2)), [0, 1, 2, 3, 4])
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_producer_runs_at_most_buffer_size_items_ahead(self):
+        produced = []
+
+        def produce():
+            for idx in range(10):
+                produced.append(idx)
+                yield idx
+
+        items = prefetch(produce, 2)
+        self.assertEqual(next(items), 0)
+        time.sleep(0.05)
+
+        # 2 items buffered, 1 more waiting to be queued
+        self.assertEqual(produced, [0, 1, 2, 3])
+        items.close()
+
+    def test_errors_are_raised_after_the_items_before_them(self):
+        def produce():
+            yield 1
+            raise RuntimeError("soap failure")
+
+        items = prefetch(produce, 2)
+
+        self.assertEqual(next(items), 1)
+        with self.assertRaises(RuntimeError):
+            next(items)
+
+    def test_producer_stops_when_caller_stops(self):
+        produced = []
+
+        def produce():
+            for idx in range(1000):
+                produced.append(idx)
+                yield idx
+
+        items = prefetch(produce, 1)
+        next(items)
+        items.close()
+        stopped_at = len(produced)
+        time.sleep(0.05)
+
+        self.assertEqual(len(produced), stopped_at)
+        self.assertLess(stopped_at, 10)
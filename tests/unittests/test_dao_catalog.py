@@ -0,0 +1,333 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from singer import metadata
+from singer.catalog import Catalog
+
+from tap_exacttarget.cache import DataExtensionCache
+from tap_exacttarget import discover_dataextensionobj
+from tap_exacttarget.discover import discover
+from tap_exacttarget.exceptions import MarketingCloudError
+from tap_exacttarget.discover_dataextensionobj import (
+    discover_dao_definitions,
+    discover_dao_streams,
+    load_dao_streams,
+)
+from tap_exacttarget.streams import STREAMS, DataExtensionObjectFt, DataExtensionObjectInc
+from .stub_client import StubClient
+
+STREAM_ATTRIBUTES = (
+    "stream",
+    "tap_stream_id",
+    "object_ref",
+    "key_properties",
+    "replication_key",
+    "valid_replication_keys",
+    "schema",
+    "customer_key",
+    "category_id",
+)
+
+
+def make_account():
+    fields = [
+        {"Name": "Email", "IsPrimaryKey": True, "FieldType": "EmailAddress", "ext": "de-1"},
+        {"Name": "ModifiedDate", "IsPrimaryKey": False, "FieldType": "Date", "ext": "de-1"},
+        {"Name": "Score", "IsPrimaryKey": False, "FieldType": "Decimal", "ext": "de-1"},
+        {"Name": "Code", "IsPrimaryKey": True, "FieldType": "Text", "ext": "de-2"},
+    ]
+    return {
+        "DataExtensionField": [
+            dict(field, DataExtension={"CustomerKey": field.pop("ext")}) for field in fields
+        ],
+        "DataExtension": [
+            {"CustomerKey": "de-1", "Name": "Newsletter Signups", "CategoryID": 11},
+            {"CustomerKey": "de-2", "Name": "Coupons", "CategoryID": 12},
+        ],
+    }
+
+
+def make_catalog(streams, drop_root_keys=()):
+    entries = []
+    for stream in streams.values():
+        stream_metadata = metadata.to_map(stream.get_metadata(stream.schema))
+        stream_metadata[()]["selected"] = True
+        for key in drop_root_keys:
+            stream_metadata[()].pop(key)
+        entries.append(
+            {
+                "stream": stream.stream,
+                "tap_stream_id": stream.tap_stream_id,
+                "schema": stream.schema,
+                "metadata": metadata.to_list(stream_metadata),
+            }
+        )
+    return Catalog.from_dict({"streams": entries})
+
+
+class TestDaoStreamsFromCatalog(unittest.TestCase):
+    """Tests for rebuilding DataExtension stream classes from the catalog during sync."""
+
+    def setUp(self):
+        self.discovered = discover_dao_streams(StubClient(make_account(), page_size=2))
+
+    def sync_client(self, **kwargs):
+        return StubClient(make_account(), page_size=2, **kwargs)
+
+    def test_discovery_writes_identifiers_to_root_metadata(self):
+        stream = self.discovered["data_extension_newsletter signups"]
+        root = metadata.to_map(stream.get_metadata(stream.schema))[()]
+
+        self.assertEqual(root["customer-key"], "de-1")
+        self.assertEqual(root["object-name"], "Newsletter Signups")
+        self.assertEqual(root["category-id"], 11)
+
+    def test_streams_are_rebuilt_without_discovery(self):
+        client = self.sync_client()
+
+        streams = load_dao_streams(client, make_catalog(self.discovered).streams)
+
+        self.assertEqual(client.retrieve_calls, [])
+        self.assertEqual(set(streams), set(self.discovered))
+        for stream_id, stream in streams.items():
+            for attribute in STREAM_ATTRIBUTES:
+                self.assertEqual(
+                    getattr(stream, attribute), getattr(self.discovered[stream_id], attribute)
+                )
+        self.assertTrue(
+            issubclass(streams["data_extension_newsletter signups"], DataExtensionObjectInc)
+        )
+        self.assertTrue(issubclass(streams["data_extension_coupons"], DataExtensionObjectFt))
+
+    def test_static_streams_are_skipped(self):
+        catalog = Catalog.from_dict(
+            {
+                "streams": [
+                    {"stream": "list", "tap_stream_id": "list", "schema": {}, "metadata": []}
+                ]
+            }
+        )
+        client = self.sync_client()
+
+        self.assertEqual(load_dao_streams(client, catalog.streams), {})
+        self.assertEqual(client.retrieve_calls, [])
+
+    def test_catalog_without_identifiers_falls_back_to_discovery(self):
+        client = self.sync_client()
+        catalog = make_catalog(self.discovered, drop_root_keys=("customer-key",))
+
+        streams = load_dao_streams(client, catalog.streams)
+
+        self.assertEqual(set(streams), set(self.discovered))
+        self.assertEqual(
+            {object_type for object_type, _, _ in client.retrieve_calls},
+            {"DataExtensionField", "DataExtension"},
+        )
+
+    def test_fallback_only_discovers_missing_streams(self):
+        client = self.sync_client()
+        catalog = make_catalog(self.discovered)
+        # an older catalog entry only missing the name still knows its CustomerKey
+        coupons = metadata.to_map(catalog.get_stream("data_extension_coupons").metadata)
+        coupons[()].pop("object-name")
+        catalog.get_stream("data_extension_coupons").metadata = metadata.to_list(coupons)
+
+        streams = load_dao_streams(client, catalog.streams)
+
+        self.assertEqual(
+            streams["data_extension_coupons"].schema,
+            self.discovered["data_extension_coupons"].schema,
+        )
+        self.assertEqual(
+            [(object_type, filter_) for object_type, _, filter_ in client.retrieve_calls],
+            [
+                ("DataExtensionField", ("simple", "DataExtension.CustomerKey", "equals", "de-2")),
+                ("DataExtension", ("simple", "CustomerKey", "equals", "de-2")),
+            ],
+        )
+
+    def test_fallback_finds_keys_of_streams_without_identifiers(self):
+        client = self.sync_client()
+        catalog = make_catalog(self.discovered, drop_root_keys=("customer-key",))
+
+        streams = load_dao_streams(client, [catalog.get_stream("data_extension_coupons")])
+
+        self.assertEqual(list(streams), ["data_extension_coupons"])
+        field_filters = [
+            search_filter for object_type, _, search_filter in client.retrieve_calls
+            if object_type == "DataExtensionField"
+        ]
+        self.assertEqual(
+            field_filters, [("simple", "DataExtension.CustomerKey", "equals", "de-2")]
+        )
+
+
+class TestScopedDiscovery(unittest.TestCase):
+    """Tests for discovering only the DataExtensions of given CustomerKeys."""
+
+    def make_account(self, count):
+        account = {"DataExtensionField": [], "DataExtension": []}
+        for idx in range(count):
+            account["DataExtension"].append(
+                {"CustomerKey": f"de-{idx}", "Name": f"Table {idx}", "CategoryID": idx}
+            )
+            account["DataExtensionField"].append(
+                {
+                    "Name": "ModifiedDate",
+                    "IsPrimaryKey": False,
+                    "FieldType": "Date",
+                    "DataExtension": {"CustomerKey": f"de-{idx}"},
+                }
+            )
+        return account
+
+    def test_scoped_definitions_match_full_discovery(self):
+        account = self.make_account(5)
+        full = discover_dao_definitions(StubClient(account, page_size=2))
+
+        scoped = discover_dao_definitions(StubClient(account, page_size=2), ["de-1", "de-3"])
+
+        self.assertEqual(set(scoped), {"data_extension_table 1", "data_extension_table 3"})
+        for stream_id, definition in scoped.items():
+            self.assertEqual(definition, full[stream_id])
+
+    @patch.object(discover_dataextensionobj, "DISCOVERY_KEY_CHUNK_SIZE", 3)
+    def test_customer_keys_are_filtered_in_chunks(self):
+        client = StubClient(self.make_account(10), page_size=100)
+        keys = [f"de-{idx}" for idx in (7, 1, 4, 2, 9, 1)]
+
+        definitions = discover_dao_definitions(client, keys)
+
+        self.assertEqual(len(definitions), 5)
+        self.assertEqual(
+            [search_filter for _, _, search_filter in client.retrieve_calls],
+            [
+                ("simple", "DataExtension.CustomerKey", "IN", ["de-1", "de-2", "de-4"]),
+                ("simple", "DataExtension.CustomerKey", "IN", ["de-7", "de-9"]),
+                ("simple", "CustomerKey", "IN", ["de-1", "de-2", "de-4"]),
+                ("simple", "CustomerKey", "IN", ["de-7", "de-9"]),
+            ],
+        )
+
+    def test_scoped_fields_follow_continuations(self):
+        client = StubClient(self.make_account(6), page_size=1)
+
+        definitions = discover_dao_definitions(client, ["de-0", "de-2", "de-5"])
+
+        self.assertEqual(len(definitions), 3)
+        self.assertEqual(
+            [request_id for object_type, request_id, _ in client.retrieve_calls
+             if object_type == "DataExtensionField"],
+            [None, "req-1", "req-2"],
+        )
+
+
+class RendezvousClient(StubClient):
+    """Stub whose first DataExtensionField and DataExtension calls wait for each other, so
+    discovery only completes if both chains are paged at the same time."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def retrieve_request(self, object_type, properties, request_id=None, search_filter=None):
+        if request_id is None:
+            self.barrier.wait()
+        return super().retrieve_request(object_type, properties, request_id, search_filter)
+
+
+class TestConcurrentDiscovery(unittest.TestCase):
+    """Tests for paging DataExtensionFields and DataExtensions at the same time."""
+
+    def test_chains_are_paged_concurrently(self):
+        client = RendezvousClient(make_account(), page_size=1)
+
+        streams = discover_dao_streams(client, concurrent=True)
+
+        self.assertEqual(
+            {stream_id: stream.schema for stream_id, stream in streams.items()},
+            {
+                stream_id: stream.schema
+                for stream_id, stream in discover_dao_streams(
+                    StubClient(make_account(), page_size=1)
+                ).items()
+            },
+        )
+        self.assertEqual(client.spawned, 1)
+
+    def test_discover_logs_phase_timings(self):
+        client = RendezvousClient(make_account(), page_size=2)
+
+        with self.assertLogs(level="INFO") as logs:
+            catalog = discover(client)
+
+        self.assertEqual(
+            {entry.tap_stream_id for entry in catalog.streams},
+            {stream.tap_stream_id for stream in STREAMS.values()}
+            | {"data_extension_newsletter signups", "data_extension_coupons"},
+        )
+        for phase in ("DataExtensionField", "DataExtension", "static schemas"):
+            self.assertTrue(
+                any(f"Discovery phase {phase} took" in line for line in logs.output), phase
+            )
+
+    def test_field_chain_errors_are_raised(self):
+        client = StubClient(make_account(), page_size=2)
+        retrieve_request = client.retrieve_request
+
+        def failing_fields(object_type, *args, **kwargs):
+            if object_type == "DataExtensionField":
+                raise MarketingCloudError("Error: fields unavailable")
+            return retrieve_request(object_type, *args, **kwargs)
+
+        client.retrieve_request = failing_fields
+
+        with self.assertRaises(MarketingCloudError):
+            discover_dao_streams(client, concurrent=True)
+
+
+class TestDaoDefinitionCache(unittest.TestCase):
+    """Tests for the on-disk cache of DataExtension definitions."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+
+    def make_client(self):
+        client = StubClient(make_account(), page_size=2)
+        client.wsdl_uri = "https://tenant.soap.marketingcloudapis.com/etframework.wsdl"
+        client.dao_cache = DataExtensionCache(self.cache_dir)
+        return client
+
+    def test_fallback_uses_cache_written_by_discovery(self):
+        discovered = discover_dao_streams(self.make_client())
+        catalog = make_catalog(discovered, drop_root_keys=("object-name",))
+        client = self.make_client()
+
+        streams = load_dao_streams(client, catalog.streams)
+
+        self.assertEqual(client.retrieve_calls, [])
+        self.assertEqual(
+            streams["data_extension_coupons"].schema,
+            discovered["data_extension_coupons"].schema,
+        )
+
+    def test_stream_missing_from_cache_triggers_discovery(self):
+        account = make_account()
+        account["DataExtension"] = account["DataExtension"][:1]
+        client = StubClient(account, page_size=2)
+        client.wsdl_uri = "https://tenant.soap.marketingcloudapis.com/etframework.wsdl"
+        client.dao_cache = DataExtensionCache(self.cache_dir)
+        discover_dao_streams(client)
+
+        full_account = discover_dao_streams(StubClient(make_account(), page_size=2))
+        catalog = make_catalog(full_account, drop_root_keys=("object-name",))
+        client = self.make_client()
+
+        streams = load_dao_streams(client, catalog.streams)
+
+        self.assertIn("data_extension_coupons", streams)
+        self.assertTrue(client.retrieve_calls)
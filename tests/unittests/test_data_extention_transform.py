@@ -1,6 +1,10 @@
 import unittest
 from unittest.mock import patch
-from tap_exacttarget.streams.dataextensionobjects import DataExtensionObjectBase
+from tap_exacttarget.streams.dataextensionobjects import (
+    DataExtensionObjectBase,
+    compile_converters,
+    to_boolean,
+)
 
 
 class TestDataExtensionObjectTransform(unittest.TestCase):
@@ -130,3 +134,43 @@ class TestDataExtensionObjectTransform(unittest.TestCase):
         result = self.obj.transform_record(obj)
         self.assertIn("CategoryID", result)
         self.assertEqual(result["CategoryID"], 999)
+
+    def test_transform_none_numbers_are_kept(self):
+        """Should keep None for integer, number and boolean fields instead of converting."""
+        obj = {
+            "Properties": {
+                "Property": [
+                    {"Name": "Id", "Value": None},
+                    {"Name": "Price", "Value": None},
+                    {"Name": "IsActive", "Value": None},
+                ]
+            }
+        }
+
+        result = self.obj.transform_record(obj)
+        self.assertEqual(result, {"Id": None, "Price": None, "IsActive": None, "CategoryID": 999})
+
+    def test_converters_compiled_once_per_schema(self):
+        """Should compile the converter table once and again after the schema changes."""
+        obj = {"Properties": {"Property": [{"Name": "Id", "Value": "7"}]}}
+
+        with patch(
+            "tap_exacttarget.streams.dataextensionobjects.compile_converters",
+            wraps=compile_converters,
+        ) as mock_compile:
+            for _ in range(3):
+                self.assertEqual(self.obj.transform_record(obj)["Id"], 7)
+            self.assertEqual(mock_compile.call_count, 1)
+
+            self.obj.schema = {"properties": {"Id": {"type": ["null", "string"]}}}
+            self.assertEqual(self.obj.transform_record(obj)["Id"], "7")
+            self.assertEqual(mock_compile.call_count, 2)
+
+    def test_compile_converters(self):
+        """Should only map fields needing a conversion."""
+        converters = compile_converters(self.obj.schema)
+
+        self.assertEqual(
+            converters,
+            {"Id": int, "Price": float, "IsActive": to_boolean, "CategoryID": int},
+        )
@@ -0,0 +1,108 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tap_exacttarget.cache import DescribeCache
+from tap_exacttarget.client import Client
+from .base_test import BaseClientTest
+
+
+def describe_response(*fields, not_retrievable=()):
+    properties = [{"Name": name, "IsRetrievable": True} for name in fields]
+    properties += [{"Name": name, "IsRetrievable": False} for name in not_retrievable]
+    return {"ObjectDefinition": [{"Properties": properties}]}
+
+
+class TestDescribeCache(unittest.TestCase):
+    """Tests for the on-disk cache of Describe results."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = DescribeCache(self.cache_dir, ttl=60)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_fields_round_trip(self):
+        self.cache.add_fields("tenant#Subscriber", ("ID", "SubscriberKey"))
+
+        self.assertEqual(self.cache.get_fields("tenant#Subscriber"), ["ID", "SubscriberKey"])
+        self.assertIsNone(self.cache.get_fields("tenant#List"))
+
+    @patch("tap_exacttarget.cache.time.time")
+    def test_expired_fields_are_a_miss(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.add_fields("tenant#Subscriber", ["ID"])
+        mock_time.return_value = 1061
+
+        self.assertIsNone(self.cache.get_fields("tenant#Subscriber"))
+
+
+class TestRetrievableFields(BaseClientTest):
+    """Tests for the Describe memoization of `Client.get_retrievable_fields`."""
+
+    def setUp(self):
+        super().setUp()
+        self.mock_soap_client.service.Describe.return_value = describe_response(
+            "ID", "SubscriberKey", not_retrievable=("Password",)
+        )
+
+    def test_each_object_type_is_described_once(self):
+        for _ in range(5):
+            fields = self.client_instance.get_retrievable_fields("Subscriber")
+
+        self.assertEqual(fields, ["ID", "SubscriberKey"])
+        self.assertEqual(self.mock_soap_client.service.Describe.call_count, 1)
+        self.assertEqual(self.client_instance.describe_stats["requests"], 1)
+        self.assertEqual(self.client_instance.describe_stats["memoized"], 4)
+
+        self.client_instance.get_retrievable_fields("List")
+        self.assertEqual(self.mock_soap_client.service.Describe.call_count, 2)
+
+    def test_spawned_clients_share_memoized_fields(self):
+        self.client_instance.get_retrievable_fields("Subscriber")
+        spawned = self.client_instance.spawn()
+
+        spawned.get_retrievable_fields("Subscriber")
+
+        self.assertEqual(self.mock_soap_client.service.Describe.call_count, 1)
+        self.assertEqual(self.client_instance.describe_stats["memoized"], 1)
+
+    def test_disk_cache_is_used_across_runs(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        config = dict(self.mock_config, describe_cache_dir=cache_dir)
+
+        Client(config).get_retrievable_fields("Subscriber")
+        next_run = Client(config)
+        fields = next_run.get_retrievable_fields("Subscriber")
+
+        self.assertEqual(fields, ["ID", "SubscriberKey"])
+        self.assertEqual(self.mock_soap_client.service.Describe.call_count, 1)
+        self.assertEqual(next_run.describe_stats["disk_cache"], 1)
+
+    def test_disk_cache_is_keyed_by_tenant(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+
+        Client(dict(self.mock_config, describe_cache_dir=cache_dir)).get_retrievable_fields(
+            "Subscriber"
+        )
+        Client(
+            dict(self.mock_config, describe_cache_dir=cache_dir, tenant_subdomain="other")
+        ).get_retrievable_fields("Subscriber")
+
+        self.assertEqual(self.mock_soap_client.service.Describe.call_count, 2)
+
+    def test_stats_are_logged(self):
+        self.client_instance.get_retrievable_fields("Subscriber")
+        self.client_instance.get_retrievable_fields("Subscriber")
+
+        with self.assertLogs(level="INFO") as logs:
+            self.client_instance.log_describe_stats()
+
+        self.assertIn(
+            "Describe calls: 1 requests, 1 served from memory, 0 from the disk cache",
+            logs.output[0],
+        )
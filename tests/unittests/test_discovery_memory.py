@@ -0,0 +1,87 @@
+import tracemalloc
+import unittest
+
+from tap_exacttarget.discover_dataextensionobj import discover_fields, retrieve_pages
+
+EXTENSIONS = 200
+FIELDS_PER_EXTENSION = 250
+PAGE_SIZE = 2500
+
+
+class GeneratedFieldPages:
+    """Client serving freshly built DataExtensionField rows, like deserialized SOAP pages.
+
+    Rows carry the attributes the API returns besides the ones discovery reads, so the raw
+    response volume is well above the size of the resulting schemas.
+    """
+
+    def __init__(self, extensions, fields, page_size):
+        self.total = extensions * fields
+        self.fields = fields
+        self.page_size = page_size
+
+    def row(self, idx):
+        extension = idx // self.fields
+        return {
+            "ObjectID": f"{idx:08d}-0000-4000-8000-{extension:012d}",
+            "CustomerKey": f"de-{extension}-field-{idx}",
+            "Name": f"Column{idx % self.fields}",
+            "FieldType": "Text",
+            "IsPrimaryKey": idx % self.fields == 0,
+            "IsRequired": False,
+            "MaxLength": 254,
+            "Scale": 0,
+            "Ordinal": idx % self.fields,
+            "DefaultValue": "",
+            "Description": f"Generated column {idx}",
+            "CreatedDate": "2024-01-01T00:00:00",
+            "ModifiedDate": "2024-01-01T00:00:00",
+            "Client": {"ID": 12345, "EnterpriseID": 1},
+            "DataExtension": {"CustomerKey": f"de-{extension}"},
+        }
+
+    def retrieve_request(self, object_type, properties, request_id=None):
+        start = int(request_id or 0)
+        end = min(start + self.page_size, self.total)
+        return {
+            "OverallStatus": "MoreDataAvailable" if end < self.total else "OK",
+            "RequestID": str(end),
+            "Results": [self.row(idx) for idx in range(start, end)],
+        }
+
+
+def traced(func, *args):
+    """Returns the result of `func`, the memory it still holds and its peak, in bytes."""
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
+
+
+class TestDiscoverFieldsMemory(unittest.TestCase):
+    """Peak memory of field discovery follows the schemas, not the retrieved pages."""
+
+    def make_client(self):
+        return GeneratedFieldPages(EXTENSIONS, FIELDS_PER_EXTENSION, PAGE_SIZE)
+
+    def test_peak_memory_follows_schemas(self):
+        field_info, schema_bytes, peak_bytes = traced(discover_fields, self.make_client())
+
+        def all_pages(client):
+            return [page["Results"] for page in retrieve_pages(client, "DataExtensionField", [])]
+
+        pages, raw_bytes, _ = traced(all_pages, self.make_client())
+
+        self.assertEqual(len(field_info), EXTENSIONS)
+        self.assertEqual(sum(len(page) for page in pages), EXTENSIONS * FIELDS_PER_EXTENSION)
+        page_bytes = raw_bytes / len(pages)
+        summary = (
+            f"peak {peak_bytes / 1e6:.1f} MB, schemas {schema_bytes / 1e6:.1f} MB, "
+            f"all pages {raw_bytes / 1e6:.1f} MB"
+        )
+        # beyond the schemas, at most the page being folded and the one being fetched
+        self.assertLess(peak_bytes - schema_bytes, 3 * page_bytes, summary)
+        self.assertLess(peak_bytes, raw_bytes / 2, summary)
@@ -0,0 +1,167 @@
+import unittest
+
+from singer import metadata
+
+from tap_exacttarget.exceptions import IncompatibleFieldSelectionError
+from tap_exacttarget.streams.email import Email
+from tap_exacttarget.streams.send import Sends
+from .stub_client import StubClient
+
+SEND_FIELDS = [
+    "Client.ID", "CreatedDate", "ModifiedDate", "ID", "Email.ID", "SendDate", "FromAddress",
+    "FromName", "Duplicates", "HardBounces", "Subject", "EmailName", "Status",
+]
+SEND_SCHEMA = {
+    "properties": {
+        field: {"type": ["null", "string"]}
+        for field in ("ID", "ModifiedDate", "CreatedDate", "EmailID", "SendDate", "FromAddress",
+                      "FromName", "Duplicates", "HardBounces", "Subject", "EmailName", "Status")
+    }
+}
+
+
+def select_fields(schema, key_properties, replication_key, selected):
+    stream_metadata = metadata.to_map(
+        metadata.get_standard_metadata(
+            schema=schema, key_properties=key_properties, valid_replication_keys=[replication_key]
+        )
+    )
+    stream_metadata = metadata.write(
+        stream_metadata, ("properties", replication_key), "inclusion", "automatic"
+    )
+    for field in schema["properties"]:
+        stream_metadata = metadata.write(
+            stream_metadata, ("properties", field), "selected", field in selected
+        )
+    return stream_metadata
+
+
+class ProjectingClient(StubClient):
+    """Stub account describing `fields` and returning only the requested properties.
+
+    Retrieve calls requesting exactly `refused` fields fail like an invalid field selection.
+    """
+
+    def __init__(self, records, fields, refused=None, **kwargs):
+        super().__init__(records, **kwargs)
+        self.fields = fields
+        self.refused = refused
+        self.requested = []
+
+    def get_retrievable_fields(self, object_type):
+        return list(self.fields)
+
+    def retrieve_request(self, object_type, properties, request_id=None, search_filter=None):
+        self.requested.append(list(properties))
+        if self.refused is not None and list(properties) == self.refused:
+            raise IncompatibleFieldSelectionError("Error: The Request Property(s) are invalid")
+        response = super().retrieve_request(object_type, properties, request_id, search_filter)
+        top_level = {prop.split(".", 1)[0] for prop in properties}
+        response["Results"] = [
+            {key: val for key, val in rec.items() if key in top_level}
+            for rec in response["Results"]
+        ]
+        return response
+
+
+def make_sends(count):
+    return [
+        {
+            "Client": {"ID": 7},
+            "ID": idx,
+            "CreatedDate": "2024-01-01T00:00:00",
+            "ModifiedDate": "2024-01-02T00:00:00",
+            "Email": {"ID": 100 + idx},
+            "Subject": f"Subject {idx}",
+            "EmailName": f"Email {idx}",
+            "FromAddress": "news@example.com",
+            "HardBounces": idx,
+        }
+        for idx in range(count)
+    ]
+
+
+class TestFieldProjection(unittest.TestCase):
+    """Tests for requesting only the selected fields from SOAP Retrieve."""
+
+    def make_stream(self, selected, stream_class=Sends, schema=None, **client_kwargs):
+        schema = schema or SEND_SCHEMA
+        stream_metadata = select_fields(
+            schema, stream_class.key_properties, stream_class.replication_key, selected
+        )
+        client = ProjectingClient(
+            {stream_class.object_ref: make_sends(5)}, SEND_FIELDS, **client_kwargs
+        )
+        return stream_class(stream_metadata, schema, client)
+
+    def test_query_fields_keep_selected_and_automatic_fields(self):
+        stream = self.make_stream({"Subject", "EmailName"})
+
+        query_fields = stream.get_query_fields(stream.metadata, stream.schema)
+
+        self.assertEqual(query_fields, ["ModifiedDate", "ID", "Subject", "EmailName"])
+        self.assertEqual(
+            stream.removed_fields,
+            ["Client.ID", "CreatedDate", "Email.ID", "SendDate", "FromAddress", "FromName",
+             "Duplicates", "HardBounces", "Status"],
+        )
+
+    def test_source_fields_are_requested_with_nested_properties(self):
+        stream = self.make_stream({"Subject"}, stream_class=Email)
+
+        query_fields = stream.get_query_fields(stream.metadata, stream.schema)
+
+        self.assertIn("Email.ID", query_fields)
+        self.assertNotIn("Client.ID", query_fields)
+
+    def test_selected_fields_are_ordered(self):
+        stream = self.make_stream({"EmailName", "Subject"}, stream_class=Email)
+
+        self.assertEqual(
+            stream.get_selected_fields(stream.metadata, stream.schema),
+            ("ContentAreas", "Email", "ModifiedDate", "ID", "Subject", "EmailName"),
+        )
+
+    def test_every_field_is_requested_without_catalog_selection(self):
+        stream = Sends({}, {}, ProjectingClient({}, SEND_FIELDS))
+
+        self.assertEqual(stream.get_query_fields({}, {}), SEND_FIELDS)
+        self.assertIsNone(stream.projected_fields)
+
+    def test_projected_records_match_unprojected_records(self):
+        selected = {"Subject", "EmailName", "HardBounces"}
+        stream = self.make_stream(selected)
+        full = self.make_stream(selected)
+
+        projected = [rec for page in stream.paginate(stream.get_query_fields()) for rec in page]
+        unprojected = [rec for page in full.paginate(SEND_FIELDS) for rec in page]
+
+        self.assertEqual(projected, unprojected)
+        self.assertEqual(projected[0], {
+            "ID": 0, "ModifiedDate": "2024-01-02T00:00:00", "Subject": "Subject 0",
+            "EmailName": "Email 0", "HardBounces": 0,
+        })
+
+    def test_refused_projection_falls_back_to_every_field(self):
+        stream = self.make_stream(
+            {"Subject"}, refused=["ModifiedDate", "ID", "Subject"], page_size=2
+        )
+        query_fields = stream.get_query_fields()
+
+        with self.assertLogs(level="WARNING") as logs:
+            first = [rec for page in stream.paginate(query_fields) for rec in page]
+        second = [rec for page in stream.paginate(query_fields) for rec in page]
+
+        self.assertEqual(len(first), 5)
+        self.assertEqual(first, second)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("requesting the 10 unselected fields", logs.output[0])
+        # only the first request was refused, later requests skip the projection
+        self.assertEqual(stream.client.requested[0], query_fields)
+        self.assertTrue(all(fields == SEND_FIELDS for fields in stream.client.requested[1:]))
+
+    def test_refused_unprojected_fields_are_raised(self):
+        stream = self.make_stream({"Subject"}, refused=SEND_FIELDS)
+
+        with self.assertRaises(IncompatibleFieldSelectionError):
+            list(stream.paginate(SEND_FIELDS))
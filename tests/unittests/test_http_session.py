@@ -0,0 +1,107 @@
+import json
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tap_exacttarget.client import DEFAULT_HTTP_POOL_SIZE, Client
+from .stub_server import TLS_FIXTURE, WSDL_FIXTURE, StubServer
+
+CONFIG = {
+    "tenant_subdomain": "test-subdomain",
+    "client_id": "test-client-id",
+    "client_secret": "test-client-secret",
+    "start_date": "2024-01-01T00:00:00Z",
+}
+
+
+def make_client(**config):
+    """Builds a `Client` without reaching the SOAP endpoint or requesting a token."""
+    with patch("tap_exacttarget.client.client.Client", return_value=MagicMock()), patch.object(
+        Client, "refresh_soap_header"
+    ):
+        return Client({**CONFIG, **config})
+
+
+class TestHttpSession(unittest.TestCase):
+    """Tests for the http session shared by every request of a client."""
+
+    def test_pool_size_from_config(self):
+        client = make_client(http_pool_size="32")
+
+        self.assertEqual(client.http_pool_size, 32)
+        self.assertEqual(client.session.get_adapter("https://example.com")._pool_maxsize, 32)
+
+    def test_pool_size_covers_configured_concurrency(self):
+        self.assertEqual(make_client().http_pool_size, DEFAULT_HTTP_POOL_SIZE)
+        self.assertEqual(make_client(window_concurrency="16").http_pool_size, 16)
+        self.assertEqual(make_client(subscriber_concurrency="24").http_pool_size, 25)
+        self.assertEqual(
+            make_client(window_concurrency="16", prefetch_pages="2").http_pool_size, 32
+        )
+
+    def test_keep_alive_can_be_disabled(self):
+        self.assertEqual(make_client().session.headers["Connection"], "keep-alive")
+        self.assertEqual(
+            make_client(http_keep_alive="false").session.headers["Connection"], "close"
+        )
+
+    def test_spawned_clients_share_the_session(self):
+        client = make_client()
+        with patch("tap_exacttarget.client.client.Client"), patch.object(
+            Client, "refresh_soap_header"
+        ):
+            spawned = client.spawn()
+
+        self.assertIs(spawned.session, client.session)
+        self.assertIs(spawned.create_transport().session, client.session)
+
+
+class TestConnectionReuse(unittest.TestCase):
+    """Token, REST and SOAP transport requests reuse the connections of the shared session."""
+
+    def setUp(self):
+        self.server = StubServer(tls=True).__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.routes[("POST", "/v2/token")] = lambda *_: (
+            200,
+            "application/json",
+            json.dumps({"access_token": "token", "expires_in": 3600}).encode("utf-8"),
+        )
+        self.server.routes[("GET", "/data/v1/items")] = lambda *_: (
+            200,
+            "application/json",
+            b'{"items": []}',
+        )
+        self.server.add_file("/etframework.wsdl", WSDL_FIXTURE)
+
+        self.client = make_client()
+        # a CA bundle from the environment would take precedence over `verify`
+        self.client.session.trust_env = False
+        self.client.session.verify = TLS_FIXTURE
+        self.client.auth_url = f"{self.server.url}/v2/token"
+        self.client.rest_url = f"{self.server.url}/"
+
+    def test_serial_requests_use_one_connection(self):
+        self.assertEqual(self.client.access_token, "token")
+        for _ in range(5):
+            self.assertEqual(self.client.get_rest("data/v1/items", {}), {"items": []})
+        self.client.create_transport().load(f"{self.server.url}/etframework.wsdl")
+
+        self.assertEqual(len(self.server.requests), 7)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_concurrent_requests_are_bounded_by_threads(self):
+        _ = self.client.access_token
+
+        def fetch():
+            for _ in range(10):
+                self.client.get_rest("data/v1/items", {})
+
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.server.requests), 41)
+        self.assertLessEqual(self.server.connections, 4)
@@ -0,0 +1,93 @@
+import copy
+import math
+import unittest
+from unittest.mock import patch
+
+from singer import Transformer
+
+from tap_exacttarget.streams.abstracts import strptime_to_cst
+from tap_exacttarget.streams.event_sent import SentEvent
+from .stub_client import StubClient
+from .test_incremental_windows import NOW, make_events
+
+EVENTS = make_events(100)
+STREAM_ID = SentEvent.tap_stream_id
+
+
+class Interrupted(Exception):
+    """Simulates the tap being killed in the middle of a sync."""
+
+
+@patch("tap_exacttarget.streams.abstracts.write_record")
+@patch("tap_exacttarget.streams.abstracts.now", return_value=NOW)
+class TestIncrementalCheckpoints(unittest.TestCase):
+    """Tests for the per window `STATE` checkpoints of `IncrementalStream.sync`."""
+
+    def make_client(self, fail_after=None, **settings):
+        client = StubClient({"SentEvent": EVENTS}, page_size=3, date_window=7, **settings)
+        if fail_after is not None:
+            original = client.retrieve_request
+
+            def failing_retrieve(object_type, properties, request_id=None, search_filter=None):
+                if len(client.retrieve_calls) >= fail_after:
+                    raise Interrupted()
+                return original(object_type, properties, request_id, search_filter)
+
+            client.retrieve_request = failing_retrieve
+        return client
+
+    def run_sync(self, client, state):
+        """Runs a sync, returns the emitted states and the last known state."""
+        emitted = []
+        stream = SentEvent({}, {}, client)
+        with patch(
+            "tap_exacttarget.streams.abstracts.write_state",
+            side_effect=lambda value: emitted.append(copy.deepcopy(value)),
+        ), Transformer() as transformer:
+            try:
+                state = stream.sync(state, {}, {}, transformer)
+                emitted.append(copy.deepcopy(state))
+            except Interrupted:
+                pass
+        return emitted, (emitted[-1] if emitted else {})
+
+    def test_state_written_after_every_completed_window(self, *_):
+        client = self.make_client()
+        windows = SentEvent({}, {}, client).get_date_windows(
+            strptime_to_cst(client.config["start_date"])
+        )
+
+        emitted, _ = self.run_sync(client, {})
+
+        bookmarks = [item["bookmarks"][STREAM_ID]["EventDate"] for item in emitted]
+        self.assertEqual(len(emitted), len(windows))
+        self.assertEqual(
+            bookmarks[:-1],
+            [end_dt.isoformat(timespec="microseconds") for _, end_dt in windows[:-1]],
+        )
+        # the last window holds no events, so the sync ends at the start of that window
+        self.assertEqual(
+            strptime_to_cst(bookmarks[-1]),
+            max(windows[-2][1], max(rec["EventDate"] for rec in EVENTS)),
+        )
+
+    def test_restart_redoes_at_most_one_window(self, *_):
+        full_run = self.make_client()
+        self.run_sync(full_run, {})
+        total_calls = len(full_run.retrieve_calls)
+        # 7 day windows hold 13 events, fetched in pages of 3
+        window_pages = math.ceil(7 * 24 / 13 / 3)
+
+        # interruptions within the second, fourth and seventh window
+        for fail_after in (7, 17, 32):
+            with self.subTest(fail_after=fail_after):
+                _, resume_state = self.run_sync(self.make_client(fail_after=fail_after), {})
+
+                restart = self.make_client()
+                self.run_sync(restart, resume_state)
+                redone = fail_after + len(restart.retrieve_calls) - total_calls
+
+                # without checkpoints the restart would redo all `fail_after` calls
+                self.assertLess(redone, fail_after)
+                self.assertLessEqual(redone, window_pages)
+
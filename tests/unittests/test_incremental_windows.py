@@ -0,0 +1,120 @@
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from tap_exacttarget.concurrency import run_ordered
+from tap_exacttarget.streams.abstracts import fixed_cst
+from tap_exacttarget.streams.event_sent import SentEvent
+from .stub_client import StubClient
+
+NOW = datetime(2024, 3, 1, tzinfo=fixed_cst)
+
+
+def make_events(count, start=datetime(2024, 1, 1, tzinfo=fixed_cst), step=timedelta(hours=13)):
+    return [
+        {"SendID": idx, "SubscriberKey": f"sub-{idx}", "EventDate": start + step * idx}
+        for idx in range(count)
+    ]
+
+
+class TestRunOrdered(unittest.TestCase):
+    """Tests for the ordered bounded thread pool."""
+
+    def test_results_are_yielded_in_task_order(self):
+        def task(idx):
+            # later tasks finish first
+            time.sleep(0.01 * (5 - idx))
+            return iter([idx, idx * 10])
+
+        tasks = [lambda idx=idx: task(idx) for idx in range(5)]
+        results = [list(items) for items in run_ordered(tasks, workers=3, buffer_size=1)]
+
+        self.assertEqual(results, [[0, 0], [1, 10], [2, 20], [3, 30], [4, 40]])
+
+    def test_at_most_workers_tasks_run_at_once(self):
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def task():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return iter([1])
+
+        for items in run_ordered([task] * 8, workers=2, buffer_size=1):
+            list(items)
+
+        self.assertEqual(peak[0], 2)
+
+    def test_task_errors_are_raised_in_consumer(self):
+        def failing():
+            yield 1
+            raise RuntimeError("boom")
+
+        results = run_ordered([lambda: iter([0]), failing], workers=2, buffer_size=1)
+
+        self.assertEqual(list(next(results)), [0])
+        items = next(results)
+        self.assertEqual(next(items), 1)
+        with self.assertRaises(RuntimeError):
+            next(items)
+
+    def test_abandoned_consumer_releases_blocked_producers(self):
+        def endless():
+            while True:
+                yield 1
+
+        results = run_ordered([endless, endless], workers=2, buffer_size=1)
+        next(next(results))
+        results.close()
+
+
+@patch("tap_exacttarget.streams.abstracts.now", return_value=NOW)
+class TestIncrementalWindows(unittest.TestCase):
+    """Tests for date window extraction in `IncrementalStream`."""
+
+    start = datetime(2024, 1, 1, tzinfo=fixed_cst)
+
+    def get_records(self, **settings):
+        client = StubClient({"SentEvent": make_events(100)}, page_size=3, **settings)
+        stream = SentEvent({}, {}, client)
+        return client, list(stream.get_records(self.start, {}, {}))
+
+    def test_serial_windows_cover_range(self, _):
+        client, records = self.get_records(date_window=7)
+
+        self.assertEqual(len({rec["SendID"] for rec in records}), 100)
+        self.assertEqual(client.spawned, 0)
+
+    def test_concurrent_windows_emit_same_records_in_window_order(self, _):
+        _, serial = self.get_records(date_window=7)
+        client, concurrent = self.get_records(date_window=7, window_concurrency=4)
+
+        self.assertEqual(concurrent, serial)
+        self.assertEqual(client.spawned, 4)
+
+    def test_concurrency_capped_by_window_count(self, _):
+        client, _ = self.get_records(date_window=30, window_concurrency=8)
+
+        # 2024-01-01 .. 2024-03-01 splits into 2 windows of 30 days
+        self.assertEqual(client.spawned, 2)
+
+    def test_window_errors_are_propagated(self, _):
+        client = StubClient({"SentEvent": make_events(100)}, page_size=3, window_concurrency=3)
+        client.date_window = 7
+        original = client.retrieve_request
+
+        def failing_retrieve(object_type, properties, request_id=None, search_filter=None):
+            if len(client.retrieve_calls) > 5:
+                raise RuntimeError("soap failure")
+            return original(object_type, properties, request_id, search_filter)
+
+        client.retrieve_request = failing_retrieve
+        stream = SentEvent({}, {}, client)
+
+        with self.assertRaises(RuntimeError):
+            list(stream.get_records(self.start, {}, {}))
@@ -0,0 +1,157 @@
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from singer import Transformer
+
+from tap_exacttarget.streams.abstracts import fixed_cst
+from tap_exacttarget.streams.list_subscribers import ListSubscribers, SubscriberKeyBatcher
+from tap_exacttarget.streams.subscriber import Subscribers
+from .stub_client import StubClient
+from .test_incremental_windows import NOW
+
+ALL_SUBSCRIBERS_ID = 7
+
+
+def make_records(count, start=datetime(2024, 1, 1, tzinfo=fixed_cst), step=timedelta(hours=1)):
+    list_subscribers = [
+        {
+            "SubscriberKey": f"sub-{idx}",
+            "ListID": ALL_SUBSCRIBERS_ID,
+            "ModifiedDate": start + step * idx,
+        }
+        for idx in range(count)
+    ]
+    subscribers = [
+        {"ID": idx, "SubscriberKey": f"sub-{idx}", "Lists": []} for idx in range(count)
+    ]
+    return {
+        "LIST": [{"ID": ALL_SUBSCRIBERS_ID, "ListName": "All Subscribers"}],
+        "ListSubscriber": list_subscribers,
+        "Subscriber": subscribers,
+    }
+
+
+class TestSubscriberKeyBatcher(unittest.TestCase):
+    """Tests for the streaming SubscriberKey deduplication."""
+
+    def test_full_batches_are_flushed_as_they_fill(self):
+        batches = []
+        batcher = SubscriberKeyBatcher(batches.append, batch_size=3)
+
+        for key in "abcdefg":
+            batcher.add(key)
+        self.assertEqual(batches, [["a", "b", "c"], ["d", "e", "f"]])
+
+        batcher.flush()
+        self.assertEqual(batches[-1], ["g"])
+
+    def test_seen_keys_are_skipped(self):
+        batches = []
+        batcher = SubscriberKeyBatcher(batches.append, batch_size=2)
+
+        for key in "aabab":
+            batcher.add(key)
+        batcher.flush()
+
+        self.assertEqual(batches, [["a", "b"]])
+
+    def test_memory_is_bounded(self):
+        batches = []
+        batcher = SubscriberKeyBatcher(batches.append, batch_size=1, max_seen=2)
+
+        for key in "abca":
+            batcher.add(key)
+
+        self.assertEqual(len(batcher.seen), 2)
+        # "a" was forgotten once "c" arrived, so it is forwarded again
+        self.assertEqual(batches, [["a"], ["b"], ["c"], ["a"]])
+
+
+@patch("tap_exacttarget.streams.subscriber.write_record")
+@patch("tap_exacttarget.streams.abstracts.write_state")
+@patch("tap_exacttarget.streams.abstracts.write_record")
+@patch("tap_exacttarget.streams.abstracts.now", return_value=NOW)
+class TestListSubscribersSync(unittest.TestCase):
+    """Regression tests for the subscriber profiles fetched by `ListSubscribers`."""
+
+    def run_sync(self, records, **settings):
+        client = StubClient(records, page_size=10, **settings)
+        stream = ListSubscribers({}, {}, client)
+        stream.sync_subscribers = True
+        stream.subscribers_obj = Subscribers({}, {}, client)
+        with Transformer() as transformer:
+            stream.sync({}, {}, {}, transformer)
+        return client
+
+    def test_each_subscriber_is_fetched_once(self, _, __, ___, write_subscriber):
+        client = self.run_sync(make_records(250), date_window=90)
+
+        subscriber_requests = [
+            search_filter
+            for object_type, request_id, search_filter in client.retrieve_calls
+            if object_type == "Subscriber" and request_id is None
+        ]
+        # 25 ListSubscriber pages used to trigger 25 requests for 10, 20, .. 250 keys
+        self.assertEqual([len(req[3]) for req in subscriber_requests], [100, 100, 50])
+        self.assertEqual(write_subscriber.call_count, 250)
+        self.assertEqual(
+            len({call.args[1]["ID"] for call in write_subscriber.call_args_list}), 250
+        )
+
+    def test_subscribers_are_deduplicated_across_windows(self, _, __, ___, write_subscriber):
+        records = make_records(40, step=timedelta(days=1))
+        # the same subscribers modified again in a later window
+        records["ListSubscriber"] += [
+            dict(rec, ModifiedDate=rec["ModifiedDate"] + timedelta(days=15))
+            for rec in records["ListSubscriber"][:10]
+        ]
+
+        self.run_sync(records, date_window=7)
+
+        self.assertEqual(write_subscriber.call_count, 40)
+
+    def test_queued_subscribers_are_fetched_before_window_checkpoint(
+        self, _, __, write_state, write_subscriber
+    ):
+        write_subscriber.side_effect = lambda *args: events.append("subscriber")
+        write_state.side_effect = lambda *args: events.append("state")
+        events = []
+
+        self.run_sync(make_records(40, step=timedelta(days=1)), date_window=7)
+
+        first_state = events.index("state")
+        self.assertEqual(events[:first_state], ["subscriber"] * 7)
+
+    def test_parallel_fetch_writes_same_records_from_main_thread(
+        self, _, __, ___, write_subscriber
+    ):
+        threads = set()
+        write_subscriber.side_effect = lambda *args: threads.add(threading.get_ident())
+        records = make_records(1000, step=timedelta(minutes=5))
+
+        self.run_sync(records, date_window=90)
+        serial = [call.args[1]["ID"] for call in write_subscriber.call_args_list]
+        write_subscriber.reset_mock()
+        client = self.run_sync(records, date_window=90, subscriber_concurrency=4)
+        parallel = [call.args[1]["ID"] for call in write_subscriber.call_args_list]
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual(threads, {threading.get_ident()})
+        self.assertTrue(1 <= client.spawned <= 4)
+        self.assertEqual(client.describe_calls.count("Subscriber"), 1)
+
+
+class TestSubscribersFetch(unittest.TestCase):
+    """Tests for the profiles fetched by `Subscribers.fetch_ids`."""
+
+    def test_search_filter_logging_is_restored_after_errors(self):
+        client = StubClient(make_records(5))
+        stream = Subscribers({}, {}, client)
+
+        with patch.object(client, "retrieve_request", side_effect=RuntimeError("Retrieve failed")):
+            with self.assertRaises(RuntimeError):
+                stream.fetch_ids(["sub-1", "sub-2"])
+
+        self.assertTrue(client.log_search_filter)
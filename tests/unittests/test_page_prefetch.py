@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from singer import Transformer
+
+from tap_exacttarget.streams.event_sent import SentEvent
+from tap_exacttarget.streams.list_send import ListSend
+from tap_exacttarget.streams.subscriber import Subscribers
+from .stub_client import StubClient
+from .test_incremental_windows import NOW, make_events
+
+EVENTS = make_events(30)
+
+
+class SlowClient(StubClient):
+    """Stub account spending `delay` seconds on every Retrieve call."""
+
+    def __init__(self, records, delay=0.0, fail_on_call=None, **kwargs):
+        super().__init__(records, **kwargs)
+        self.delay = delay
+        self.fail_on_call = fail_on_call
+        self.threads = set()
+
+    def retrieve_request(self, object_type, properties, request_id=None, search_filter=None):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        if len(self.retrieve_calls) + 1 == self.fail_on_call:
+            raise RuntimeError("connection reset")
+        return super().retrieve_request(object_type, properties, request_id, search_filter)
+
+
+def make_list_sends(count):
+    return [{"SendID": idx, "List": {"ID": 100 + idx}, "NumberSent": idx} for idx in range(count)]
+
+
+@patch("tap_exacttarget.streams.abstracts.now", return_value=NOW)
+class TestPagePrefetch(unittest.TestCase):
+    """Tests for fetching the next Retrieve page while the current one is written."""
+
+    def test_pages_match_pages_fetched_on_demand(self, _):
+        serial_client = SlowClient({"SentEvent": EVENTS}, page_size=4)
+        prefetch_client = SlowClient({"SentEvent": EVENTS}, page_size=4, prefetch_pages=2)
+
+        serial = list(SentEvent({}, {}, serial_client).paginate(["EventDate"]))
+        prefetched = list(SentEvent({}, {}, prefetch_client).paginate(["EventDate"]))
+
+        self.assertEqual(prefetched, serial)
+        self.assertEqual(len(prefetched), 8)
+        self.assertNotIn(threading.get_ident(), prefetch_client.threads)
+        self.assertEqual(prefetch_client.spawned, 1)
+
+    def test_fetching_overlaps_with_writing(self, _):
+        def sync(client):
+            written = []
+
+            def write_record(stream_id, record):
+                time.sleep(0.01)
+                written.append(record)
+
+            with patch(
+                "tap_exacttarget.streams.abstracts.write_record", side_effect=write_record
+            ), Transformer() as transformer:
+                start = time.perf_counter()
+                ListSend({}, {}, client).sync({}, {}, {}, transformer)
+                return written, time.perf_counter() - start
+
+        serial, serial_elapsed = sync(SlowClient({"ListSend": make_list_sends(20)}, delay=0.04))
+        prefetched, prefetch_elapsed = sync(
+            SlowClient({"ListSend": make_list_sends(20)}, delay=0.04, prefetch_pages=1)
+        )
+
+        self.assertEqual(prefetched, serial)
+        # 10 pages, each fetched in 40ms and written in 20ms
+        self.assertLess(prefetch_elapsed, serial_elapsed - 0.1)
+
+    def test_errors_on_a_later_page_are_raised_after_earlier_pages(self, _):
+        client = SlowClient({"SentEvent": EVENTS}, page_size=4, fail_on_call=3, prefetch_pages=2)
+        pages = SentEvent({}, {}, client).paginate(["EventDate"])
+
+        self.assertEqual(len(next(pages)), 4)
+        self.assertEqual(len(next(pages)), 4)
+        with self.assertRaisesRegex(RuntimeError, "connection reset"):
+            next(pages)
+
+    def test_prefetch_client_is_spawned_once_per_thread(self, _):
+        subscribers = [{"ID": idx, "SubscriberKey": f"sub-{idx}", "Lists": []} for idx in range(9)]
+        client = SlowClient({"Subscriber": subscribers}, page_size=2, prefetch_pages=1)
+        stream = Subscribers({}, {}, client)
+
+        for idx in range(3):
+            keys = [f"sub-{key}" for key in range(idx * 3, idx * 3 + 3)]
+            self.assertEqual(len(stream.fetch_ids(keys)), 3)
+        thread = threading.Thread(target=stream.fetch_ids, args=(["sub-0"],))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(client.spawned, 2)
@@ -0,0 +1,150 @@
+import io
+import threading
+import unittest
+from collections import defaultdict
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import simplejson
+from singer import metadata
+
+from tap_exacttarget import sink
+from tap_exacttarget.discover import discover
+from tap_exacttarget.sink import OutputSink
+from tap_exacttarget.streams.abstracts import fixed_cst
+from tap_exacttarget.sync import sync_streams
+from .stub_client import StubClient
+from .test_incremental_windows import NOW
+from .test_list_subscribers import make_records as make_subscriber_records
+
+EVENT_STREAMS = {
+    "sentevent": "SentEvent",
+    "openevent": "OpenEvent",
+    "clickevent": "ClickEvent",
+    "bounceevent": "BounceEvent",
+}
+
+
+def make_account(count=60):
+    records = make_subscriber_records(20)
+    for offset, object_type in enumerate(EVENT_STREAMS.values()):
+        start = datetime(2024, 1, 1, tzinfo=fixed_cst) + timedelta(minutes=offset)
+        records[object_type] = [
+            {
+                "SendID": idx,
+                "SubscriberKey": f"sub-{idx % 20}",
+                "EventDate": start + timedelta(hours=13) * idx,
+            }
+            for idx in range(count)
+        ]
+    return records
+
+
+def select(catalog, stream_ids):
+    for entry in catalog.streams:
+        stream_metadata = metadata.to_map(entry.metadata)
+        stream_metadata[()]["selected"] = entry.tap_stream_id in stream_ids
+        entry.metadata = metadata.to_list(stream_metadata)
+    return catalog
+
+
+class RendezvousClient(StubClient):
+    """Stub whose first SentEvent and OpenEvent calls wait for each other, so a sync only
+    completes if both streams are synced at the same time."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.barrier = threading.Barrier(2, timeout=5)
+        self.waiting = {"SentEvent", "OpenEvent"}
+
+    def retrieve_request(self, object_type, properties, request_id=None, search_filter=None):
+        with self.lock:
+            first_call = object_type in self.waiting
+            self.waiting.discard(object_type)
+        if first_call:
+            self.barrier.wait()
+        return super().retrieve_request(object_type, properties, request_id, search_filter)
+
+
+@patch("tap_exacttarget.streams.abstracts.now", return_value=NOW)
+class TestParallelStreams(unittest.TestCase):
+    """Tests for syncing independent streams concurrently with `max_parallel_streams`."""
+
+    def run_sync(self, stream_ids, client_class=StubClient, state=None, **settings):
+        client = client_class(make_account(), page_size=5, **settings)
+        catalog = select(discover(StubClient({})), stream_ids)
+        output = io.StringIO()
+        previous = sink.get_sink()
+        sink.set_sink(OutputSink(output, flush_bytes=1 << 20, flush_interval=60))
+        try:
+            sync_streams(client, catalog, state if state is not None else {})
+        finally:
+            sink.set_sink(previous)
+        return [simplejson.loads(line) for line in output.getvalue().splitlines()]
+
+    def records_by_stream(self, messages):
+        records = defaultdict(list)
+        for message in messages:
+            if message["type"] == "RECORD":
+                records[message["stream"]].append(message["record"])
+        return {
+            stream: sorted(rows, key=simplejson.dumps) for stream, rows in records.items()
+        }
+
+    def test_parallel_sync_emits_serial_records_and_state(self, _):
+        stream_ids = list(EVENT_STREAMS)
+        serial = self.run_sync(stream_ids)
+        parallel = self.run_sync(stream_ids, max_parallel_streams=3)
+
+        self.assertEqual(self.records_by_stream(parallel), self.records_by_stream(serial))
+        self.assertEqual(len(self.records_by_stream(parallel)["sentevent"]), 60)
+        self.assertEqual(parallel[-1]["type"], "STATE")
+        self.assertEqual(parallel[-1]["value"], serial[-1]["value"])
+
+    def test_streams_are_synced_concurrently(self, _):
+        messages = self.run_sync(
+            ["sentevent", "openevent"], RendezvousClient, max_parallel_streams=2
+        )
+
+        self.assertEqual(set(self.records_by_stream(messages)), {"sentevent", "openevent"})
+
+    def test_schema_precedes_records_and_states_are_merged(self, _):
+        messages = self.run_sync(list(EVENT_STREAMS), max_parallel_streams=4)
+
+        seen_schemas, bookmarks = set(), {}
+        for message in messages:
+            if message["type"] == "SCHEMA":
+                seen_schemas.add(message["stream"])
+            elif message["type"] == "RECORD":
+                self.assertIn(message["stream"], seen_schemas)
+            elif message["type"] == "STATE":
+                state_bookmarks = message["value"].get("bookmarks", {})
+                # a stream's bookmark never disappears nor moves back in a later STATE
+                for stream, bookmark in bookmarks.items():
+                    self.assertGreaterEqual(
+                        state_bookmarks[stream]["EventDate"], bookmark["EventDate"]
+                    )
+                bookmarks = state_bookmarks
+        self.assertEqual(set(bookmarks), set(EVENT_STREAMS))
+        self.assertIsNone(messages[-1]["value"].get("currently_syncing"))
+
+    def test_subscribers_are_synced_with_list_subscribers(self, _):
+        stream_ids = ["list_subscribers", "subscribers", "sentevent"]
+        serial = self.run_sync(stream_ids)
+        parallel = self.run_sync(stream_ids, max_parallel_streams=2)
+
+        records = self.records_by_stream(parallel)
+        self.assertEqual(records, self.records_by_stream(serial))
+        self.assertEqual(len(records["subscribers"]), 20)
+        schemas = [message["stream"] for message in parallel if message["type"] == "SCHEMA"]
+        self.assertEqual(schemas[0], "subscribers")
+
+    def test_stream_errors_are_raised(self, _):
+        class FailingClient(StubClient):
+            def retrieve_request(self, object_type, *args, **kwargs):
+                if object_type == "OpenEvent":
+                    raise RuntimeError("connection lost")
+                return super().retrieve_request(object_type, *args, **kwargs)
+
+        with self.assertRaisesRegex(RuntimeError, "connection lost"):
+            self.run_sync(list(EVENT_STREAMS), FailingClient, max_parallel_streams=2)
@@ -0,0 +1,114 @@
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+
+import simplejson
+
+from tap_exacttarget import sink
+from tap_exacttarget.discover import discover
+from tap_exacttarget.discover_dataextensionobj import build_stream_class
+from tap_exacttarget.extraction import ExtractionPool
+from tap_exacttarget.sink import OutputSink
+from tap_exacttarget.streams.event_sent import SentEvent
+from tap_exacttarget.sync import sync_streams
+from .stub_client import StubClient
+from .test_incremental_windows import NOW
+from .test_parallel_sync import EVENT_STREAMS, make_account, select
+
+
+class FailingClient(StubClient):
+    """Stub account whose OpenEvent Retrieve calls fail, in worker processes as well."""
+
+    def retrieve_request(self, object_type, *args, **kwargs):
+        if object_type == "OpenEvent":
+            raise RuntimeError("connection lost")
+        return super().retrieve_request(object_type, *args, **kwargs)
+
+
+@patch("tap_exacttarget.streams.abstracts.now", return_value=NOW)
+class TestProcessExtraction(unittest.TestCase):
+    """Tests for extracting the date windows of incremental streams in worker processes."""
+
+    def run_sync(self, stream_ids, client_class=StubClient, **settings):
+        client = self.client = client_class(
+            make_account(), page_size=5, date_window=7, **settings
+        )
+        catalog = select(discover(StubClient({})), stream_ids)
+        output = io.StringIO()
+        previous = sink.get_sink()
+        sink.set_sink(OutputSink(output, flush_bytes=1 << 20, flush_interval=60))
+        try:
+            sync_streams(client, catalog, {})
+        finally:
+            sink.set_sink(previous)
+        self.assertIsNone(client.extraction_pool)
+        return [simplejson.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_process_extraction_emits_serial_output(self, _):
+        stream_ids = list(EVENT_STREAMS)
+        serial = self.run_sync(stream_ids)
+        extracted = self.run_sync(stream_ids, process_workers=2)
+
+        # every window was fetched by the workers, with their own clients
+        self.assertEqual(self.client.retrieve_calls, [])
+        # same records in the same order, and the same STATE after every window
+        self.assertEqual(extracted, serial)
+        self.assertEqual(sum(message["type"] == "RECORD" for message in extracted), 240)
+
+    def test_process_extraction_with_parallel_streams(self, _):
+        stream_ids = list(EVENT_STREAMS)
+        serial = self.run_sync(stream_ids)
+        extracted = self.run_sync(stream_ids, process_workers=2, max_parallel_streams=2)
+
+        def records(messages, stream):
+            return [m["record"] for m in messages if m.get("stream") == stream and "record" in m]
+
+        for stream in stream_ids:
+            self.assertEqual(records(extracted, stream), records(serial, stream))
+        self.assertEqual(extracted[-1]["value"], serial[-1]["value"])
+
+    def test_list_subscribers_keep_their_subscriber_profiles(self, _):
+        stream_ids = ["list_subscribers", "subscribers"]
+        serial = self.run_sync(stream_ids)
+        extracted = self.run_sync(stream_ids, process_workers=2)
+
+        def records(messages, stream):
+            return [m["record"] for m in messages if m.get("stream") == stream and "record" in m]
+
+        self.assertEqual(extracted, serial)
+        for stream in stream_ids:
+            self.assertEqual(len(records(extracted, stream)), 20)
+
+    def test_worker_errors_are_raised(self, _):
+        with self.assertRaisesRegex(RuntimeError, "connection lost"):
+            self.run_sync(["sentevent", "openevent"], FailingClient, process_workers=2)
+
+
+class TestExtractionPoolSelection(unittest.TestCase):
+    """Streams only use the extraction pool for work units of whole, pre-planned windows."""
+
+    def make_stream(self, stream_class=SentEvent, **settings):
+        client = StubClient({}, **settings)
+        client.extraction_pool = MagicMock(spec=ExtractionPool, workers=2)
+        return stream_class({}, {}, client)
+
+    def test_planned_windows_use_the_pool(self):
+        stream = self.make_stream()
+        windows = stream.create_date_windows(NOW.replace(month=1), NOW, 7)
+
+        self.assertIs(stream.get_extraction_pool(windows), stream.client.extraction_pool)
+
+    def test_fallback_to_in_process_extraction(self):
+        stream = self.make_stream(target_window_pages=4)
+        self.assertIsNone(stream.get_extraction_pool(stream.get_date_windows(NOW, NOW)))
+
+        stream_class = build_stream_class(
+            "Orders", "orders", 1, {"properties": {}}, ["Id"], ["ModifiedDate"]
+        )
+        stream = self.make_stream(stream_class)
+        self.assertIsNone(stream.get_extraction_pool([(NOW, NOW)]))
+
+    def test_without_pool(self):
+        stream = SentEvent({}, {}, StubClient({}))
+
+        self.assertIsNone(stream.get_extraction_pool([(NOW, NOW)]))
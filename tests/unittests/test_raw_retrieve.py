@@ -0,0 +1,200 @@
+import io
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from zeep.helpers import serialize_object
+
+from tap_exacttarget.client import Client
+from tap_exacttarget.exceptions import (
+    IncompatibleFieldSelectionError,
+    MarketingCloudSoapApiException,
+)
+from tap_exacttarget.discover_dataextensionobj import build_stream_class
+from tap_exacttarget.raw_retrieve import RowConverter, parse_retrieve_response
+from tap_exacttarget.streams.event_sent import SentEvent
+from tap_exacttarget.streams.send import Sends
+from tap_exacttarget.streams.subscriber import Subscribers
+from .soap_fixtures import (
+    RetrieveRoute,
+    fixture_soap_client,
+    parse_retrieve_response as zeep_parse_retrieve_response,
+    retrieve_response_body,
+    retrieve_response_envelope,
+    sent_event_rows,
+)
+from .stub_server import StubServer
+from .test_async_client import PROPERTIES, make_client
+
+CREATED = datetime(2024, 3, 1, 9, 30, 15)
+
+
+def subscriber_rows(count):
+    return [
+        {
+            "Client": {"ID": 7001} if idx else {},
+            "CreatedDate": CREATED + timedelta(hours=idx),
+            "ID": 500 + idx,
+            "EmailAddress": f"subscriber-{idx}@example.com",
+            "Attributes": [
+                {"Name": "First Name", "Value": f"Name {idx}"},
+                {"Name": "Empty", "Value": ""},
+            ] if idx % 2 else [],
+            "SubscriberKey": f"key-{idx}",
+            "UnsubscribedDate": CREATED.replace(tzinfo=timezone(timedelta(hours=-6)))
+            if idx == 1 else None,
+            "Status": "Active",
+            "Lists": [{"ObjectID": f"list-{idx}-{pos}", "Status": "Active"} for pos in range(idx)],
+        }
+        for idx in range(4)
+    ]
+
+
+def send_rows(count):
+    return [
+        {
+            "Client": {"ID": 7001},
+            "CreatedDate": CREATED,
+            "ModifiedDate": CREATED + timedelta(days=idx),
+            "ID": idx,
+            "Email": {"ID": 100 + idx},
+            "SendDate": CREATED,
+            "NumberSent": 1000 + idx,
+            "Subject": f"Subject <{idx}> & more",
+            "IsMultipart": idx % 2 == 0,
+        }
+        for idx in range(count)
+    ]
+
+
+def data_extension_rows(count):
+    return [
+        {
+            "Properties": {
+                "Property": [
+                    {"Name": "Email", "Value": f"row-{idx}@example.com"},
+                    {"Name": "Score", "Value": str(idx * 10)},
+                    {"Name": "JoinDate", "Value": "3/1/2024 9:30:15 AM"},
+                ]
+            }
+        }
+        for idx in range(count)
+    ]
+
+
+def raw_parse(envelope, close=None):
+    converter = RowConverter(fixture_soap_client().wsdl.types)
+    return parse_retrieve_response(io.BytesIO(envelope), converter, close=close)
+
+
+class TestRawRetrieveParser(unittest.TestCase):
+    """Tests for the streaming parser of Retrieve responses."""
+
+    def assert_same_records(self, object_type, rows, stream):
+        body = retrieve_response_body(object_type, rows, status="MoreDataAvailable")
+        expected = zeep_parse_retrieve_response(body.encode("utf-8"))
+        actual = raw_parse(
+            retrieve_response_envelope(object_type, rows, status="MoreDataAvailable")
+        )
+
+        self.assertEqual(actual["OverallStatus"], "MoreDataAvailable")
+        self.assertEqual(actual["RequestID"], "req-1")
+        raw_rows = list(actual["Results"])
+        zeep_rows = [serialize_object(row, dict) for row in expected["Results"]]
+        self.assertEqual(raw_rows, zeep_rows)
+        self.assertEqual([list(row) for row in raw_rows], [list(row) for row in zeep_rows])
+        self.assertEqual(
+            [stream.transform_record(row) for row in raw_rows],
+            [stream.transform_record(row) for row in expected["Results"]],
+        )
+
+    def test_sent_events_match_zeep(self):
+        self.assert_same_records("SentEvent", sent_event_rows(25), SentEvent({}, {}, None))
+
+    def test_sends_with_nested_objects_match_zeep(self):
+        self.assert_same_records("Send", send_rows(10), Sends({}, {}, None))
+
+    def test_subscribers_with_lists_and_attributes_match_zeep(self):
+        self.assert_same_records("Subscriber", subscriber_rows(4), Subscribers({}, {}, None))
+
+    def test_data_extension_rows_match_zeep(self):
+        schema = {
+            "properties": {
+                "Email": {"type": ["null", "string"]},
+                "Score": {"type": ["null", "integer"]},
+                "JoinDate": {"type": ["null", "string"], "format": "date-time"},
+            }
+        }
+        stream_class = build_stream_class("Members", "members", 12, schema, ["Email"], [])
+        stream = stream_class({}, schema, None)
+
+        self.assert_same_records("DataExtensionObject", data_extension_rows(5), stream)
+
+    def test_empty_page(self):
+        response = raw_parse(retrieve_response_envelope("SentEvent", [], status="OK"))
+
+        self.assertEqual(response["OverallStatus"], "OK")
+        self.assertEqual(list(response["Results"]), [])
+
+    def test_rows_are_parsed_lazily_and_closed(self):
+        close = MagicMock()
+        response = raw_parse(retrieve_response_envelope("SentEvent", sent_event_rows(3)), close)
+
+        first = next(response["Results"])
+        self.assertEqual(first["SubscriberKey"], "subscriber-0@example.com")
+        close.assert_not_called()
+
+        response["Results"].close()
+        close.assert_called_once_with()
+
+
+@patch.object(Client, "access_token", "token")
+class TestStreamRetrieveRequest(unittest.TestCase):
+    """Tests for Retrieve requests streamed through the raw parser."""
+
+    def setUp(self):
+        self.rows = sent_event_rows(10)
+        self.server = StubServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.routes[("POST", "/Service.asmx")] = RetrieveRoute(
+            "SentEvent", self.rows, page_size=4
+        )
+
+    def fetch(self, **config):
+        client = make_client(self.server.url, batch_size="4", **config)
+        stream = SentEvent({}, {}, client)
+        return [page for page in stream.paginate(PROPERTIES)]
+
+    def test_pages_match_zeep_path(self):
+        pages = self.fetch(raw_retrieve="true")
+
+        self.assertEqual(pages, self.fetch())
+        self.assertEqual([len(page) for page in pages], [4, 4, 2])
+        _, _, body = self.server.requests[0]
+        self.assertIn(b"<_value_1>token</_value_1>", body)
+        self.assertIn(b"<ns0:Properties>EventDate</ns0:Properties>", body)
+
+    def test_soap_fault_is_raised(self):
+        fault = (
+            b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+            b"<soap:Fault><faultcode>soap:Client</faultcode><faultstring>Bad request"
+            b"</faultstring></soap:Fault></soap:Body></soap:Envelope>"
+        )
+        self.server.routes[("POST", "/Service.asmx")] = lambda *_: (500, "text/xml", fault)
+
+        with self.assertRaises(MarketingCloudSoapApiException) as err:
+            self.fetch(raw_retrieve="true")
+        self.assertIn("Bad request", str(err.exception))
+
+    def test_refused_fields_are_raised(self):
+        self.server.routes[("POST", "/Service.asmx")] = lambda *_: (
+            200,
+            "text/xml",
+            retrieve_response_envelope(
+                "SentEvent", [], status="Error: The Request Property(s) Foo do not match"
+            ),
+        )
+        client = make_client(self.server.url, raw_retrieve="true")
+
+        with self.assertRaises(IncompatibleFieldSelectionError):
+            client.stream_retrieve_request("SentEvent", PROPERTIES)
@@ -0,0 +1,126 @@
+import io
+import threading
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+import simplejson
+from singer.messages import RecordMessage, SchemaMessage, StateMessage, format_message
+
+from tap_exacttarget import sink
+from tap_exacttarget.sink import OutputSink
+
+
+class CountingOutput(io.StringIO):
+    """In-memory stdout counting the writes it receives."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+    def lines(self):
+        return self.getvalue().splitlines()
+
+
+class TestOutputSink(unittest.TestCase):
+    """Tests for the buffered Singer message writer."""
+
+    def setUp(self):
+        self.output = CountingOutput()
+
+    def test_messages_match_singer_format(self):
+        record = {"ID": 1, "Amount": Decimal("10.50"), "Name": "Ünïcode", "Lists": [{"a": None}]}
+        out = OutputSink(self.output, flush_bytes=0)
+
+        out.write_record("subscribers", record)
+        out.write_state({"bookmarks": {"sentevent": {"EventDate": "2024-01-01"}}})
+        out.write_schema("subscribers", {"type": "object"}, "ID", "ModifiedDate")
+
+        self.assertEqual(
+            self.output.lines(),
+            [
+                format_message(RecordMessage(stream="subscribers", record=record)),
+                format_message(
+                    StateMessage(value={"bookmarks": {"sentevent": {"EventDate": "2024-01-01"}}})
+                ),
+                format_message(
+                    SchemaMessage(
+                        stream="subscribers",
+                        schema={"type": "object"},
+                        key_properties=["ID"],
+                        bookmark_properties=["ModifiedDate"],
+                    )
+                ),
+            ],
+        )
+
+    def test_records_are_written_in_blocks(self):
+        out = OutputSink(self.output, flush_bytes=1000, flush_interval=60)
+
+        for idx in range(100):
+            out.write_record("sentevent", {"SendID": idx})
+        out.flush()
+
+        self.assertEqual(len(self.output.lines()), 100)
+        self.assertLess(self.output.writes, 10)
+
+    def test_buffer_is_flushed_before_state(self):
+        out = OutputSink(self.output, flush_bytes=1 << 20, flush_interval=60)
+
+        out.write_record("sentevent", {"SendID": 1})
+        out.write_record("sentevent", {"SendID": 2})
+        self.assertEqual(self.output.getvalue(), "")
+        out.write_state({"bookmarks": {}})
+
+        types = [simplejson.loads(line)["type"] for line in self.output.lines()]
+        self.assertEqual(types, ["RECORD", "RECORD", "STATE"])
+
+    @patch("tap_exacttarget.sink.time.monotonic")
+    def test_buffer_is_flushed_after_interval(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        out = OutputSink(self.output, flush_bytes=1 << 20, flush_interval=1)
+
+        out.write_record("sentevent", {"SendID": 1})
+        self.assertEqual(self.output.getvalue(), "")
+        mock_monotonic.return_value = 101.5
+        out.write_record("sentevent", {"SendID": 2})
+
+        self.assertEqual(len(self.output.lines()), 2)
+
+    def test_concurrent_writers_produce_whole_lines(self):
+        out = OutputSink(self.output, flush_bytes=512, flush_interval=60)
+
+        def writer(thread_id):
+            for idx in range(500):
+                out.write_record("sentevent", {"thread": thread_id, "SendID": idx})
+
+        threads = [threading.Thread(target=writer, args=(idx,)) for idx in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        out.flush()
+
+        records = [simplejson.loads(line)["record"] for line in self.output.lines()]
+        self.assertEqual(len(records), 2000)
+        for thread_id in range(4):
+            self.assertEqual(
+                [rec["SendID"] for rec in records if rec["thread"] == thread_id],
+                list(range(500)),
+            )
+
+    def test_set_sink_flushes_previous_sink(self):
+        previous = sink.get_sink()
+        first = OutputSink(self.output, flush_bytes=1 << 20, flush_interval=60)
+        try:
+            sink.set_sink(first)
+            sink.write_record("sentevent", {"SendID": 1})
+            sink.set_sink(OutputSink(io.StringIO()))
+        finally:
+            sink.set_sink(previous)
+
+        self.assertEqual(len(self.output.lines()), 1)
@@ -1,4 +1,3 @@
-from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 from zeep.exceptions import TransportError, Fault
 from tap_exacttarget.exceptions import MarketingCloudSoapApiException
@@ -172,8 +171,7 @@ class TestSoapOperations(BaseClientTest):
         ]
 
         # Set a specific token
-        self.client_instance._Client__access_token = "specific-token-xyz"
-        self.client_instance.token_expiry_time = datetime.now() + timedelta(hours=1)
+        self.use_token("specific-token-xyz")
 
         mock_response = {"OverallStatus": "OK", "Results": []}
         self.client_instance.soap_client.service.Retrieve.return_value = mock_response
@@ -227,11 +225,57 @@ class TestSoapOperations(BaseClientTest):
         ]
 
         # Set specific token
-        self.client_instance._Client__access_token = "describe-token-abc"
-        self.client_instance.token_expiry_time = datetime.now() + timedelta(hours=1)
+        self.use_token("describe-token-abc")
 
         mock_response = {"ObjectDefinition": {}}
         self.client_instance.soap_client.service.Describe.return_value = mock_response
 
         self.client_instance.describe_request("DataExtension")
         assert self.client_instance.soap_client.set_default_soapheaders.called
+
+    def test_request_types_are_resolved_once_per_client(self):
+        """Test that repeated pages reuse the resolved zeep types and RetrieveOptions."""
+        self.client_instance.soap_client.service.Retrieve.return_value = {
+            "OverallStatus": "OK",
+            "Results": [],
+        }
+
+        for request_id in (None, "req-1", "req-2"):
+            self.client_instance.retrieve_request(
+                object_type="SentEvent", properties=["SendID"], request_id=request_id
+            )
+
+        resolved = [c[0][0] for c in self.client_instance.soap_client.get_type.call_args_list]
+        assert resolved == ["ns0:RetrieveRequest", "ns0:RetrieveOptions"]
+
+    def test_retrieve_options_rebuilt_when_batch_size_changes(self):
+        """Test that a new RetrieveOptions object is built for a different batch size."""
+        mock_retrieve_options_type = Mock()
+        self.client_instance.soap_types["ns0:RetrieveOptions"] = mock_retrieve_options_type
+
+        self.client_instance.build_retrieve_request("SentEvent", ["SendID"])
+        self.client_instance.build_retrieve_request("SentEvent", ["SendID"])
+        self.client_instance.batch_size = 50
+        self.client_instance.build_retrieve_request("SentEvent", ["SendID"])
+
+        batch_sizes = [c[1]["BatchSize"] for c in mock_retrieve_options_type.call_args_list]
+        assert batch_sizes == [1000, 50]
+
+    def test_soap_header_not_rebuilt_while_token_unchanged(self):
+        """Test that the oauth header is only set again after the token rotates."""
+        self.client_instance.soap_client.service.Retrieve.return_value = {
+            "OverallStatus": "OK",
+            "Results": [],
+        }
+        set_headers = self.client_instance.soap_client.set_default_soapheaders
+        set_headers.reset_mock()
+
+        self.client_instance.retrieve_request(object_type="SentEvent", properties=["SendID"])
+        self.client_instance.retrieve_request(object_type="SentEvent", properties=["SendID"])
+        set_headers.assert_not_called()
+
+        self.use_token("rotated-token")
+        self.client_instance.retrieve_request(object_type="SentEvent", properties=["SendID"])
+
+        set_headers.assert_called_once()
+        assert self.client_instance.soap_header_token == "rotated-token"
@@ -0,0 +1,174 @@
+import json
+import unittest
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from singer import Transformer
+from zeep.helpers import serialize_object
+
+from tap_exacttarget.streams.abstracts import (
+    CustomDTParser,
+    serialize_record,
+    strptime_to_cst,
+    to_cst,
+    to_plain,
+)
+from tap_exacttarget.streams.email import Email
+from tap_exacttarget.streams.event_sent import SentEvent
+from tap_exacttarget.streams.subscriber import Subscribers
+from .soap_fixtures import (
+    fixture_soap_client,
+    parse_retrieve_response,
+    retrieve_response_body,
+    sent_event_rows,
+)
+
+
+def legacy_transform(obj):
+    """The json round trip previously used by `BaseStream.transform_record`."""
+    return json.loads(json.dumps(serialize_object(obj), cls=CustomDTParser))
+
+
+class TestToPlain(unittest.TestCase):
+    """Tests for the single pass zeep object converter."""
+
+    def test_matches_json_round_trip_for_event_objects(self):
+        response = parse_retrieve_response(
+            retrieve_response_body("SentEvent", sent_event_rows(3))
+        )
+
+        for rec in response["Results"]:
+            self.assertEqual(serialize_record(rec), legacy_transform(rec))
+
+    def test_matches_json_round_trip_for_nested_lists(self):
+        subscriber_type = fixture_soap_client().get_type("ns0:Subscriber")
+        list_type = fixture_soap_client().get_type("ns0:SubscriberList")
+        subscriber = subscriber_type(
+            SubscriberKey="key-1",
+            CreatedDate=datetime(2024, 5, 1, 10, 30),
+            Lists=[list_type(ObjectID="list-1", Status="Active"), list_type(ObjectID="list-2")],
+        )
+
+        result = serialize_record(subscriber)
+
+        self.assertEqual(result, legacy_transform(subscriber))
+        self.assertIsInstance(result["Lists"][0], dict)
+
+    def test_date_and_time_values_become_iso_strings(self):
+        value = {"dt": datetime(2024, 1, 2, 3, 4, 5), "d": date(2024, 1, 2), "t": time(3, 4)}
+
+        self.assertEqual(
+            to_plain(value), {"dt": "2024-01-02T03:04:05", "d": "2024-01-02", "t": "03:04:00"}
+        )
+
+    def test_other_values_are_passed_through(self):
+        self.assertEqual(to_plain(Decimal("1.5")), Decimal("1.5"))
+        self.assertEqual(to_plain([1, "a", None, True]), [1, "a", None, True])
+
+    def test_fields_restrict_conversion(self):
+        rec = parse_retrieve_response(retrieve_response_body("SentEvent", sent_event_rows(1)))[
+            "Results"
+        ][0]
+
+        self.assertEqual(
+            serialize_record(rec, ("SendID", "EventDate", "Missing")),
+            {"SendID": 1000, "EventDate": "2024-01-01T08:00:00"},
+        )
+
+
+class TestMaterializedFields(unittest.TestCase):
+    """Tests for the field list driving `BaseStream.transform_record`."""
+
+    schema = {
+        "type": "object",
+        "properties": {
+            "SendID": {"type": ["null", "integer"]},
+            "EventDate": {"type": ["null", "string"], "format": "date-time"},
+            "EventType": {"type": ["null", "string"]},
+            "BatchID": {"type": ["null", "integer"]},
+            "SubscriberKey": {"type": ["null", "string"]},
+        },
+    }
+
+    def make_metadata(self, deselected=()):
+        metadata = {(): {"selected": True}}
+        for field in self.schema["properties"]:
+            metadata[("properties", field)] = (
+                {"inclusion": "automatic"}
+                if field in SentEvent.key_properties
+                else {"inclusion": "available", "selected": field not in deselected}
+            )
+        return metadata
+
+    def test_all_fields_when_metadata_missing(self):
+        self.assertIsNone(SentEvent({}, self.schema, None).materialized_fields)
+
+    def test_deselected_and_unknown_fields_are_skipped(self):
+        stream = SentEvent(self.make_metadata(deselected=("BatchID",)), self.schema, None)
+        rec = parse_retrieve_response(retrieve_response_body("SentEvent", sent_event_rows(1)))[
+            "Results"
+        ][0]
+
+        result = stream.transform_record(rec)
+
+        self.assertNotIn("BatchID", result)
+        self.assertNotIn("Client", result)
+        self.assertEqual(set(result), {"SendID", "EventDate", "EventType", "SubscriberKey"})
+
+    def test_records_keep_the_key_order_of_the_response(self):
+        stream = SentEvent(self.make_metadata(deselected=("BatchID",)), self.schema, None)
+        rec = parse_retrieve_response(retrieve_response_body("SentEvent", sent_event_rows(1)))[
+            "Results"
+        ][0]
+
+        self.assertEqual(
+            list(stream.transform_record(rec)),
+            ["SendID", "SubscriberKey", "EventDate", "EventType"],
+        )
+        self.assertEqual(
+            list(serialize_record(rec, ("EventType", "EventDate", "SendID"))),
+            ["SendID", "EventDate", "EventType"],
+        )
+
+    def test_transformed_output_unchanged(self):
+        metadata = self.make_metadata(deselected=("BatchID", "EventType"))
+        stream = SentEvent(metadata, self.schema, None)
+        response = parse_retrieve_response(
+            retrieve_response_body("SentEvent", sent_event_rows(5))
+        )
+
+        def emitted(record, replication_value):
+            # `IncrementalStream.sync` writes the replication key as a CST ISO 8601 string
+            record["EventDate"] = replication_value.isoformat()
+            return transformer.transform(record, self.schema, metadata)
+
+        with Transformer() as transformer:
+            for rec in response["Results"]:
+                record, legacy = stream.transform_record(rec), legacy_transform(rec)
+                self.assertEqual(
+                    emitted(record, to_cst(record["EventDate"])),
+                    emitted(legacy, strptime_to_cst(legacy["EventDate"])),
+                )
+
+    def test_replication_key_is_kept_native(self):
+        stream = SentEvent({}, self.schema, None)
+        rec = parse_retrieve_response(retrieve_response_body("SentEvent", sent_event_rows(1)))[
+            "Results"
+        ][0]
+
+        result = stream.transform_record(rec)
+
+        self.assertIs(result["EventDate"], rec["EventDate"])
+        self.assertEqual(
+            to_cst(result["EventDate"]), strptime_to_cst(legacy_transform(rec)["EventDate"])
+        )
+
+    def test_source_fields_are_always_materialized(self):
+        schema = {"properties": {"ID": {"type": ["null", "integer"]}}}
+        metadata = {("properties", "ID"): {"inclusion": "automatic"}}
+
+        self.assertIn("Lists", Subscribers(metadata, schema, None).materialized_fields)
+        self.assertTrue(
+            {"ContentAreas", "Email", "ModifiedDate"}
+            <= set(Email(metadata, schema, None).materialized_fields)
+        )
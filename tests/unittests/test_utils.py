@@ -3,7 +3,7 @@ from unittest.mock import patch
 from datetime import datetime, date, time, timezone, timedelta
 import json
 
-from tap_exacttarget.streams.abstracts import strptime_to_cst, CustomDTParser, fixed_cst
+from tap_exacttarget.streams.abstracts import strptime_to_cst, to_cst, CustomDTParser, fixed_cst
 from tap_exacttarget.streams.list_subscribers import ListSubscribers
 from .base_test import BaseClientTest
 
@@ -49,6 +49,23 @@ class TestStrptimeToCST(BaseClientTest):
         self.assertEqual(result.tzinfo, fixed_cst)
 
 
+    def test_non_iso_datetime_falls_back_to_dateutil(self):
+        """Test conversion of a DataExtension style date string to CST."""
+        result = strptime_to_cst("11/3/2025 3:30:00 PM")
+
+        self.assertEqual(result, datetime(2025, 11, 3, 15, 30, tzinfo=fixed_cst))
+
+    def test_native_datetimes(self):
+        """Test conversion of naive and aware datetime objects to CST."""
+        self.assertEqual(
+            to_cst(datetime(2025, 11, 3, 15, 30)), datetime(2025, 11, 3, 15, 30, tzinfo=fixed_cst)
+        )
+        result = to_cst(datetime(2025, 11, 3, 21, 30, tzinfo=timezone.utc))
+        self.assertEqual(result.tzinfo, fixed_cst)
+        self.assertEqual(result.hour, 15)
+        self.assertEqual(to_cst("2025-11-03T21:30:00Z"), result)
+
+
 class TestCustomDTParser(unittest.TestCase):
     def test_datetime_serialization(self):
         """Test JSON encoding of datetime object."""
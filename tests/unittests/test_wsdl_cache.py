@@ -0,0 +1,155 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from requests import Session
+from zeep.exceptions import Error as ZeepError
+
+from tap_exacttarget.cache import DescribeCache, WsdlCache
+from tap_exacttarget.client import Client
+from .base_test import BaseClientTest
+from .stub_server import WSDL_FIXTURE, StubServer
+
+WSDL_URL = "https://test-subdomain.soap.marketingcloudapis.com/etframework.wsdl"
+
+
+class TestWsdlCache(unittest.TestCase):
+    """Tests for the on-disk WSDL document cache."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = WsdlCache(self.cache_dir, ttl=60)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_get_returns_none_on_cold_cache(self):
+        self.assertIsNone(self.cache.get(WSDL_URL))
+
+    def test_add_then_get_returns_content(self):
+        self.cache.add(WSDL_URL, b"<definitions/>")
+        self.assertEqual(self.cache.get(WSDL_URL), b"<definitions/>")
+
+    def test_str_content_is_stored_as_bytes(self):
+        self.cache.add(WSDL_URL, "<definitions/>")
+        self.assertEqual(self.cache.get(WSDL_URL), b"<definitions/>")
+
+    @patch("tap_exacttarget.cache.time.time")
+    def test_expired_entry_is_a_miss(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.add(WSDL_URL, b"<definitions/>")
+
+        mock_time.return_value = 1061
+        self.assertIsNone(self.cache.get(WSDL_URL))
+
+    def test_corrupt_content_is_a_miss(self):
+        self.cache.add(WSDL_URL, b"<definitions/>")
+        with open(self.cache.entry_path(WSDL_URL), "ab") as cache_file:
+            cache_file.write(b"garbage")
+
+        self.assertIsNone(self.cache.get(WSDL_URL))
+
+    def test_unreadable_header_is_a_miss(self):
+        with open(self.cache.entry_path(WSDL_URL), "wb") as cache_file:
+            cache_file.write(b"not json\n<definitions/>")
+
+        self.assertIsNone(self.cache.get(WSDL_URL))
+
+    def test_other_cache_version_is_a_miss(self):
+        self.cache.add(WSDL_URL, b"<definitions/>")
+        with open(self.cache.entry_path(WSDL_URL), "rb") as cache_file:
+            header = json.loads(cache_file.readline())
+            content = cache_file.read()
+        header["version"] = self.cache.version + 1
+        with open(self.cache.entry_path(WSDL_URL), "wb") as cache_file:
+            cache_file.write(json.dumps(header).encode("utf-8") + b"\n" + content)
+
+        self.assertIsNone(self.cache.get(WSDL_URL))
+
+    def test_clear_removes_entries(self):
+        self.cache.add(WSDL_URL, b"<definitions/>")
+        with open(os.path.join(self.cache.entries_dir, ".tmp-interrupted"), "wb"):
+            pass
+        self.cache.clear()
+
+        self.assertEqual(os.listdir(self.cache.entries_dir), [])
+        self.assertIsNone(self.cache.get(WSDL_URL))
+
+    def test_clear_keeps_files_of_other_caches(self):
+        """The cache directory may be shared with other caches, or hold unrelated files."""
+        describe_cache = DescribeCache(self.cache_dir)
+        describe_cache.add_fields("Subscriber", ["ID"])
+        self.cache.add(WSDL_URL, b"<definitions/>")
+        os.makedirs(os.path.join(self.cache.entries_dir, "nested"))
+        with open(os.path.join(self.cache.entries_dir, "notes.txt"), "wb"):
+            pass
+        with open(os.path.join(self.cache_dir, "notes.txt"), "wb"):
+            pass
+
+        self.cache.clear()
+
+        self.assertEqual(sorted(os.listdir(self.cache.entries_dir)), ["nested", "notes.txt"])
+        self.assertIn("notes.txt", os.listdir(self.cache_dir))
+        self.assertEqual(describe_cache.get_fields("Subscriber"), ["ID"])
+
+    def test_warm_start_does_not_fetch_wsdl(self):
+        """The second zeep client is built from disk without hitting the server."""
+        with StubServer() as server:
+            server.add_file("/etframework.wsdl", WSDL_FIXTURE)
+            stub_client = MagicMock(
+                wsdl_uri=f"{server.url}/etframework.wsdl", wsdl_cache=self.cache, session=Session()
+            )
+            stub_client.create_transport = lambda: Client.create_transport(stub_client)
+
+            Client.initialize_soap_client(stub_client)
+            Client.initialize_soap_client(stub_client)
+
+        self.assertEqual(len(server.requests), 1)
+
+
+class TestClientWsdlCacheConfig(BaseClientTest):
+    """Tests for wiring the wsdl cache through the client config."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_cache_disabled_by_default(self):
+        self.assertIsNone(self.client_instance.wsdl_cache)
+
+    def test_cache_configured_from_config(self):
+        self.mock_config["wsdl_cache_dir"] = self.cache_dir
+        self.mock_config["wsdl_cache_ttl"] = "120"
+
+        client = Client(self.mock_config)
+
+        self.assertIsInstance(client.wsdl_cache, WsdlCache)
+        self.assertEqual(client.wsdl_cache.path, self.cache_dir)
+        self.assertEqual(client.wsdl_cache.ttl, 120.0)
+
+    @patch("tap_exacttarget.client.MeteredTransport")
+    def test_cache_passed_to_transport(self, mock_transport):
+        self.mock_config["wsdl_cache_dir"] = self.cache_dir
+
+        client = Client(self.mock_config)
+
+        self.assertIs(mock_transport.call_args[1]["cache"], client.wsdl_cache)
+
+    @patch("tap_exacttarget.client.client.Client")
+    def test_unparsable_cached_wsdl_is_purged_and_refetched(self, mock_zeep_client):
+        self.mock_config["wsdl_cache_dir"] = self.cache_dir
+        client = Client(self.mock_config)
+        client.wsdl_cache.add(client.wsdl_uri, b"<definitions/>")
+
+        mock_soap = MagicMock()
+        mock_zeep_client.side_effect = [ZeepError("bad wsdl"), mock_soap]
+
+        self.assertIs(client.initialize_soap_client(), mock_soap)
+        self.assertIsNone(client.wsdl_cache.get(client.wsdl_uri))